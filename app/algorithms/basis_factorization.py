@@ -0,0 +1,60 @@
+import numpy as np
+from scipy import sparse
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+
+
+class BasisFactorization:
+    """
+    Factorización LU de la matriz base B para el Simplex revisado.
+    Cada cambio de base se guarda como una matriz eta (forma producto de la inversa)
+    y la LU se recalcula desde cero cada `refactor_frequency` actualizaciones.
+    Si B es dispersa se usa una LU dispersa (SuperLU) en lugar de la densa.
+    """
+
+    def __init__(self, B, refactor_frequency=50):
+        self.m = B.shape[0]
+        self.refactor_frequency = refactor_frequency
+        self.refactor(B)
+
+    def refactor(self, B):
+        """Recalcula la LU de la base y descarta el archivo eta."""
+        if sparse.issparse(B):
+            self._lu = splu(sparse.csc_matrix(B, dtype=float))
+        else:
+            self._lu = lu_factor(np.asarray(B, dtype=float))
+        self._etas = []
+
+    def _solve(self, rhs, transpose=False):
+        if isinstance(self._lu, tuple):
+            return lu_solve(self._lu, rhs, trans=1 if transpose else 0)
+        return self._lu.solve(rhs, trans='T' if transpose else 'N')
+
+    @property
+    def needs_refactor(self):
+        return len(self._etas) >= self.refactor_frequency
+
+    def update(self, row, d):
+        """
+        Registra el cambio de base: la columna en la posición `row` se reemplaza
+        por la columna entrante, cuya representación en la base actual es d = B^-1 a_q.
+        Solo se guardan los elementos no nulos de d.
+        """
+        idx = np.flatnonzero(np.abs(d) > 1e-12)
+        self._etas.append((row, d[row], idx, d[idx].copy()))
+
+    def ftran(self, a):
+        """Resuelve B x = a."""
+        x = self._solve(np.asarray(a, dtype=float))
+        for row, pivot, idx, vals in self._etas:
+            t = x[row] / pivot
+            x[idx] -= t * vals
+            x[row] = t
+        return x
+
+    def btran(self, c):
+        """Resuelve B^T y = c."""
+        z = np.array(c, dtype=float)
+        for row, pivot, idx, vals in reversed(self._etas):
+            z[row] = (z[row] - vals @ z[idx] + pivot * z[row]) / pivot
+        return self._solve(z, transpose=True)
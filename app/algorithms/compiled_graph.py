@@ -0,0 +1,73 @@
+import numpy as np
+from app.utils.metrics import measure
+
+# ==========================================
+# GRAFO COMPILADO (UNA VEZ POR SOLICITUD)
+# ==========================================
+# La lista [u, v, peso, capacidad] se recorre una sola vez: los nombres de nodo se
+# convierten en ids enteros y las aristas quedan en arreglos de NumPy más una adyacencia
+# CSR de salida y de entrada. Todos los algoritmos de red trabajan sobre esta estructura.
+
+
+class CompiledGraph:
+    def __init__(self, graph):
+        self.edges = [tuple(edge) for edge in graph]
+
+        names = set()
+        for u, v, *_ in self.edges:
+            names.add(u)
+            names.add(v)
+        try:
+            # Ids en orden alfabético: el menor es la fuente por defecto y el mayor el sumidero,
+            # y los desempates por id coinciden con los desempates por nombre
+            self.nodes = sorted(names)
+        except TypeError:
+            self.nodes = list(dict.fromkeys(name for u, v, *_ in self.edges for name in (u, v)))
+        self.index = {name: i for i, name in enumerate(self.nodes)}
+        self.num_nodes = len(self.nodes)
+        self.num_edges = len(self.edges)
+
+        self.tails = np.array([self.index[edge[0]] for edge in self.edges], dtype=int)
+        self.heads = np.array([self.index[edge[1]] for edge in self.edges], dtype=int)
+        self.weights = np.array([edge[2] if len(edge) > 2 else 0 for edge in self.edges], dtype=float)
+        self.capacities = np.array([edge[3] if len(edge) > 3 else 0 for edge in self.edges], dtype=float)
+
+        # Adyacencia de salida en CSR (orden estable: respeta el orden de las aristas)
+        order = np.argsort(self.tails, kind="stable")
+        self.out_start = np.concatenate(
+            [[0], np.cumsum(np.bincount(self.tails, minlength=self.num_nodes))]
+        ).tolist()
+        self.out_edges = order.tolist()
+        self.out_heads = self.heads[order].tolist()
+        self.out_weights = self.weights[order].tolist()
+
+        # Adyacencia de entrada en CSR (para recorridos inversos, p. ej. Dijkstra desde el destino)
+        order = np.argsort(self.heads, kind="stable")
+        self.in_start = np.concatenate(
+            [[0], np.cumsum(np.bincount(self.heads, minlength=self.num_nodes))]
+        ).tolist()
+        self.in_edges = order.tolist()
+        self.in_tails = self.tails[order].tolist()
+        self.in_weights = self.weights[order].tolist()
+
+    def __len__(self):
+        return self.num_edges
+
+    @property
+    def source(self):
+        return self.nodes[0]
+
+    @property
+    def sink(self):
+        return self.nodes[-1]
+
+    def names(self, ids):
+        return [self.nodes[i] for i in ids]
+
+
+def compile_graph(graph):
+    """Devuelve el grafo compilado; si ya lo está, lo reutiliza tal cual."""
+    if isinstance(graph, CompiledGraph):
+        return graph
+    with measure("build.network", size=len(graph)):
+        return CompiledGraph(graph)
@@ -0,0 +1,202 @@
+from collections import deque
+import numpy as np
+
+# ==========================================
+# MÉTODO GRÁFICO: INTERSECCIÓN DE SEMIPLANOS
+# ==========================================
+# Cada restricción a1*x + a2*y (<=, >=, =) b se lleva a semiplanos a·p <= b con |a| = 1.
+# Se ordenan por el ángulo de su recta y se recorren una vez con una deque (algoritmo de
+# Zhu/Shamos-Hoey): O(k log k) por el ordenamiento y O(k) para armar el polígono factible.
+# Una caja grande [-M, M]² lo mantiene acotado: si el óptimo queda sobre la caja, el
+# problema no está acotado. Con restricciones "=" (o un par opuesto sin ancho) la región
+# es un segmento o un punto y se resuelve como intervalo sobre esa recta.
+
+TOL = 1e-9
+
+
+class _Degenerate(Exception):
+    """La región factible no tiene área: está contenida en la recta a·p = b."""
+
+    def __init__(self, a, b):
+        self.a, self.b = a, b
+
+
+def _halfplanes(constraints, nonnegative=True):
+    """Semiplanos normalizados (A, b) con A·p <= b, y las rectas de las igualdades."""
+    A, b, equalities = [], [], []
+    for cons in constraints:
+        a1, a2 = (float(v) for v in cons["coeffs"])
+        rhs = float(cons["rhs"])
+        sign = cons.get("sign", "<=")
+        if sign == ">=":
+            a1, a2, rhs = -a1, -a2, -rhs
+        A.append((a1, a2))
+        b.append(rhs)
+        if sign == "=":
+            A.append((-a1, -a2))
+            b.append(-rhs)
+            equalities.append(len(A) - 2)
+    if nonnegative:
+        A += [(-1.0, 0.0), (0.0, -1.0)]
+        b += [0.0, 0.0]
+
+    A = np.array(A, dtype=float).reshape(-1, 2)
+    b = np.array(b, dtype=float)
+    norms = np.hypot(A[:, 0], A[:, 1])
+    zero = norms < TOL
+    # 0*x + 0*y <= b: siempre se cumple o nunca (no define ninguna recta)
+    if np.any(zero & (b < -TOL)):
+        return None
+    keep = ~zero
+    index = np.cumsum(keep) - 1
+    equalities = [int(index[k]) for k in equalities if keep[k]]
+    return A[keep] / norms[keep, None], b[keep] / norms[keep], equalities
+
+def _intersection(a, b, c, e):
+    det = a[0] * c[1] - a[1] * c[0]
+    return np.array([(b * c[1] - a[1] * e) / det, (a[0] * e - b * c[0]) / det])
+
+def _tolerance(b, point=None):
+    scale = 1.0 + abs(b)
+    if point is not None:
+        scale += abs(point[0]) + abs(point[1])
+    return TOL * scale
+
+def _outside(a, b, point):
+    return a @ point - b > _tolerance(b, point)
+
+def halfplane_intersection(A, b):
+    """
+    Vértices (en sentido antihorario) de {p : A·p <= b}, acotado por una caja ya incluida
+    en A. Devuelve un arreglo vacío si la región es vacía; lanza _Degenerate si no tiene área.
+    """
+    angles = np.arctan2(A[:, 0], -A[:, 1])  # dirección de la recta con el interior a la izquierda
+    order = np.argsort(angles, kind="stable")
+    dq = deque()
+
+    def vertex(i, j):
+        return _intersection(A[i], b[i], A[j], b[j])
+
+    for i in order.tolist():
+        while len(dq) > 1 and _outside(A[i], b[i], vertex(dq[-1], dq[-2])):
+            dq.pop()
+        while len(dq) > 1 and _outside(A[i], b[i], vertex(dq[0], dq[1])):
+            dq.popleft()
+
+        if dq:
+            last = dq[-1]
+            cross = A[i][0] * A[last][1] - A[i][1] * A[last][0]
+            if abs(cross) < TOL:
+                if A[i] @ A[last] < 0:
+                    # Semiplanos opuestos enfrentados: franja vacía o de ancho cero
+                    width = b[i] + b[last]
+                    if width < -_tolerance(b[i]) - _tolerance(b[last]):
+                        return np.empty((0, 2))
+                    raise _Degenerate(A[last], b[last])
+                # Misma dirección: queda solo el más restrictivo
+                if _outside(A[i], b[i], A[last] * b[last]):
+                    dq.pop()
+                else:
+                    continue
+        dq.append(i)
+
+    while len(dq) > 2 and _outside(A[dq[0]], b[dq[0]], vertex(dq[-1], dq[-2])):
+        dq.pop()
+    while len(dq) > 2 and _outside(A[dq[-1]], b[dq[-1]], vertex(dq[0], dq[1])):
+        dq.popleft()
+    if len(dq) < 3:
+        return np.empty((0, 2))
+
+    planes = list(dq)
+    vertices = np.array([vertex(planes[k], planes[(k + 1) % len(planes)]) for k in range(len(planes))])
+
+    # Una región vacía puede dejar un polígono "invertido" (recorrido horario): área negativa.
+    # Con área cero la región, si existe, es un segmento o un punto: está sobre la recta del
+    # lado más largo (el lado k va del vértice k-1 al k y está sobre planes[k]).
+    x, y = vertices[:, 0], vertices[:, 1]
+    area = 0.5 * float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+    area_tol = TOL * (1.0 + np.abs(vertices).max()) ** 2
+    if area < -area_tol:
+        return np.empty((0, 2))
+    if area <= area_tol:
+        longest = int(np.argmax(np.hypot(*(vertices - np.roll(vertices, 1, axis=0)).T)))
+        raise _Degenerate(A[planes[longest]], b[planes[longest]])
+
+    # Quitar vértices repetidos (varias rectas por el mismo punto)
+    distinct = np.ones(len(vertices), dtype=bool)
+    distinct[1:] = np.any(np.abs(np.diff(vertices, axis=0)) > TOL * (1.0 + np.abs(vertices[1:])), axis=1)
+    if len(vertices) > 1 and np.all(np.abs(vertices[-1] - vertices[0]) <= TOL * (1.0 + np.abs(vertices[0]))):
+        distinct[-1] = False
+    return vertices[distinct]
+
+def _solve_on_line(c, A, b, a, rhs, maximize):
+    """Región contenida en la recta a·p = rhs: intervalo de t en p = p0 + t·d."""
+    p0 = a * rhs
+    d = np.array([-a[1], a[0]])
+    slope = A @ d
+    limit = b - A @ p0
+    tol = TOL * (1.0 + np.abs(b))
+
+    flat = np.abs(slope) < TOL
+    if np.any(flat & (limit < -tol)):
+        return {"status": "Infeasible"}
+    up, down = slope > TOL, slope < -TOL
+    t_hi = np.min(limit[up] / slope[up]) if np.any(up) else np.inf
+    t_lo = np.max(limit[down] / slope[down]) if np.any(down) else -np.inf
+    if t_lo > t_hi + TOL * (1.0 + abs(t_lo) + abs(t_hi)):
+        return {"status": "Infeasible"}
+    t_hi = max(t_hi, t_lo)
+
+    gain = c @ d if maximize else -(c @ d)
+    if abs(gain) < TOL:
+        t = t_lo if np.isfinite(t_lo) else t_hi
+    else:
+        t = t_hi if gain > 0 else t_lo
+    if not np.isfinite(t):
+        return {"status": "Unbounded"}
+
+    point = p0 + t * d
+    ends = [p0 + s * d for s in (t_lo, t_hi) if np.isfinite(s)]
+    return {"status": "Optimal", "point": point, "objective_value": float(c @ point), "polygon": np.array(ends)}
+
+def solve_lp_2d(objective_coeffs, constraints, maximize=True, nonnegative=True):
+    """
+    PL de 2 variables por enumeración de vértices del polígono factible.
+    Devuelve {"status", "objective_value", "point", "polygon"}; "polygon" son los vértices
+    de la región (en sentido antihorario) para sombrearla, recortada a la caja si no es acotada.
+    """
+    c = np.asarray(objective_coeffs, dtype=float)
+    parsed = _halfplanes(constraints, nonnegative)
+    if parsed is None:
+        return {"status": "Infeasible"}
+    A, b, equalities = parsed
+
+    if equalities:
+        eq = equalities[0]
+        return _solve_on_line(c, A, b, A[eq], b[eq], maximize)
+
+    # Caja de acotamiento, muy lejos de todas las rectas
+    box = 1e6 * (1.0 + (np.abs(b).max() if len(b) else 0.0))
+    A_box = np.vstack([A, [[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [0.0, -1.0]]])
+    b_box = np.concatenate([b, [box] * 4])
+    try:
+        vertices = halfplane_intersection(A_box, b_box)
+    except _Degenerate as line:
+        return _solve_on_line(c, A, b, line.a, line.b, maximize)
+    if len(vertices) == 0:
+        return {"status": "Infeasible"}
+
+    values = vertices @ c if maximize else -(vertices @ c)
+    on_box = np.abs(vertices).max(axis=1) >= box * (1 - 1e-6)
+    real = np.flatnonzero(~on_box)
+    if len(real) == 0:
+        return {"status": "Unbounded", "polygon": vertices}
+    # Mejor vértice real; la tolerancia sale solo de ellos (los de la caja valen ~1e8 y
+    # harían "empatar" vértices que no son óptimos)
+    best = int(real[np.argmax(values[real])])
+    tol = TOL * (1.0 + np.abs(values[real]).max())
+    if np.any(values[on_box] > values[best] + tol):
+        # Un vértice de la caja artificial es mejor: el objetivo mejora sin límite
+        return {"status": "Unbounded", "polygon": vertices}
+    point = vertices[best]
+    return {"status": "Optimal", "point": point, "objective_value": float(c @ point), "polygon": vertices}
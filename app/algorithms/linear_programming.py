@@ -1,5 +1,6 @@
 import numpy as np
 from copy import deepcopy
+from app.algorithms.pivoting import as_tableau, pivot_inplace, min_ratio_row
 
 class SimplexSolver:
     """
@@ -51,9 +52,10 @@ class SimplexSolver:
         cost_row[:len(c)] = -c if self.maximization else c
         
         tableau = np.vstack([tableau, cost_row])
-        tableau = np.hstack([tableau, b.reshape(-1, 1)])
+        # RHS con el valor inicial de la función objetivo (0) en la fila de costos
+        tableau = np.hstack([tableau, np.append(b, 0).reshape(-1, 1)])
         
-        return tableau
+        return as_tableau(tableau)
     
     def _find_pivot_column(self, tableau):
         """Encuentra la columna pivote (variable que entra)"""
@@ -69,32 +71,11 @@ class SimplexSolver:
     
     def _find_pivot_row(self, tableau, pivot_col):
         """Encuentra la fila pivote (variable que sale)"""
-        A = tableau[:-1, :-1]
-        b = tableau[:-1, -1]
-        
-        ratios = []
-        for i, (a_val, b_val) in enumerate(zip(A[:, pivot_col], b)):
-            if a_val > 1e-10:
-                ratios.append((b_val / a_val, i))
-        
-        if not ratios:
-            return None
-        return min(ratios, key=lambda x: x[0])[1]
+        return min_ratio_row(tableau[:-1, pivot_col], tableau[:-1, -1])
     
     def _pivot(self, tableau, pivot_row, pivot_col):
         """Realiza la operación de pivote"""
-        pivot_element = tableau[pivot_row, pivot_col]
-        
-        # Dividir fila pivote
-        tableau[pivot_row, :] /= pivot_element
-        
-        # Eliminar columna pivote en otras filas
-        for i in range(tableau.shape[0]):
-            if i != pivot_row:
-                factor = tableau[i, pivot_col]
-                tableau[i, :] -= factor * tableau[pivot_row, :]
-        
-        return tableau
+        return pivot_inplace(tableau, pivot_row, pivot_col)
     
     def solve_simplex(self):
         """Resuelve usando Simplex estándar"""
@@ -192,7 +173,7 @@ class SimplexSolver:
         cost_row = np.zeros(tableau_phase2.shape[1])
         cost_row[:len(self.c)] = -self.c if self.maximization else self.c
         tableau_phase2 = np.vstack([tableau_phase2, cost_row])
-        tableau_phase2 = np.hstack([tableau_phase2, b_phase2.reshape(-1, 1)])
+        tableau_phase2 = as_tableau(np.hstack([tableau_phase2, np.append(b_phase2, 0).reshape(-1, 1)]))
         
         max_iterations = 1000
         while max_iterations > 0:
@@ -1,5 +1,12 @@
 import numpy as np
 from copy import deepcopy
+from scipy import sparse
+from app.algorithms.basis_factorization import BasisFactorization
+from app.algorithms.pivoting import as_tableau, pivot_inplace, min_ratio_row
+from app.utils.logs import get_logger, current_trace
+from app.utils.metrics import measure
+
+logger = get_logger(__name__)
 
 class SimplexSolverV2:
     """
@@ -15,38 +22,66 @@ class SimplexSolverV2:
         # Convertir a minimización internamente (min -Z)
         self.c = -self.c_orig if self.maximization else self.c_orig
         
-        self.A_ub = np.array(A_ub, dtype=float) if A_ub is not None and len(A_ub) > 0 else np.empty((0, self.n_vars))
+        # Matrices dispersas (CSR/CSC) se mantienen dispersas y se resuelven con el Simplex revisado
+        self.sparse_input = sparse.issparse(A_ub) or sparse.issparse(A_eq)
+        self.A_ub = self._as_matrix(A_ub)
         self.b_ub = np.array(b_ub, dtype=float) if b_ub is not None and len(b_ub) > 0 else np.empty(0)
         
-        self.A_eq = np.array(A_eq, dtype=float) if A_eq is not None and len(A_eq) > 0 else np.empty((0, self.n_vars))
+        self.A_eq = self._as_matrix(A_eq)
         self.b_eq = np.array(b_eq, dtype=float) if b_eq is not None and len(b_eq) > 0 else np.empty(0)
         
         self._normalize_rhs()
         
         self.iterations = 0
         self.column_to_var = {} # Mapeo dinámico para extraer la solución
+        self.basis = None  # Base óptima del Simplex revisado (índices de columna)
+        self.tableau_basis = None  # Base final de un método de tableau (etiquetas por fila)
+
+    def _as_matrix(self, A):
+        if self.sparse_input:
+            if A is None or A.shape[0] == 0:
+                return sparse.csr_matrix((0, self.n_vars))
+            return sparse.csr_matrix(A, dtype=float)
+        return np.array(A, dtype=float) if A is not None and len(A) > 0 else np.empty((0, self.n_vars))
 
-    def solve(self, method='simplex'):
+    def solve(self, method='simplex', warm_start=None):
         """
         Método unificado (puente) para llamar a los algoritmos específicos.
+        Con matrices dispersas siempre se usa el Simplex revisado (los métodos de tableau son densos).
+        `warm_start` (base de export_basis) solo aplica al Simplex revisado.
         """
-        if method == 'two_phase':
-            return self.solve_two_phase()
-        elif method == 'big_m':
-            return self.solve_big_m()
-        else:
-            return self.solve_simplex()
+        if self.sparse_input:
+            method = 'revised'
+        elif method not in ('revised', 'two_phase', 'big_m'):
+            method = 'simplex'
+        self.basis = self.tableau_basis = None
+        # Tamaño: coeficientes de la matriz de restricciones (filas x variables)
+        size = (self.A_ub.shape[0] + self.A_eq.shape[0]) * self.n_vars
+        with measure(f"simplex.{method}", size=size) as m:
+            if method == 'revised':
+                result = self.solve_revised(warm_start=warm_start)
+            elif method == 'two_phase':
+                result = self.solve_two_phase()
+            elif method == 'big_m':
+                result = self.solve_big_m()
+            else:
+                result = self.solve_simplex()
+            m.iterations = self.iterations
+        return result
 
     def _normalize_rhs(self):
         """Asegura b >= 0 multiplicando la fila por -1 si es necesario"""
-        for i in range(len(self.b_ub)):
-            if self.b_ub[i] < 0:
-                self.A_ub[i] *= -1
-                self.b_ub[i] *= -1
-        for i in range(len(self.b_eq)):
-            if self.b_eq[i] < 0:
-                self.A_eq[i] *= -1
-                self.b_eq[i] *= -1
+        # Signo de la holgura de cada fila <= (-1 si la fila se invirtió y pasó a ser >=)
+        self.ub_signs = np.where(self.b_ub < 0, -1.0, 1.0)
+        self.eq_signs = np.where(self.b_eq < 0, -1.0, 1.0)
+        self.b_ub *= self.ub_signs
+        self.b_eq *= self.eq_signs
+        if self.sparse_input:
+            self.A_ub = sparse.diags(self.ub_signs) @ self.A_ub
+            self.A_eq = sparse.diags(self.eq_signs) @ self.A_eq
+        else:
+            self.A_ub *= self.ub_signs[:, None]
+            self.A_eq *= self.eq_signs[:, None]
 
     def _build_tableau(self, c_vector, add_slack=True, add_artificial=False):
         """
@@ -95,7 +130,7 @@ class SimplexSolverV2:
         rhs_col = np.append(b_final, 0).reshape(-1, 1)
         tableau = np.hstack([tableau, rhs_col])
         
-        return tableau
+        return as_tableau(tableau)
 
     def _find_pivot(self, tableau):
         """Busca columna y fila pivote usando la prueba de la razón mínima."""
@@ -104,30 +139,12 @@ class SimplexSolverV2:
             return None, None
         
         pivot_col = np.argmin(cost_row)
-        
-        b = tableau[:-1, -1]
-        a_col = tableau[:-1, pivot_col]
-        
-        ratios = []
-        for i in range(len(b)):
-            if a_col[i] > 1e-10:
-                ratios.append(b[i] / a_col[i])
-            else:
-                ratios.append(np.inf)
-        
-        pivot_row = np.argmin(ratios)
-        if ratios[pivot_row] == np.inf: 
-            return pivot_col, None
-        
+        pivot_row = min_ratio_row(tableau[:-1, pivot_col], tableau[:-1, -1])
         return pivot_col, pivot_row
 
     def _pivot(self, tableau, row, col):
         """Operación de Gauss-Jordan."""
-        tableau[row, :] /= tableau[row, col]
-        for i in range(tableau.shape[0]):
-            if i != row:
-                tableau[i, :] -= tableau[i, col] * tableau[row, :]
-        return tableau
+        return pivot_inplace(tableau, row, col)
 
     def solve_simplex(self):
         tableau = self._build_tableau(self.c)
@@ -150,7 +167,7 @@ class SimplexSolverV2:
             return {"status": "Infeasible", "message": "El problema no tiene solución factible."}
 
         # Fase II
-        new_tableau = np.delete(tableau, art_cols, axis=1)
+        new_tableau = as_tableau(np.delete(tableau, art_cols, axis=1))
         new_tableau[-1, :] = 0
         new_tableau[-1, :self.n_vars] = self.c
         
@@ -177,8 +194,429 @@ class SimplexSolverV2:
 
         return self._run_iterations(tableau)
 
+    # ==========================================
+    # SIMPLEX REVISADO (BASE FACTORIZADA LU)
+    # ==========================================
+    def _standard_form(self):
+        """
+        Prepara la forma estándar [A | holguras | artificiales] sin construir el tableau.
+        Las columnas lógicas (holguras y artificiales) no se materializan: solo se guarda
+        la fila y el signo de cada una.
+        """
+        num_ub = len(self.b_ub)
+        if self.sparse_input:
+            self.A_std = sparse.vstack([self.A_ub, self.A_eq], format='csc')
+        else:
+            self.A_std = np.vstack([self.A_ub, self.A_eq])
+        self.b_std = np.concatenate([self.b_ub, self.b_eq])
+        m = len(self.b_std)
+
+        # Filas que necesitan artificial: las <= invertidas (holgura -1) y las de igualdad
+        art_rows = [i for i in range(num_ub) if self.ub_signs[i] < 0] + list(range(num_ub, m))
+
+        self.logical_rows = np.concatenate([np.arange(num_ub), art_rows]).astype(int)
+        self.logical_signs = np.concatenate([self.ub_signs, np.ones(len(art_rows))])
+        self.num_artificial = len(art_rows)
+
+        self.column_to_var = {i: ('original', i) for i in range(self.n_vars)}
+        for i in range(num_ub):
+            self.column_to_var[self.n_vars + i] = ('slack', i)
+        for k, row in enumerate(art_rows):
+            self.column_to_var[self.n_vars + num_ub + k] = ('artificial', row)
+
+    def _column(self, j):
+        """Columna j de la forma estándar como vector denso."""
+        if j < self.n_vars and not self.sparse_input:
+            return self.A_std[:, j].astype(float)
+        col = np.zeros(len(self.b_std))
+        if j < self.n_vars:
+            start, end = self.A_std.indptr[j], self.A_std.indptr[j + 1]
+            col[self.A_std.indices[start:end]] = self.A_std.data[start:end]
+            return col
+        k = j - self.n_vars
+        col[self.logical_rows[k]] = self.logical_signs[k]
+        return col
+
+    def _basis_matrix(self, basis):
+        if not self.sparse_input:
+            return np.column_stack([self._column(j) for j in basis])
+
+        # Base dispersa en CSC armada directamente desde los índices de A_std
+        rows, cols, vals = [], [], []
+        for pos, j in enumerate(basis):
+            if j < self.n_vars:
+                start, end = self.A_std.indptr[j], self.A_std.indptr[j + 1]
+                rows.append(self.A_std.indices[start:end])
+                vals.append(self.A_std.data[start:end])
+                cols.append(np.full(end - start, pos))
+            else:
+                k = j - self.n_vars
+                rows.append([self.logical_rows[k]])
+                vals.append([self.logical_signs[k]])
+                cols.append([pos])
+        m = len(basis)
+        return sparse.csc_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(m, m)
+        )
+
+    def _reduced_costs(self, cost, y):
+        """d_j = c_j - a_j^T y para todas las columnas de la forma estándar."""
+        d = np.array(cost, dtype=float)
+        d[:self.n_vars] -= self.A_std.T @ y
+        d[self.n_vars:] -= self.logical_signs * y[self.logical_rows]
+        return d
+
+    def _tableau_row(self, factor, r, num_cols):
+        """Fila r de B^-1 A sin formar el tableau: alpha_j = a_j^T B^-T e_r."""
+        e_r = np.zeros(len(self.b_std))
+        e_r[r] = 1
+        rho = factor.btran(e_r)
+        return self._reduced_costs(np.zeros(num_cols), -rho)
+
+    def _apply_pivot(self, basis, x_B, factor, r, q, w):
+        """Cambio de base: entra la columna q por la posición r (w = B^-1 a_q)."""
+        theta = x_B[r] / w[r]
+        x_B -= theta * w
+        x_B[r] = theta
+        basis[r] = q
+        factor.update(r, w)
+        if factor.needs_refactor:
+            factor.refactor(self._basis_matrix(basis))
+            x_B[:] = factor.ftran(self.b_std)
+        self.iterations += 1
+        return theta
+
+    def _revised_phase(self, cost, basis, x_B, factor, allowed, max_iter):
+        """
+        Itera el Simplex revisado sobre la base dada. Regla de Dantzig para elegir
+        la columna entrante; si se encadenan muchos pivotes degenerados se cambia a
+        la regla de Bland para evitar ciclos.
+        """
+        degenerate_streak = 0
+        trace = current_trace()
+        while self.iterations < max_iter:
+            y = factor.btran(cost[basis])
+            d = self._reduced_costs(cost, y)
+            d[basis] = 0
+            d[~allowed] = 0
+
+            candidates = np.flatnonzero(d < -1e-9)
+            if len(candidates) == 0:
+                return "Optimal"
+            if degenerate_streak > 50:
+                q = candidates[0]
+            else:
+                q = candidates[np.argmin(d[candidates])]
+
+            w = factor.ftran(self._column(q))
+
+            r = min_ratio_row(w, x_B, tol=1e-9)
+            if r is None:
+                return "Unbounded"
+            theta = self._apply_pivot(basis, x_B, factor, r, q, w)
+            if trace:
+                trace.add("revised.pivot", iteration=self.iterations, entering=int(q), row=int(r),
+                          reduced_cost=float(d[q]), theta=float(theta), bland=degenerate_streak > 50)
+            degenerate_streak = degenerate_streak + 1 if theta < 1e-12 else 0
+
+        return "IterationLimit"
+
+    def _dual_simplex(self, cost, basis, x_B, factor, allowed, max_iter):
+        """
+        Simplex dual: parte de una base dual factible (costos reducidos >= 0) con
+        valores básicos negativos y pivota hasta recuperar la factibilidad primal.
+        """
+        trace = current_trace()
+        while self.iterations < max_iter:
+            r = int(np.argmin(x_B))
+            if x_B[r] >= -1e-9:
+                return "Optimal"
+
+            alpha = self._tableau_row(factor, r, len(allowed))
+            eligible = (alpha < -1e-9) & allowed
+            eligible[basis] = False
+            if not np.any(eligible):
+                return "Infeasible"
+
+            # Razón dual: mantiene los costos reducidos no negativos
+            d = self._reduced_costs(cost, factor.btran(cost[basis]))
+            ratios = np.full(len(d), np.inf)
+            np.divide(np.maximum(d, 0), -alpha, out=ratios, where=eligible)
+            q = int(np.argmin(ratios))
+
+            theta = self._apply_pivot(basis, x_B, factor, r, q, factor.ftran(self._column(q)))
+            if trace:
+                trace.add("dual.pivot", iteration=self.iterations, entering=int(q), row=int(r), theta=float(theta))
+
+        return "IterationLimit"
+
+    def _drive_out_artificials(self, basis, factor, allowed):
+        """Saca de la base las artificiales que quedaron en nivel cero tras la Fase I."""
+        first_art = len(allowed) - self.num_artificial
+        for r in range(len(basis)):
+            if basis[r] < first_art:
+                continue
+            alpha = self._tableau_row(factor, r, len(allowed))
+            alpha[basis] = 0
+            alpha[~allowed] = 0
+            candidates = np.flatnonzero(np.abs(alpha) > 1e-9)
+            if len(candidates) == 0:
+                continue  # Fila redundante: la artificial queda básica en cero
+            q = candidates[0]
+            factor.update(r, factor.ftran(self._column(q)))
+            basis[r] = q
+
+    def export_basis(self):
+        """
+        Base óptima del último solve_revised como lista de etiquetas [tipo, índice]
+        (p. ej. ["original", 0], ["slack", 2]). Se puede pasar como `warm_start` a otro
+        solver del mismo modelo aunque cambien los costos o el lado derecho.
+        """
+        return [list(self.column_to_var[int(j)]) for j in self.basis]
+
+    def _basis_from_labels(self, labels):
+        var_to_column = {v: k for k, v in self.column_to_var.items()}
+        basis = [var_to_column.get(tuple(label)) for label in labels]
+        if len(basis) != len(self.b_std) or None in basis or len(set(basis)) != len(basis):
+            return None
+        return np.array(basis, dtype=int)
+
+    def _warm_start(self, labels, cost, allowed, refactor_frequency, max_iter):
+        """
+        Arranca desde una base guardada. Si sigue siendo primal factible (cambió el objetivo)
+        se va directo a la Fase II; si sigue siendo dual factible (cambió el lado derecho) se
+        corre el Simplex dual. Devuelve None cuando la base no sirve y hay que empezar de cero.
+        """
+        basis = self._basis_from_labels(labels)
+        if basis is None:
+            return None
+        try:
+            factor = BasisFactorization(self._basis_matrix(basis), refactor_frequency)
+        except (np.linalg.LinAlgError, RuntimeError):
+            return None
+        x_B = factor.ftran(self.b_std)
+        if not np.all(np.isfinite(x_B)) or np.any(np.abs(x_B[~allowed[basis]]) > 1e-9):
+            return None
+
+        if np.all(x_B >= -1e-9):
+            return basis, x_B, factor
+
+        d = self._reduced_costs(cost, factor.btran(cost[basis]))
+        d[basis] = 0
+        if np.any(d[allowed] < -1e-9):
+            return None
+        status = self._dual_simplex(cost, basis, x_B, factor, allowed, max_iter)
+        if status != "Optimal":
+            return status
+        if np.any(np.abs(x_B[~allowed[basis]]) > 1e-9):
+            return None
+        return basis, x_B, factor
+
+    def solve_revised(self, refactor_frequency=50, max_iter=None, warm_start=None):
+        """
+        Simplex revisado de dos fases. En lugar del tableau denso se mantiene una
+        factorización LU de la base con actualizaciones eta, recalculada cada
+        `refactor_frequency` pivotes. Cada iteración resuelve dos sistemas con la base
+        (BTRAN para los precios duales y FTRAN para la columna entrante).
+        Si las restricciones llegan en formato disperso, A y la base se mantienen dispersas.
+        `warm_start` acepta la base devuelta por export_basis() de un solve anterior.
+        """
+        self._standard_form()
+        n, m = self.n_vars, len(self.b_std)
+        total_cols = n + len(self.logical_rows)
+        first_art = total_cols - self.num_artificial
+        if max_iter is None:
+            max_iter = max(1000, 10 * (m + n))
+
+        cost = np.zeros(total_cols)
+        cost[:n] = self.c
+        allowed = np.ones(total_cols, dtype=bool)
+        allowed[first_art:] = False
+
+        warm = None
+        if warm_start is not None:
+            warm = self._warm_start(warm_start, cost, allowed, refactor_frequency, max_iter)
+        if warm == "Infeasible":
+            return {"status": "Infeasible", "message": "El problema no tiene solución factible."}
+        if warm == "IterationLimit":
+            return self._iteration_limit("Simplex dual")
+
+        if warm is not None:
+            basis, x_B, factor = warm
+        else:
+            # Base inicial: holgura en las filas <= y artificial en el resto
+            basis = np.empty(m, dtype=int)
+            for k, row in enumerate(self.logical_rows):
+                if self.logical_signs[k] > 0:
+                    basis[row] = n + k
+
+            factor = BasisFactorization(self._basis_matrix(basis), refactor_frequency)
+            x_B = factor.ftran(self.b_std)
+
+            # Fase I: minimizar la suma de artificiales
+            if self.num_artificial > 0:
+                cost_phase1 = np.zeros(total_cols)
+                cost_phase1[first_art:] = 1
+                status = self._revised_phase(cost_phase1, basis, x_B, factor, np.ones(total_cols, dtype=bool), max_iter)
+                if status == "IterationLimit":
+                    return self._iteration_limit("Fase I")
+                if cost_phase1[basis] @ x_B > 1e-6:
+                    return {"status": "Infeasible", "message": "El problema no tiene solución factible."}
+                self._drive_out_artificials(basis, factor, allowed)
+
+        # Fase II: función objetivo original
+        status = self._revised_phase(cost, basis, x_B, factor, allowed, max_iter)
+        if status == "Unbounded":
+            return {"status": "Unbounded", "message": "Problema no acotado."}
+        if status == "IterationLimit":
+            # La base es factible pero no se probó que sea óptima: se devuelve marcada
+            return {**self._extract_revised_solution(basis, x_B), **self._iteration_limit("Fase II")}
+
+        self.basis = basis
+        return self._extract_revised_solution(basis, x_B)
+
+    def _iteration_limit(self, phase):
+        logger.warning("⚠️ Simplex revisado detenido por límite de iteraciones en %s (%s)", phase, self.iterations)
+        return {
+            "status": "IterationLimit",
+            "message": f"Se alcanzó el límite de iteraciones ({self.iterations}) en {phase} sin probar optimalidad.",
+            "iterations": self.iterations
+        }
+
+    def _report_basis(self):
+        """
+        Base para sensitivity_report: la del Simplex revisado tal cual, o la base final de un
+        método de tableau llevada a la forma estándar del revisado. Devuelve None si no hay
+        base o si la del tableau no es óptima para el modelo (no es primal y dual factible).
+        """
+        if self.tableau_basis is None:
+            return self.basis
+
+        self._standard_form()
+        basis = self._basis_from_labels(self.tableau_basis)
+        if basis is None:
+            return None
+        total_cols = self.n_vars + len(self.logical_rows)
+        allowed = np.ones(total_cols, dtype=bool)
+        allowed[total_cols - self.num_artificial:] = False
+        try:
+            factor = BasisFactorization(self._basis_matrix(basis))
+        except (np.linalg.LinAlgError, RuntimeError):
+            return None
+        x_B = factor.ftran(self.b_std)
+        cost = np.zeros(total_cols)
+        cost[:self.n_vars] = self.c
+        d = self._reduced_costs(cost, factor.btran(cost[basis]))
+        d[basis] = 0
+        tol = 1e-7 * (1.0 + np.abs(self.b_std).max(initial=0.0))
+        if np.any(x_B < -tol) or np.any(np.abs(x_B[~allowed[basis]]) > tol) or np.any(d[allowed] < -1e-7):
+            return None
+        return basis
+
+    def _record_tableau_basis(self, tableau):
+        """Guarda la variable básica de cada fila del tableau final (columnas unitarias)."""
+        body = tableau[:-1, :-1]
+        labels = [None] * body.shape[0]
+        unit = (np.count_nonzero(np.abs(body) > 1e-10, axis=0) == 1) & (np.abs(body.sum(axis=0) - 1.0) < 1e-10)
+        for j in np.flatnonzero(unit):
+            row = int(np.argmax(body[:, j]))
+            if labels[row] is None and j in self.column_to_var:
+                labels[row] = list(self.column_to_var[int(j)])
+        self.tableau_basis = None if None in labels else labels
+
+    def sensitivity_report(self):
+        """
+        Análisis de sensibilidad exacto a partir de la base óptima de la última resolución
+        (Simplex revisado o la base final del tableau), sin volver a resolver el modelo:
+        - por variable: valor, costo reducido y rango de su coeficiente objetivo
+        - por restricción (orden A_ub y luego A_eq): precio sombra y rango del lado derecho
+        Los valores están en el sentido del usuario (max/min y signo original de cada fila).
+        Un límite infinito se reporta como None. Devuelve None si no hay una base óptima.
+        """
+        basis = self._report_basis()
+        if basis is None:
+            return None
+        n, m = self.n_vars, len(self.b_std)
+        total_cols = n + len(self.logical_rows)
+        factor = BasisFactorization(self._basis_matrix(basis))
+        x_B = factor.ftran(self.b_std)
+
+        cost = np.zeros(total_cols)
+        cost[:n] = self.c
+        y = factor.btran(cost[basis])
+        d = self._reduced_costs(cost, y)
+        d[basis] = 0
+        nonbasic = np.ones(total_cols, dtype=bool)
+        nonbasic[total_cols - self.num_artificial:] = False
+        nonbasic[basis] = False
+
+        # Internamente se minimiza: en maximización los sentidos de aumento/disminución se invierten
+        obj_sign = -1.0 if self.maximization else 1.0
+
+        def limit(values):
+            return round(float(values.min()), 4) if len(values) else None
+
+        position = {int(j): r for r, j in enumerate(basis)}
+        x = np.zeros(n)
+        variables = []
+        for j in range(n):
+            if j in position:
+                x[j] = x_B[position[j]]
+                # Mover c_j cambia los costos reducidos de las no básicas en -delta * alpha
+                alpha = self._tableau_row(factor, position[j], total_cols)
+                up = nonbasic & (alpha > 1e-9)
+                down = nonbasic & (alpha < -1e-9)
+                inc, dec = limit(d[up] / alpha[up]), limit(d[down] / -alpha[down])
+            else:
+                inc, dec = None, round(float(d[j]), 4)
+            if self.maximization:
+                inc, dec = dec, inc
+            variables.append({
+                "value": round(float(max(0, x[j])), 4),
+                "coefficient": float(self.c_orig[j]),
+                "reduced_cost": round(float(obj_sign * d[j]), 4),
+                "allowable_increase": inc,
+                "allowable_decrease": dec
+            })
+
+        row_signs = np.concatenate([self.ub_signs, self.eq_signs])
+        constraints = []
+        for i in range(m):
+            e_i = np.zeros(m)
+            e_i[i] = 1
+            col = factor.ftran(e_i)
+            # La base sigue siendo factible mientras x_B + delta * B^-1 e_i >= 0
+            inc = limit(x_B[col < -1e-9] / -col[col < -1e-9])
+            dec = limit(x_B[col > 1e-9] / col[col > 1e-9])
+            if row_signs[i] < 0:
+                inc, dec = dec, inc
+            constraints.append({
+                "rhs": float(row_signs[i] * self.b_std[i]),
+                "shadow_price": round(float(obj_sign * y[i] * row_signs[i]), 4),
+                "allowable_increase": inc,
+                "allowable_decrease": dec
+            })
+
+        return {"variables": variables, "constraints": constraints}
+
+    def _extract_revised_solution(self, basis, x_B):
+        """Mismo formato de salida que _extract_solution."""
+        x = np.zeros(self.n_vars)
+        for r, j in enumerate(basis):
+            if j < self.n_vars:
+                x[j] = max(0, x_B[r])
+
+        final_z = float(self.c_orig @ x)
+        return {
+            "status": "Optimal",
+            "objective_value": round(final_z, 4),
+            "variable_values": {f"x{i+1}": round(float(val), 4) for i, val in enumerate(x)},
+            "iterations": self.iterations
+        }
+
     def _run_iterations(self, tableau):
         max_iter = 1000
+        trace = current_trace()
         while self.iterations < max_iter:
             col, row = self._find_pivot(tableau)
             if col is None: break
@@ -186,7 +624,11 @@ class SimplexSolverV2:
             
             tableau = self._pivot(tableau, row, col)
             self.iterations += 1
+            if trace:
+                trace.add("tableau.pivot", iteration=self.iterations, column=int(col), row=int(row),
+                          objective=float(tableau[-1, -1]))
             
+        self._record_tableau_basis(tableau)
         return self._extract_solution(tableau)
 
     def _extract_solution(self, tableau):
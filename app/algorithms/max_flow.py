@@ -0,0 +1,251 @@
+from collections import deque
+import numpy as np
+from app.utils.logs import current_trace
+
+# ==========================================
+# FLUJO MÁXIMO SOBRE GRAFO RESIDUAL CSR
+# ==========================================
+# Nodos enteros 0..n-1. Cada arista k genera dos arcos residuales (ida con su capacidad
+# y vuelta con 0) ordenados por nodo de salida: los arcos de u son start[u]..start[u+1]-1.
+# rev[a] es el arco opuesto de a, así que empujar flujo es cap[a] -= f; cap[rev[a]] += f.
+
+
+class ResidualGraph:
+    def __init__(self, num_nodes, tails, heads, capacities):
+        tails = np.asarray(tails, dtype=int)
+        heads = np.asarray(heads, dtype=int)
+        capacities = np.asarray(capacities, dtype=float)
+        num_edges = len(tails)
+
+        arc_tails = np.concatenate([tails, heads])
+        order = np.argsort(arc_tails, kind="stable")
+        position = np.empty(2 * num_edges, dtype=int)
+        position[order] = np.arange(2 * num_edges)
+        opposite = np.concatenate([np.arange(num_edges, 2 * num_edges), np.arange(num_edges)])
+
+        self.num_nodes = num_nodes
+        self.num_edges = num_edges
+        self.capacities = capacities
+        self.edge_arcs = position[:num_edges]  # arco de ida de cada arista original
+        self.start = np.concatenate([[0], np.cumsum(np.bincount(arc_tails, minlength=num_nodes))]).tolist()
+        self.to = np.concatenate([heads, tails])[order].tolist()
+        self.rev = position[opposite[order]].tolist()
+        self.cap = np.concatenate([capacities, np.zeros(num_edges)])[order].tolist()
+
+    def edge_flows(self):
+        """Flujo de cada arista original: capacidad inicial menos capacidad residual."""
+        residual = np.array(self.cap)[self.edge_arcs]
+        return np.maximum(self.capacities - residual, 0.0)
+
+
+def dinic(graph, source, sink):
+    """
+    Dinic: grafo de niveles por BFS y caminos de aumento por DFS iterativa con punteros
+    al arco actual (cada arco se descarta a lo sumo una vez por fase).
+    """
+    start, to, rev, cap = graph.start, graph.to, graph.rev, graph.cap
+    n = graph.num_nodes
+    total = 0.0
+    trace = current_trace()
+    phase = 0
+
+    while True:
+        level = [-1] * n
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for a in range(start[u], start[u + 1]):
+                v = to[a]
+                if cap[a] > 0 and level[v] < 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[sink] < 0:
+            return total
+        phase += 1
+        if trace:
+            trace.add("dinic.phase", phase=phase, sink_level=level[sink], flow=total)
+
+        current = start[:-1]
+        path = []
+        u = source
+        while True:
+            if u == sink:
+                pushed = min(cap[a] for a in path)
+                for a in path:
+                    cap[a] -= pushed
+                    cap[rev[a]] += pushed
+                total += pushed
+                # Retroceder hasta antes del primer arco saturado
+                for k, a in enumerate(path):
+                    if cap[a] <= 0:
+                        del path[k:]
+                        break
+                u = to[path[-1]] if path else source
+                continue
+
+            end = start[u + 1]
+            a = current[u]
+            next_level = level[u] + 1
+            while a < end and (cap[a] <= 0 or level[to[a]] != next_level):
+                a += 1
+            current[u] = a
+            if a < end:
+                path.append(a)
+                u = to[a]
+            else:
+                # Callejón sin salida: se saca del grafo de niveles y se retrocede
+                level[u] = -1
+                if not path:
+                    break
+                back = path.pop()
+                u = to[rev[back]]
+                current[u] += 1
+
+
+def push_relabel(graph, source, sink):
+    """
+    Push-relabel eligiendo siempre el nodo activo de mayor etiqueta, con etiquetado global
+    inicial (BFS inverso desde el sumidero) y heurística de brecha (gap). El exceso que no
+    llega al sumidero vuelve a la fuente, así que el resultado es un flujo válido.
+    """
+    start, to, rev, cap = graph.start, graph.to, graph.rev, graph.cap
+    n = graph.num_nodes
+
+    # Etiquetas iniciales exactas: distancia al sumidero en el grafo residual
+    height = [n] * n
+    height[sink] = 0
+    queue = deque([sink])
+    while queue:
+        v = queue.popleft()
+        for a in range(start[v], start[v + 1]):
+            u = to[a]
+            if height[u] == n and u != source and cap[rev[a]] > 0:
+                height[u] = height[v] + 1
+                queue.append(u)
+    height[source] = n
+
+    count = [0] * (2 * n + 1)
+    for h in height:
+        count[h] += 1
+
+    excess = [0.0] * n
+    buckets = [[] for _ in range(2 * n + 1)]
+    highest = 0
+    for a in range(start[source], start[source + 1]):
+        if cap[a] > 0:
+            v = to[a]
+            pushed = cap[a]
+            cap[a] = 0.0
+            cap[rev[a]] += pushed
+            if excess[v] == 0 and v != sink and v != source:
+                buckets[height[v]].append(v)
+                highest = max(highest, height[v])
+            excess[v] += pushed
+
+    current = start[:-1]
+    while highest >= 0:
+        if not buckets[highest]:
+            highest -= 1
+            continue
+        u = buckets[highest].pop()
+
+        # Descargar u
+        while excess[u] > 0:
+            a = current[u]
+            if a == start[u + 1]:
+                # Reetiquetar
+                old = height[u]
+                new = 2 * n
+                for b in range(start[u], start[u + 1]):
+                    if cap[b] > 0 and height[to[b]] + 1 < new:
+                        new = height[to[b]] + 1
+                count[old] -= 1
+                height[u] = new
+                count[new] += 1
+                current[u] = start[u]
+                if count[old] == 0 and old < n:
+                    # Brecha: nadie con etiqueta entre old y n puede llegar al sumidero
+                    for v in range(n):
+                        if old < height[v] < n:
+                            count[height[v]] -= 1
+                            height[v] = n + 1
+                            count[n + 1] += 1
+                            current[v] = start[v]
+                    if height[u] < n + 1:
+                        count[height[u]] -= 1
+                        height[u] = n + 1
+                        count[n + 1] += 1
+                continue
+
+            v = to[a]
+            if cap[a] > 0 and height[u] == height[v] + 1:
+                pushed = min(excess[u], cap[a])
+                cap[a] -= pushed
+                cap[rev[a]] += pushed
+                excess[u] -= pushed
+                if excess[v] == 0 and v != sink and v != source:
+                    buckets[height[v]].append(v)
+                    if height[v] > highest:
+                        highest = height[v]
+                excess[v] += pushed
+            else:
+                current[u] = a + 1
+
+    return excess[sink]
+
+
+def edmonds_karp(graph, source, sink):
+    """
+    Edmonds-Karp: camino de aumento más corto (BFS) en el grafo residual, uno por vez.
+    O(V·E²); se mantiene como referencia y para comparar con los otros motores.
+    """
+    start, to, rev, cap = graph.start, graph.to, graph.rev, graph.cap
+    n = graph.num_nodes
+    total = 0.0
+
+    while True:
+        parent_arc = [-1] * n
+        parent_arc[source] = -2
+        queue = deque([source])
+        while queue and parent_arc[sink] == -1:
+            u = queue.popleft()
+            for a in range(start[u], start[u + 1]):
+                v = to[a]
+                if cap[a] > 0 and parent_arc[v] == -1:
+                    parent_arc[v] = a
+                    queue.append(v)
+        if parent_arc[sink] == -1:
+            return total
+
+        # Capacidad residual mínima del camino y actualización de los arcos
+        pushed = float("inf")
+        v = sink
+        while v != source:
+            a = parent_arc[v]
+            pushed = min(pushed, cap[a])
+            v = to[rev[a]]
+        v = sink
+        while v != source:
+            a = parent_arc[v]
+            cap[a] -= pushed
+            cap[rev[a]] += pushed
+            v = to[rev[a]]
+        total += pushed
+
+
+MAX_FLOW_ALGORITHMS = {
+    "dinic": dinic,
+    "push_relabel": push_relabel,
+    "edmonds_karp": edmonds_karp,
+}
+
+def max_flow(num_nodes, tails, heads, capacities, source, sink, algorithm="dinic"):
+    """Devuelve (valor del flujo máximo, flujo por arista) con el algoritmo indicado."""
+    if algorithm not in MAX_FLOW_ALGORITHMS:
+        raise ValueError(f"Algoritmo de flujo máximo desconocido: {algorithm}")
+    graph = ResidualGraph(num_nodes, tails, heads, capacities)
+    if source == sink:
+        return 0.0, graph.edge_flows()
+    value = MAX_FLOW_ALGORITHMS[algorithm](graph, source, sink)
+    return float(value), graph.edge_flows()
@@ -1,107 +1,68 @@
-import matplotlib.pyplot as plt
-import io
-import base64
 import heapq
-import matplotlib
-import networkx as nx
+import numpy as np
+from app.algorithms.network_simplex import NetworkSimplex
+from app.algorithms.max_flow import max_flow
+from app.algorithms.compiled_graph import compile_graph
+from app.utils.logs import get_logger
+from app.utils.metrics import measure, timed
 
-# Configurar Matplotlib para entornos sin interfaz gráfica
-matplotlib.use('Agg')
+logger = get_logger(__name__)
 
-# ==========================================
-# 1. MOTOR DE RENDERIZADO (SOLO DIBUJO)
-# ==========================================
-def generate_graph_image(graph_data, paths=None, title="Grafo", edge_labels=None, edge_color='gray', highlight_color='red'):
-    """
-    Usa NetworkX solo para posicionar nodos y dibujar.
-    La lógica de qué nodos y qué pesos mostrar viene del cálculo manual.
-    """
-    try:
-        plt.figure(figsize=(7, 5))
-        G = nx.DiGraph()
-        
-        for edge in graph_data:
-            u, v = edge[0], edge[1]
-            w = edge[2] if len(edge) > 2 else 0
-            G.add_edge(u, v, weight=w)
-
-        # Posicionamiento consistente de los nodos
-        pos = nx.spring_layout(G, seed=42) 
-        
-        if edge_labels is None:
-            edge_labels = {(u, v): f"{d['weight']}" for u, v, d in G.edges(data=True)}
-
-        # Dibujar base del grafo
-        nx.draw(G, pos, with_labels=True, node_color='lightblue', 
-                edge_color=edge_color, node_size=2000, font_size=10, 
-                arrowsize=20, width=1.5)
-        
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=9)
-
-        # Resaltar camino (para Dijkstra o flujo)
-        if paths and len(paths) > 1:
-            edges_path = [(paths[i], paths[i + 1]) for i in range(len(paths) - 1)]
-            nx.draw_networkx_edges(G, pos, edgelist=edges_path, edge_color=highlight_color, width=3)
-
-        plt.title(title, fontweight='bold')
-        plt.axis('off')
-
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png", bbox_inches='tight')
-        buf.seek(0)
-        image_base64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-        plt.close()
-        return image_base64
-    except Exception as e:
-        print(f"Error en renderizado: {e}")
-        return ""
+# Los algoritmos devuelven solo números; las imágenes se dibujan aparte y bajo demanda
+# (ver app/services/network_rendering.py)
 
 # ==========================================
-# 2. LÓGICA DESDE CERO (SIN LIBRERÍAS DE GRAFOS)
+# 1. LÓGICA DESDE CERO (SIN LIBRERÍAS DE GRAFOS)
 # ==========================================
 
-def dijkstra_algorithm(graph, start_node):
-    nodes = set()
-    adj_list = {}
-    for u, v, weight, capacity in graph:
-        nodes.add(u); nodes.add(v)
-        if u not in adj_list: adj_list[u] = []
-        adj_list[u].append((v, weight))
-    
-    for node in nodes:
-        if node not in adj_list: adj_list[node] = []
+def _csr_dijkstra(num_nodes, start_idx, neighbors, weights, edge_ids, start):
+    """Dijkstra genérico sobre una adyacencia CSR: distancias, nodo previo y arista previa."""
+    distances = [float('inf')] * num_nodes
+    previous = [-1] * num_nodes
+    previous_edge = [-1] * num_nodes
+    distances[start] = 0.0
+    pq = [(0.0, start)]
 
-    distances = {node: float('inf') for node in nodes}
-    distances[start_node] = 0
-    previous = {node: None for node in nodes}
-    pq = [(0, start_node)]
-    
     while pq:
-        current_dist, current_node = heapq.heappop(pq)
-        if current_dist > distances[current_node]: continue
-        
-        for neighbor, weight in adj_list[current_node]:
-            distance = current_dist + weight
-            if distance < distances[neighbor]:
-                distances[neighbor] = distance
-                previous[neighbor] = current_node
-                heapq.heappush(pq, (distance, neighbor))
-    
-    end_node = max(distances.keys(), key=lambda x: distances[x] if distances[x] != float('inf') else -1)
-    
+        current_dist, u = heapq.heappop(pq)
+        if current_dist > distances[u]: continue
+
+        for a in range(start_idx[u], start_idx[u + 1]):
+            v = neighbors[a]
+            distance = current_dist + weights[a]
+            if distance < distances[v]:
+                distances[v] = distance
+                previous[v] = u
+                previous_edge[v] = edge_ids[a]
+                heapq.heappush(pq, (distance, v))
+    return distances, previous, previous_edge
+
+def shortest_path_tree(g, start):
+    """Dijkstra sobre la adyacencia CSR: distancias y predecesores (ids) desde `start`."""
+    distances, previous, _ = _csr_dijkstra(g.num_nodes, g.out_start, g.out_heads, g.out_weights, g.out_edges, start)
+    return distances, previous
+
+def _num_edges(graph, *_, **__):
+    return len(graph.edges) if hasattr(graph, "edges") else len(graph)
+
+@timed("dijkstra", size=_num_edges)
+def dijkstra_algorithm(graph, start_node):
+    g = compile_graph(graph)
+    distances, previous = shortest_path_tree(g, g.index[start_node])
+
+    # Nodo final: el alcanzable más lejano desde el inicio
+    end = max(range(g.num_nodes), key=lambda x: distances[x] if distances[x] != float('inf') else -1)
+
     path = []
-    curr = end_node
-    while curr is not None:
+    curr = end
+    while curr != -1:
         path.append(curr)
         curr = previous[curr]
-    path.reverse()
-    
-    img = generate_graph_image(graph, path, "Ruta Más Corta (Dijkstra)")
-    
+    path = g.names(reversed(path))
+
     return {
-        "total_weight": float(distances[end_node]),
-        "node_order": path,
-        "graph_image": img
+        "total_weight": float(distances[end]),
+        "node_order": path
     }
 
 class UnionFind:
@@ -117,192 +78,220 @@ class UnionFind:
             return True
         return False
 
+@timed("kruskal", size=_num_edges)
 def minimum_spanning_tree(graph):
-    nodes = sorted(list(set([edge[0] for edge in graph] + [edge[1] for edge in graph])))
-    node_to_idx = {node: i for i, node in enumerate(nodes)}
-    
-    edges = sorted([(edge[2], edge[0], edge[1]) for edge in graph])
-    uf = UnionFind(len(nodes))
+    g = compile_graph(graph)
+
+    # Kruskal: aristas por (peso, u, v); los ids siguen el orden de los nombres
+    order = np.lexsort((g.heads, g.tails, g.weights)).tolist()
+    tails, heads = g.tails.tolist(), g.heads.tolist()
+    uf = UnionFind(g.num_nodes)
     mst_edges = []
     total_weight = 0
     
-    for weight, u, v in edges:
-        if uf.union(node_to_idx[u], node_to_idx[v]):
+    for k in order:
+        if uf.union(tails[k], heads[k]):
+            u, v, weight = g.edges[k][:3]
             mst_edges.append((u, v, weight))
             total_weight += weight
-            
-    img = generate_graph_image(mst_edges, title="Árbol de Expansión Mínima (Kruskal)", edge_color='green')
-    
+
     return {
         "edges": mst_edges,
-        "total_weight": float(total_weight),
-        "graph_image": img
+        "total_weight": float(total_weight)
     }
 
-def ford_fulkerson_algorithm(graph, source=None, sink=None):
-    adj = {}
-    caps = {}
-    original_graph = []
-    all_nodes = set()
-
-    # 1. Mapeo de la red y detección automática de Source/Sink
-    for u, v, w, cap in graph:
-        all_nodes.update([u, v])
-        adj.setdefault(u, []).append(v)
-        adj.setdefault(v, []).append(u)
-        # Manejamos el caso de aristas duplicadas sumando capacidades
-        caps[(u, v)] = caps.get((u, v), 0) + cap
-        caps.setdefault((v, u), 0) 
-        original_graph.append((u, v, w, cap))
-
-    # 2. Lógica de detección automática si no se pasan por parámetro
+def ford_fulkerson_algorithm(graph, source=None, sink=None, algorithm="dinic"):
+    """
+    Flujo máximo de source a sink sobre el grafo residual CSR (ver max_flow.py).
+    `algorithm` elige el motor: "dinic" (por defecto), "push_relabel" o "edmonds_karp".
+    """
+    g = compile_graph(graph)
+    with measure(f"max_flow.{algorithm}", size=g.num_edges):
+        return _ford_fulkerson(g, source, sink, algorithm)
+
+def _ford_fulkerson(g, source, sink, algorithm):
+    """Flujo máximo con el grafo ya compilado: valor, flujo por arista, source y sink."""
     if source is None or sink is None:
-        # Fuente: Nodo que solo tiene salidas (o la primera letra del alfabeto)
-        # Sumidero: Nodo que solo tiene entradas (o la última letra del alfabeto)
-        sorted_nodes = sorted(list(all_nodes))
-        source = sorted_nodes[0]
-        sink = sorted_nodes[-1]
-
-    def bfs():
-        parent = {source: None}
-        queue = [source]
-        while queue:
-            u = queue.pop(0)
-            for v in adj.get(u, []):
-                # IMPORTANTE: Verificamos capacidad residual real
-                if v not in parent and caps.get((u, v), 0) > 0:
-                    parent[v] = u
-                    queue.append(v)
-                    if v == sink: return parent
-        return None
-
-    max_flow = 0
-    # 3. Bucle principal de Ford-Fulkerson (Edmonds-Karp)
-    while True:
-        parent = bfs()
-        if not parent: break
-        
-        # Hallar la capacidad residual mínima en el camino encontrado
-        path_flow = float('inf')
-        s = sink
-        while s != source:
-            path_flow = min(path_flow, caps[(parent[s], s)])
-            s = parent[s]
-            
-        max_flow += path_flow
-        # Actualizar capacidades residuales
-        v = sink
-        while v != source:
-            u = parent[v]
-            caps[(u, v)] -= path_flow
-            caps[(v, u)] += path_flow
-            v = parent[v]
-
-    # Generar etiquetas para el gráfico: "Enviado / Capacidad"
-    flow_labels = {}
-    for u, v, w, cap_orig in original_graph:
-        # El flujo enviado es la capacidad inicial menos lo que quedó libre
-        enviado = cap_orig - caps.get((u, v), 0)
-        # Aseguramos que no muestre valores negativos por aristas inversas
-        enviado = max(0, enviado)
-        flow_labels[(u, v)] = f"{int(enviado)} / {int(cap_orig)}"
-
-    img = generate_graph_image(original_graph, title=f"Max Flow: {max_flow} ({source} a {sink})", edge_labels=flow_labels)
+        source, sink = g.source, g.sink
+
+    value, flows = max_flow(
+        g.num_nodes, g.tails, g.heads, g.capacities, g.index[source], g.index[sink], algorithm
+    )
 
     return {
-        "max_flow": float(max_flow),
-        "graph_image": img,
+        "max_flow": value,
+        "flows": [
+            {"from": u, "to": v, "flow": float(f), "capacity": cap}
+            for (u, v, w, cap), f in zip(g.edges, flows)
+        ],
         "source": source,
-        "sink": sink
+        "sink": sink,
+        "algorithm": algorithm
     }
 
-    # Generar etiquetas dinámicas: "Flujo / Capacidad"
-    flow_labels = {}
-    for u, v, w, cap_orig in original_graph:
-        enviado = cap_orig - caps[(u, v)]
-        flow_labels[(u, v)] = f"{int(enviado)} / {int(cap_orig)}"
+@timed("min_cost_flow", size=_num_edges)
+def min_cost_flow_algorithm(graph, source=None, sink=None, supplies=None):
+    """
+    Flujo de costo mínimo con el simplex de redes. Cada arista es [u, v, costo, capacidad].
+    - Con `supplies` ({nodo: oferta}, demandas negativas) resuelve ese problema de transbordo.
+    - Sin `supplies` envía el flujo máximo de source a sink al menor costo posible: se agrega
+      un arco de retorno sink -> source con costo muy negativo para premiar cada unidad enviada.
+    """
+    g = compile_graph(graph)
+    tails, heads, costs, capacities = g.tails, g.heads, g.weights, g.capacities
+    balance = np.zeros(g.num_nodes)
+
+    if supplies is not None:
+        for node, value in supplies.items():
+            balance[g.index[node]] = value
+    else:
+        if source is None or sink is None:
+            source, sink = g.source, g.sink
+        s, t = g.index[source], g.index[sink]
+        tails = np.append(tails, t)
+        heads = np.append(heads, s)
+        costs = np.append(costs, -(1.0 + np.abs(costs).sum()))
+        capacities = np.append(capacities, capacities[g.tails == s].sum())
 
-    img = generate_graph_image(original_graph, title="Flujo Máximo (Enviado / Capacidad)", edge_labels=flow_labels)
+    solver = NetworkSimplex(g.num_nodes, tails, heads, costs, balance, capacities)
+    status = solver.solve()
+    if status != "Optimal":
+        return {"status": status, "source": source, "sink": sink}
+
+    all_flows = solver.arc_flows()
+    flows = all_flows[:g.num_edges]
+    if supplies is None:
+        total_flow = float(all_flows[-1])  # lo que vuelve por el arco de retorno
+    else:
+        total_flow = float(sum(value for value in supplies.values() if value > 0))
 
     return {
-        "max_flow": float(max_flow),
-        "graph_image": img
+        "status": status,
+        "min_cost": float(flows @ g.weights),
+        "total_flow": total_flow,
+        "flows": [
+            {"from": u, "to": v, "flow": float(f), "capacity": cap, "cost": w}
+            for (u, v, w, cap), f in zip(g.edges, flows)
+        ],
+        "source": source,
+        "sink": sink
     }
+
+def _distance_without_edge(g, start, end, removed, to_end):
+    """
+    Distancia de start a end sin la arista `removed`, con A*: la distancia exacta al destino
+    en el grafo completo (`to_end`) es una cota inferior consistente también sin la arista,
+    así que la búsqueda solo expande los nodos necesarios para el desvío.
+    """
+    inf = float('inf')
+    start_idx, heads, weights, edge_ids = g.out_start, g.out_heads, g.out_weights, g.out_edges
+    best = {start: 0.0}
+    pq = [(to_end[start], 0.0, start)]
+
+    while pq:
+        _, dist, u = heapq.heappop(pq)
+        if u == end:
+            return dist
+        if dist > best[u]: continue
+
+        for a in range(start_idx[u], start_idx[u + 1]):
+            v = heads[a]
+            if edge_ids[a] == removed or to_end[v] == inf:
+                continue
+            distance = dist + weights[a]
+            if distance < best.get(v, inf):
+                best[v] = distance
+                heapq.heappush(pq, (distance + to_end[v], distance, v))
+    return inf
+
+@timed("sensitivity.shortest_path", size=_num_edges)
 def sensitivity_analysis_shortest_path(graph, start_node, end_node):
     """
     Análisis de sensibilidad: calcula el impacto de eliminar cada arista 
-    en la ruta más corta original.
+    en la ruta más corta original de start_node a end_node.
+    Un Dijkstra hacia adelante da la ruta y uno inverso desde el destino da la distancia
+    restante de cada nodo. Quitar una arista fuera de la ruta no cambia nada; solo las
+    aristas de la ruta necesitan buscar un desvío (A* guiado por la distancia restante).
     """
-    # 1. Calcular la distancia base
-    base_result = dijkstra_algorithm(graph, start_node)
-    base_length = base_result["total_weight"]
+    g = compile_graph(graph)
+    start, end = g.index[start_node], g.index[end_node]
+
+    # 1. Calcular la distancia base y la ruta (como aristas) desde el inicio
+    from_start, previous, previous_edge = _csr_dijkstra(
+        g.num_nodes, g.out_start, g.out_heads, g.out_weights, g.out_edges, start
+    )
+    base_length = from_start[end]
     
     # Si de entrada no hay ruta, no hay mucho que analizar
     if base_length == float('inf'):
         return {"error": "No existe una ruta inicial entre los nodos seleccionados"}
 
+    to_end, _, _ = _csr_dijkstra(g.num_nodes, g.in_start, g.in_tails, g.in_weights, g.in_edges, end)
+
+    path_edges = set()
+    node = end
+    while node != start:
+        path_edges.add(previous_edge[node])
+        node = previous[node]
+
     sensitivities = {}
     
     # 2. Probar eliminando una arista a la vez
-    for i, edge in enumerate(graph):
+    for i, edge in enumerate(g.edges):
         u_rem, v_rem = edge[0], edge[1]
-        
-        # Crear un grafo temporal sin la arista actual
-        temp_graph = [e for j, e in enumerate(graph) if i != j]
-        
-        try:
-            temp_result = dijkstra_algorithm(temp_graph, start_node)
-            new_length = temp_result["total_weight"]
-            
+
+        if i not in path_edges:
+            impact = 0.0
+        else:
+            new_length = _distance_without_edge(g, start, end, i, to_end)
             if new_length == float('inf'):
                 impact = "Ruta se vuelve imposible"
             else:
                 impact = new_length - base_length
-                
-            sensitivities[f"{u_rem} -> {v_rem}"] = impact
-        except Exception as e:
-            sensitivities[f"{u_rem} -> {v_rem}"] = f"Error: {str(e)}"
+
+        sensitivities[f"{u_rem} -> {v_rem}"] = impact
             
     return sensitivities
 # ==========================================
-# 3. PUNTO DE ENTRADA PRINCIPAL
+# 2. PUNTO DE ENTRADA PRINCIPAL
 # ==========================================
-def solve_all_problems(graph):
+def solve_all_problems(graph, max_flow_algorithm="dinic", sensitivity_nodes=None):
     if not graph:
         return {"error": "Grafo vacío"}
     
     # 1. IDENTIFICACIÓN ESTÁTICA DE NODOS (Agnóstica al orden)
-    all_nodes = set()
-    for u, v, w, cap in graph:
-        all_nodes.update([u, v])
-    
-    # Ordenamos alfabéticamente para que el 'mínimo' siempre sea el inicio 
-    # y el 'máximo' el final, sin importar el orden del array.
-    sorted_nodes = sorted(list(all_nodes))
-    source = sorted_nodes[0]
-    sink = sorted_nodes[-1]
+    # El grafo se compila una sola vez; los ids siguen el orden alfabético, así que
+    # el 'mínimo' siempre es el inicio y el 'máximo' el final, sin importar el orden del array.
+    g = compile_graph(graph)
+    source = g.source
+    sink = g.sink
 
     # 2. EJECUCIÓN DE ALGORITMOS PASANDO LOS NODOS EXPLÍCITOS
     # Pasamos 'source' a Dijkstra para que siempre empiece en el mismo lugar
-    res_dijkstra = dijkstra_algorithm(graph, source)
+    res_dijkstra = dijkstra_algorithm(g, source)
     
     # MST no depende de source/sink, así que este suele estar bien
-    res_mst = minimum_spanning_tree(graph)
+    res_mst = minimum_spanning_tree(g)
     
     # Pasamos source y sink explícitos a Ford-Fulkerson
-    res_max_flow = ford_fulkerson_algorithm(graph, source, sink)
+    res_max_flow = ford_fulkerson_algorithm(g, source, sink, max_flow_algorithm)
+
+    # Flujo máximo de source a sink al menor costo (simplex de redes)
+    res_min_cost_flow = min_cost_flow_algorithm(g, source, sink)
     
     # Ejecutamos análisis de sensibilidad con los mismos nodos consistentes
-    sensibilidad = sensitivity_analysis_shortest_path(graph, source, sink)
+    # (o con el par (inicio, fin) que pida quien llama)
+    sens_start, sens_end = sensitivity_nodes or (source, sink)
+    sensibilidad = sensitivity_analysis_shortest_path(g, sens_start, sens_end)
 
     # 3. CONSTRUCCIÓN DE RESULTADOS
     results = {
         "shortest_path": res_dijkstra,
         "mst": res_mst,
         "max_flow": res_max_flow,
-        "sensitivity": sensibilidad,
-        "graph_image_base64": res_dijkstra["graph_image"]
+        "min_cost_flow": res_min_cost_flow,
+        "sensitivity": sensibilidad
     }
     
-    print(f"✅ Cálculos consistentes completados: {source} -> {sink}")
+    logger.debug("✅ Cálculos consistentes completados: %s -> %s", source, sink)
     return results
\ No newline at end of file
@@ -0,0 +1,245 @@
+import numpy as np
+from app.utils.metrics import measure
+
+# ==========================================
+# SIMPLEX DE REDES PARA FLUJO DE COSTO MÍNIMO
+# ==========================================
+# Grafo compacto en arreglos: arco k = (tail[k] -> head[k]) con costo y capacidad.
+# La base es un árbol generador con un nodo raíz artificial unido a cada nodo por un arco
+# de costo Big-M. El árbol se mantiene "fuertemente factible" (cualquier nodo puede enviar
+# flujo positivo a la raíz por el árbol): basta con elegir como arco saliente el último
+# arco bloqueante del ciclo, recorrido desde el nodo de unión. Eso evita ciclar en pivotes
+# degenerados. El arco entrante se busca por bloques (block pivoting) con NumPy.
+
+STATE_UPPER = -1  # arco no básico en su capacidad
+STATE_TREE = 0    # arco básico
+STATE_LOWER = 1   # arco no básico con flujo 0
+
+
+class NetworkSimplex:
+    """
+    Flujo de costo mínimo: minimizar sum(cost * flow) sujeto a
+    (flujo que sale - flujo que entra) = supplies[nodo] y 0 <= flow <= capacity.
+    Las ofertas deben sumar 0 (oferta positiva, demanda negativa).
+    """
+
+    def __init__(self, num_nodes, tails, heads, costs, supplies, capacities=None):
+        n = num_nodes
+        root = n
+        tails = np.asarray(tails, dtype=int)
+        heads = np.asarray(heads, dtype=int)
+        costs = np.asarray(costs, dtype=float)
+        supplies = np.asarray(supplies, dtype=float)
+        num_arcs = len(tails)
+        if capacities is None:
+            capacities = np.full(num_arcs, np.inf)
+        else:
+            capacities = np.array([np.inf if c is None else c for c in capacities], dtype=float)
+
+        self.num_nodes = n
+        self.num_arcs = num_arcs
+        self.supplies = supplies
+        self.iterations = 0
+
+        # Arcos artificiales nodo->raíz (oferta >= 0) o raíz->nodo (demanda)
+        nodes = np.arange(n)
+        art_tails = np.where(supplies >= 0, nodes, root)
+        art_heads = np.where(supplies >= 0, root, nodes)
+        max_cost = float(np.abs(costs).max()) if num_arcs else 0.0
+        self.big_m = (n + 1) * max(1.0, max_cost) + 1.0
+        self.tol = 1e-12 * self.big_m
+
+        self.tail = np.concatenate([tails, art_tails])
+        self.head = np.concatenate([heads, art_heads])
+        self.cost = np.concatenate([costs, np.full(n, self.big_m)])
+        self.state = np.full(num_arcs + n, STATE_LOWER, dtype=np.int8)
+        self.state[num_arcs:] = STATE_TREE
+
+        # Listas de Python para los recorridos del árbol (más rápidas que indexar NumPy)
+        self._tail = self.tail.tolist()
+        self._head = self.head.tolist()
+        self._cost = self.cost.tolist()
+        self.cap = capacities.tolist() + [np.inf] * n
+        self.flow = [0.0] * num_arcs + np.abs(supplies).tolist()
+
+        # Árbol inicial: estrella alrededor de la raíz
+        self.parent = [root] * n + [-1]
+        self.pred = list(range(num_arcs, num_arcs + n)) + [-1]
+        self.depth = [1] * n + [0]
+        self.tree_arcs = [{num_arcs + i} for i in range(n)] + [set(range(num_arcs, num_arcs + n))]
+        self.pi = np.append(np.where(supplies >= 0, -self.big_m, self.big_m), 0.0)
+
+        total = num_arcs + n
+        self.block_size = max(10, int(np.sqrt(total)))
+        self.num_blocks = (total + self.block_size - 1) // self.block_size
+        self._next_block = 0
+
+    def _find_entering(self):
+        """Busca por bloques; dentro del primer bloque con violaciones toma la mayor."""
+        for k in range(self.num_blocks):
+            block = (self._next_block + k) % self.num_blocks
+            start = block * self.block_size
+            stop = start + self.block_size
+            violation = self.state[start:stop] * (
+                self.cost[start:stop] + self.pi[self.tail[start:stop]] - self.pi[self.head[start:stop]]
+            )
+            idx = int(np.argmin(violation))
+            if violation[idx] < -self.tol:
+                self._next_block = block
+                return start + idx
+        return None
+
+    def _pivot(self, entering):
+        """Hace un pivote con el arco entrante. Devuelve False si el ciclo no está acotado."""
+        tail, head, parent, pred, depth = self._tail, self._head, self.parent, self.pred, self.depth
+        flow, cap = self.flow, self.cap
+
+        # El flujo se empuja de first a second por el arco entrante y vuelve por el árbol
+        if self.state[entering] == STATE_LOWER:
+            first, second = tail[entering], head[entering]
+        else:
+            first, second = head[entering], tail[entering]
+
+        u, v = first, second
+        while u != v:
+            if depth[u] > depth[v]:
+                u = parent[u]
+            elif depth[v] > depth[u]:
+                v = parent[v]
+            else:
+                u, v = parent[u], parent[v]
+        join = u
+
+        # Arco saliente: el último bloqueante del ciclo (orden: join -> first -> second -> join)
+        delta, u_out, side = cap[entering], -1, 0
+        u = first
+        while u != join:
+            arc = pred[u]
+            d = flow[arc] if tail[arc] == u else cap[arc] - flow[arc]
+            if d < delta:
+                delta, u_out, side = d, u, 1
+            u = parent[u]
+        u = second
+        while u != join:
+            arc = pred[u]
+            d = cap[arc] - flow[arc] if tail[arc] == u else flow[arc]
+            if d <= delta:
+                delta, u_out, side = d, u, 2
+            u = parent[u]
+
+        if delta == np.inf:
+            return False
+
+        if delta > 0:
+            flow[entering] += delta if self.state[entering] == STATE_LOWER else -delta
+            u = first
+            while u != join:
+                arc = pred[u]
+                flow[arc] += -delta if tail[arc] == u else delta
+                u = parent[u]
+            u = second
+            while u != join:
+                arc = pred[u]
+                flow[arc] += delta if tail[arc] == u else -delta
+                u = parent[u]
+
+        self.iterations += 1
+        if side == 0:
+            # El propio arco entrante llega a su otra cota: el árbol no cambia
+            self.state[entering] = -self.state[entering]
+            return True
+
+        # El arco saliente queda exactamente en la cota que lo bloqueó
+        leaving = pred[u_out]
+        goes_down = (tail[leaving] == u_out) == (side == 1)
+        flow[leaving] = 0.0 if goes_down else cap[leaving]
+        self.state[leaving] = STATE_LOWER if goes_down else STATE_UPPER
+        self.state[entering] = STATE_TREE
+
+        self.tree_arcs[u_out].discard(leaving)
+        self.tree_arcs[parent[u_out]].discard(leaving)
+        x, y = (first, second) if side == 1 else (second, first)
+        self.tree_arcs[x].add(entering)
+        self.tree_arcs[y].add(entering)
+        self._hang(x, y, entering)
+        return True
+
+    def _hang(self, x, y, arc):
+        """Cuelga de y (por `arc`) el subárbol separado que contiene a x y desplaza sus potenciales."""
+        tail, head, parent, pred, depth = self._tail, self._head, self.parent, self.pred, self.depth
+        tree_arcs = self.tree_arcs
+
+        new_pi = self.pi[y] + self._cost[arc] if tail[arc] == y else self.pi[y] - self._cost[arc]
+        shift = new_pi - self.pi[x]
+
+        parent[x], pred[x], depth[x] = y, arc, depth[y] + 1
+        subtree = [x]
+        stack = [x]
+        while stack:
+            node = stack.pop()
+            up, level = pred[node], depth[node] + 1
+            for a in tree_arcs[node]:
+                if a != up:
+                    child = tail[a] + head[a] - node
+                    parent[child], pred[child], depth[child] = node, a, level
+                    subtree.append(child)
+                    stack.append(child)
+        self.pi[subtree] += shift
+
+    def solve(self, max_iter=None):
+        with measure("network_simplex", size=self.num_arcs) as metric:
+            status = self._solve(max_iter)
+            metric.iterations = self.iterations
+        return status
+
+    def _solve(self, max_iter):
+        if abs(self.supplies.sum()) > 1e-9 * max(1.0, np.abs(self.supplies).sum()):
+            return "Infeasible"
+        if max_iter is None:
+            max_iter = 100 * (self.num_nodes + self.num_arcs)
+        while self.iterations < max_iter:
+            entering = self._find_entering()
+            if entering is None:
+                break
+            if not self._pivot(entering):
+                return "Unbounded"
+        else:
+            return "Iteration limit"
+        # Si queda flujo en un arco artificial, las ofertas no se pueden enviar
+        if any(f > 1e-9 for f in self.flow[self.num_arcs:]):
+            return "Infeasible"
+        return "Optimal"
+
+    def arc_flows(self):
+        return np.array(self.flow[:self.num_arcs])
+
+    def total_cost(self):
+        return float(self.arc_flows() @ self.cost[:self.num_arcs])
+
+
+def sparse_transportation_network_simplex(supply, demand, origins, destinations, costs, capacities=None):
+    """
+    Problema de transporte balanceado sobre una lista de rutas: la ruta k va del origen
+    origins[k] al destino destinations[k]. Solo existen esas rutas, así que memoria y tiempo
+    dependen del número de rutas y no de m x n. Devuelve (status, flujo por ruta, costo total).
+    """
+    m = len(supply)
+    tails = np.asarray(origins, dtype=int)
+    heads = m + np.asarray(destinations, dtype=int)
+    supplies = np.concatenate([np.asarray(supply, dtype=float), -np.asarray(demand, dtype=float)])
+
+    solver = NetworkSimplex(m + len(demand), tails, heads, costs, supplies, capacities)
+    status = solver.solve()
+    return status, solver.arc_flows(), solver.total_cost()
+
+def transportation_network_simplex(supply, demand, costs):
+    """
+    Resuelve el problema de transporte balanceado como flujo de costo mínimo en el grafo
+    bipartito completo orígenes -> destinos. Devuelve (status, asignación m x n, costo total).
+    """
+    costs = np.asarray(costs, dtype=float)
+    m, n = costs.shape
+    status, flows, total_cost = sparse_transportation_network_simplex(
+        supply, demand, np.repeat(np.arange(m), n), np.tile(np.arange(n), m), costs.ravel()
+    )
+    return status, flows.reshape(m, n), total_cost
@@ -0,0 +1,45 @@
+import numpy as np
+from scipy.linalg.blas import dger
+
+# Núcleo de pivoteo compartido por SimplexSolver y SimplexSolverV2.
+
+
+def as_tableau(tableau):
+    """Devuelve el tableau como float64 contiguo en C, que es lo que espera pivot_inplace."""
+    return np.ascontiguousarray(tableau, dtype=np.float64)
+
+
+def pivot_inplace(tableau, row, col):
+    """
+    Operación de Gauss-Jordan como una única actualización de rango 1:
+        T <- T - f (T[row] / T[row, col])^T,   con f = T[:, col] y f[row] = 0
+    Sobre un tableau float64 contiguo se hace en sitio con BLAS (dger), sin copias del tableau.
+    """
+    pivot_row = tableau[row]
+    pivot_row /= pivot_row[col]
+
+    factors = tableau[:, col].copy()
+    factors[row] = 0.0
+
+    if tableau.dtype == np.float64 and tableau.flags.c_contiguous:
+        # T^T es contiguo en Fortran, así que dger lo actualiza sin copiarlo
+        updated = dger(-1.0, pivot_row.copy(), factors, a=tableau.T, overwrite_a=1)
+        if not np.may_share_memory(updated, tableau):
+            # SciPy devolvió una copia en lugar de escribir en sitio: se copia el resultado
+            tableau[...] = updated.T
+    else:
+        tableau -= np.outer(factors, pivot_row)
+    return tableau
+
+
+def min_ratio_row(column, rhs, tol=1e-10):
+    """
+    Prueba de la razón mínima vectorizada: solo las filas con coeficiente > tol participan.
+    Devuelve el índice de la fila pivote o None si la columna no tiene elementos positivos.
+    """
+    ratios = np.full(len(column), np.inf)
+    np.divide(rhs, column, out=ratios, where=column > tol)
+    row = int(np.argmin(ratios))
+    if ratios[row] == np.inf:
+        return None
+    return row
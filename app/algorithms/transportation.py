@@ -1,5 +1,11 @@
 import numpy as np
+from app.algorithms.transportation_simplex import TransportationSimplex
+from app.utils.logs import get_logger
+from app.utils.metrics import measure, timed
 
+logger = get_logger(__name__)
+
+@timed("build.transport", size=lambda supply, demand, costs: len(supply) * len(demand))
 def balance_transportation_problem(supply, demand, costs):
     """
     Verifica si el problema de transporte está balanceado. Si no lo está,
@@ -8,7 +14,7 @@ def balance_transportation_problem(supply, demand, costs):
     total_supply = sum(supply)
     total_demand = sum(demand)
 
-    print(f"📌 Total Supply: {total_supply}, Total Demand: {total_demand}")  # 🔍 Agregar log
+    logger.debug("📌 Total Supply: %s, Total Demand: %s", total_supply, total_demand)
 
     if None in supply or None in demand or None in costs:
         raise ValueError("❌ Se encontraron valores None en supply, demand o costs.")
@@ -25,6 +31,61 @@ def balance_transportation_problem(supply, demand, costs):
 
     return supply, demand, costs
 
+def parse_lanes(lanes, num_origins, num_destinations):
+    """
+    Convierte la lista de rutas [origen, destino, costo] o [origen, destino, costo, capacidad]
+    (índices desde 0) en arreglos. Lanza ValueError si alguna ruta es inválida.
+    """
+    origins = np.empty(len(lanes), dtype=int)
+    destinations = np.empty(len(lanes), dtype=int)
+    costs = np.empty(len(lanes), dtype=float)
+    capacities = []
+    for k, lane in enumerate(lanes):
+        if not isinstance(lane, (list, tuple)) or len(lane) not in (3, 4):
+            raise ValueError(f"La ruta #{k+1} debe ser [origen, destino, costo] o [origen, destino, costo, capacidad].")
+        i, j = lane[0], lane[1]
+        if not isinstance(i, int) or not 0 <= i < num_origins:
+            raise ValueError(f"La ruta #{k+1} tiene un origen inválido: {i}.")
+        if not isinstance(j, int) or not 0 <= j < num_destinations:
+            raise ValueError(f"La ruta #{k+1} tiene un destino inválido: {j}.")
+        origins[k], destinations[k], costs[k] = i, j, float(lane[2])
+        capacities.append(lane[3] if len(lane) == 4 else None)
+    return origins, destinations, costs, capacities
+
+def balance_sparse_transportation_problem(supply, demand, origins, destinations, costs, capacities):
+    """
+    Versión por rutas de balance_transportation_problem: el nodo ficticio (destino m-ésimo
+    u origen n-ésimo) se une con rutas de costo cero a todos los nodos del otro lado, así
+    que solo se agregan m o n rutas en lugar de una fila o columna densa.
+    """
+    supply = list(supply)
+    demand = list(demand)
+    total_supply = sum(supply)
+    total_demand = sum(demand)
+
+    logger.debug("📌 Total Supply: %s, Total Demand: %s", total_supply, total_demand)
+
+    if total_supply > total_demand:
+        dummy = len(demand)
+        demand.append(total_supply - total_demand)
+        origins = np.concatenate([origins, np.arange(len(supply))])
+        destinations = np.concatenate([destinations, np.full(len(supply), dummy)])
+        costs = np.concatenate([costs, np.zeros(len(supply))])
+        capacities = capacities + [None] * len(supply)
+    elif total_demand > total_supply:
+        dummy = len(supply)
+        supply.append(total_demand - total_supply)
+        origins = np.concatenate([origins, np.full(len(demand), dummy)])
+        destinations = np.concatenate([destinations, np.arange(len(demand))])
+        costs = np.concatenate([costs, np.zeros(len(demand))])
+        capacities = capacities + [None] * len(demand)
+
+    return supply, demand, origins, destinations, costs, capacities
+
+def _cells(supply, demand, *_):
+    return len(supply) * len(demand)
+
+@timed("transport.northwest", size=_cells)
 def northwest_corner_method(supply, demand):
     """
     Método de Esquina Noroeste para encontrar una solución inicial.
@@ -45,9 +106,10 @@ def northwest_corner_method(supply, demand):
         if demand[j] == 0:
             j += 1
 
-    print("✅ Solución Inicial (Esquina Noroeste):\n", allocation)
+    logger.debug("✅ Solución Inicial (Esquina Noroeste):\n%s", allocation)
     return allocation
 
+@timed("transport.minimum_cost", size=_cells)
 def minimum_cost_method(supply, demand, costs):
     """
     Método de Costo Mínimo para encontrar una solución inicial.
@@ -68,50 +130,98 @@ def minimum_cost_method(supply, demand, costs):
             supply[i] -= min_val
             demand[j] -= min_val
 
-    print("✅ Solución Inicial (Costo Mínimo):\n", allocation)
+    logger.debug("✅ Solución Inicial (Costo Mínimo):\n%s", allocation)
     return allocation
 
+def _two_smallest(costs, lines, active_idx):
+    """
+    Para cada línea de `lines` (filas de `costs`) devuelve los dos costos más pequeños entre
+    las posiciones activas y la posición del menor. Si solo queda una, el segundo es inf.
+    """
+    sub = costs[np.ix_(lines, active_idx)]
+    if sub.shape[1] == 1:
+        return sub[:, 0], np.full(len(lines), np.inf), np.full(len(lines), active_idx[0])
+    two = np.argpartition(sub, 1, axis=1)[:, :2]
+    rows = np.arange(len(lines))[:, None]
+    two_vals = sub[rows, two]
+    order = np.argsort(two_vals, axis=1)
+    two = np.take_along_axis(two, order, axis=1)
+    two_vals = np.take_along_axis(two_vals, order, axis=1)
+    return two_vals[:, 0], two_vals[:, 1], active_idx[two[:, 0]]
+
+@timed("transport.vogel", size=_cells)
 def vogel_approximation_method(supply, demand, costs):
     """
     Método de Aproximación de Vogel para encontrar una solución inicial.
+    Guarda los dos costos más pequeños de cada fila y columna activa; tras cada asignación
+    solo se recalculan las líneas cuyo mínimo o segundo mínimo estaba en la línea eliminada.
+    La mayor penalización se elige con argmax sobre arreglos enmascarados.
     """
-    supply = supply.copy()
-    demand = demand.copy()
-    costs = np.array(costs, dtype=float)  # ✅ Convertir a float para evitar errores con np.inf
-    allocation = np.zeros((len(supply), len(demand)))
-
-    while np.any(supply) and np.any(demand):
-        penalties = []
-
-        # Calcular penalizaciones por fila y columna
-        for i, row in enumerate(costs):
-            if supply[i] > 0:
-                sorted_row = sorted(row)
-                penalties.append((sorted_row[1] - sorted_row[0], 'row', i))
-
-        for j, col in enumerate(costs.T):
-            if demand[j] > 0:
-                sorted_col = sorted(col)
-                penalties.append((sorted_col[1] - sorted_col[0], 'col', j))
-
-        # Seleccionar la fila o columna con la mayor penalización
-        max_penalty = max(penalties, key=lambda x: x[0])
-
-        if max_penalty[1] == 'row':
-            i = max_penalty[2]
-            j = np.argmin(costs[i])
+    supply = np.array(supply, dtype=float)
+    demand = np.array(demand, dtype=float)
+    costs = np.array(costs, dtype=float)
+    m, n = costs.shape
+    allocation = np.zeros((m, n))
+
+    row_active = supply > 1e-9
+    col_active = demand > 1e-9
+    if not row_active.any() or not col_active.any():
+        return allocation
+
+    # Mínimo, segundo mínimo y posición del mínimo por fila (sobre columnas) y por columna
+    row_min = np.full(m, np.inf)
+    row_second = np.full(m, np.inf)
+    row_arg = np.zeros(m, dtype=int)
+    col_min = np.full(n, np.inf)
+    col_second = np.full(n, np.inf)
+    col_arg = np.zeros(n, dtype=int)
+
+    def refresh_rows(rows):
+        if len(rows):
+            row_min[rows], row_second[rows], row_arg[rows] = _two_smallest(costs, rows, np.flatnonzero(col_active))
+
+    def refresh_cols(cols):
+        if len(cols):
+            col_min[cols], col_second[cols], col_arg[cols] = _two_smallest(costs.T, cols, np.flatnonzero(row_active))
+
+    refresh_rows(np.flatnonzero(row_active))
+    refresh_cols(np.flatnonzero(col_active))
+
+    while row_active.any() and col_active.any():
+        # Penalización: diferencia entre los dos menores (con una sola celda, su costo)
+        with np.errstate(invalid="ignore"):  # inf - inf en líneas ya eliminadas
+            row_penalty = np.where(np.isinf(row_second), row_min, row_second - row_min)
+            col_penalty = np.where(np.isinf(col_second), col_min, col_second - col_min)
+        row_penalty[~row_active] = -np.inf
+        col_penalty[~col_active] = -np.inf
+
+        best_row = int(np.argmax(row_penalty))
+        best_col = int(np.argmax(col_penalty))
+        if row_penalty[best_row] >= col_penalty[best_col]:
+            i, j = best_row, int(row_arg[best_row])
         else:
-            j = max_penalty[2]
-            i = np.argmin(costs[:, j])
+            i, j = int(col_arg[best_col]), best_col
 
         # Asignar la cantidad máxima posible
         min_val = min(supply[i], demand[j])
-        allocation[i][j] = min_val
+        allocation[i, j] = min_val
         supply[i] -= min_val
         demand[j] -= min_val
 
-        # ✅ Asegurarse de que costs[i, j] sea float antes de asignar np.inf
-        costs[i, j] = float('inf')  # ✅ Convertir explícitamente a float
+        removed_row = supply[i] <= 1e-9
+        removed_col = demand[j] <= 1e-9
+        row_active[i] = not removed_row
+        col_active[j] = not removed_col
+        if not row_active.any() or not col_active.any():
+            break
+
+        # Solo cambian las líneas que tenían la línea eliminada entre sus dos menores
+        if removed_col:
+            rows = np.flatnonzero(row_active & ((row_arg == j) | (costs[:, j] <= row_second)))
+            refresh_rows(rows)
+        if removed_row:
+            cols = np.flatnonzero(col_active & ((col_arg == i) | (costs[i, :] <= col_second)))
+            refresh_cols(cols)
 
     return allocation
 
@@ -127,336 +237,35 @@ def calcular_costo_total(asignacion, costos):
             total += float(asignacion[i][j]) * float(costos[i][j])
     return total
 
-# 2. MODI mejorado - Implementación desde cero sin librerías de optimización
+# 2. MODI sobre el simplex de transporte con base en árbol (ver transportation_simplex.py)
 
-def modi_method(asignacion_inicial, costos, max_iter=100):
+def modi_method(asignacion_inicial, costos, max_iter=None):
     """
     Método MODI (Modified Distribution Method) para optimizar un problema de transporte.
-    Implementado completamente desde cero sin usar librerías de optimización.
+    La base se guarda como árbol generador: los potenciales U y V se actualizan solo en el
+    subárbol que cambia y el ciclo de cada celda entrante es el camino del árbol entre su
+    fila y su columna, así que cada iteración es O(m+n).
     
     Parámetros:
     - asignacion_inicial: Matriz de asignación inicial (de Northwest, Vogel, o Costo Mínimo)
     - costos: Matriz de costos unitarios
-    - max_iter: Número máximo de iteraciones
+    - max_iter: Número máximo de iteraciones (None = límite automático según el tamaño)
     
     Retorna:
     - (asignacion_optima, costo_total)
     """
-    # Convertir a listas para trabajar sin numpy en la lógica
-    if hasattr(asignacion_inicial, 'tolist'):
-        asignacion = [row[:] for row in asignacion_inicial.tolist()]
-    else:
-        asignacion = [row[:] for row in asignacion_inicial]
-    
-    if hasattr(costos, 'tolist'):
-        costos_lista = [row[:] for row in costos.tolist()]
-    else:
-        costos_lista = [row[:] for row in costos]
-    
-    m = len(asignacion)  # número de orígenes
-    n = len(asignacion[0]) if m > 0 else 0  # número de destinos
-    
-    print(f"📊 MODI: Iniciando optimización. Matriz {m}x{n}")
-    
-    for iteracion in range(max_iter):
-        print(f"\n🔄 Iteración MODI #{iteracion + 1}")
-        
-        # Paso 1: Obtener las celdas básicas (con asignación > 0)
-        celdas_basicas = []
-        for i in range(m):
-            for j in range(n):
-                if asignacion[i][j] > 1e-9:
-                    celdas_basicas.append((i, j))
-        
-        print(f"   Celdas básicas: {celdas_basicas}")
-        
-        # Verificar degeneración: necesitamos m + n - 1 celdas básicas
-        num_basicas_requeridas = m + n - 1
-        if len(celdas_basicas) < num_basicas_requeridas:
-            print(f"   ⚠️ Solución degenerada: {len(celdas_basicas)} < {num_basicas_requeridas}")
-            # Agregar épsilon a celdas no básicas para resolver degeneración
-            epsilon = 1e-9
-            for i in range(m):
-                for j in range(n):
-                    if len(celdas_basicas) >= num_basicas_requeridas:
-                        break
-                    if asignacion[i][j] <= 1e-9:
-                        asignacion[i][j] = epsilon
-                        celdas_basicas.append((i, j))
-                if len(celdas_basicas) >= num_basicas_requeridas:
-                    break
-        
-        # Paso 2: Calcular los multiplicadores U y V
-        U = [None] * m
-        V = [None] * n
-        U[0] = 0  # Fijar U[0] = 0 arbitrariamente
-        
-        # Resolver el sistema U[i] + V[j] = C[i][j] para celdas básicas
-        cambio = True
-        max_intentos = m * n + 10
-        intentos = 0
-        while cambio and intentos < max_intentos:
-            cambio = False
-            intentos += 1
-            for (i, j) in celdas_basicas:
-                costo = costos_lista[i][j]
-                if U[i] is not None and V[j] is None:
-                    V[j] = costo - U[i]
-                    cambio = True
-                elif V[j] is not None and U[i] is None:
-                    U[i] = costo - V[j]
-                    cambio = True
-        
-        # Rellenar valores None con 0 si quedaron
-        U = [0 if u is None else u for u in U]
-        V = [0 if v is None else v for v in V]
-        
-        print(f"   U = {U}")
-        print(f"   V = {V}")
-        
-        # Paso 3: Calcular costos reducidos para celdas no básicas
-        # Costo reducido = C[i][j] - U[i] - V[j]
-        celda_entrante = None
-        min_costo_reducido = 0
-        
-        for i in range(m):
-            for j in range(n):
-                if asignacion[i][j] <= 1e-9:  # Celda no básica
-                    costo_reducido = costos_lista[i][j] - U[i] - V[j]
-                    if costo_reducido < min_costo_reducido - 1e-9:
-                        min_costo_reducido = costo_reducido
-                        celda_entrante = (i, j)
-        
-        # Si no hay costos reducidos negativos, la solución es óptima
-        if celda_entrante is None:
-            print(f"   ✅ Solución óptima encontrada en iteración {iteracion + 1}")
-            break
-        
-        print(f"   Celda entrante: {celda_entrante} con costo reducido {min_costo_reducido:.4f}")
-        
-        # Paso 4: Encontrar el ciclo cerrado (stepping stone path)
-        ciclo = encontrar_ciclo_modi(asignacion, celda_entrante, m, n)
-        
-        if ciclo is None or len(ciclo) < 4:
-            print(f"   ❌ No se encontró ciclo válido para la celda {celda_entrante}")
-            break
-        
-        print(f"   Ciclo encontrado: {ciclo}")
-        
-        # Paso 5: Determinar theta (cantidad a transferir)
-        # theta = mínimo de las asignaciones en posiciones impares del ciclo (las que se restan)
-        theta = float('inf')
-        for idx in range(1, len(ciclo), 2):  # Posiciones impares (1, 3, 5, ...)
-            i, j = ciclo[idx]
-            if asignacion[i][j] < theta:
-                theta = asignacion[i][j]
-        
-        if theta <= 0 or theta == float('inf'):
-            print(f"   ❌ Theta inválido: {theta}")
-            break
-        
-        print(f"   Theta (cantidad a transferir): {theta}")
-        
-        # Paso 6: Actualizar la asignación
-        for idx, (i, j) in enumerate(ciclo):
-            if idx % 2 == 0:  # Posiciones pares: sumar
-                asignacion[i][j] += theta
-            else:  # Posiciones impares: restar
-                asignacion[i][j] -= theta
-                if asignacion[i][j] < 1e-9:
-                    asignacion[i][j] = 0
-        
-        costo_actual = calcular_costo_total(asignacion, costos_lista)
-        print(f"   Costo después de actualización: {costo_actual}")
-    
-    # Limpiar valores muy pequeños
-    for i in range(m):
-        for j in range(n):
-            if asignacion[i][j] < 1e-7:
-                asignacion[i][j] = 0
-    
-    costo_final = calcular_costo_total(asignacion, costos_lista)
-    print(f"\n🎯 MODI completado. Costo final: {costo_final}")
-    
-    return asignacion, costo_final
-
-
-def encontrar_ciclo_modi(asignacion, celda_entrante, m, n):
-    """
-    Encuentra un ciclo cerrado para el método MODI usando BFS.
-    El ciclo alterna entre movimientos horizontales y verticales,
-    pasando solo por celdas básicas (excepto la celda entrante).
-    
-    Retorna una lista de tuplas (i, j) que forman el ciclo, o None si no existe.
-    """
-    start_i, start_j = celda_entrante
-    
-    # Obtener celdas básicas
-    celdas_basicas = set()
-    for i in range(m):
-        for j in range(n):
-            if asignacion[i][j] > 1e-9:
-                celdas_basicas.add((i, j))
-    
-    # Agregar la celda entrante temporalmente
-    celdas_basicas.add(celda_entrante)
-    
-    # BFS para encontrar el ciclo
-    # Estado: (fila, columna, es_movimiento_horizontal, camino)
-    from collections import deque
-    
-    # Intentar empezando con movimiento horizontal
-    for direccion_inicial in [True, False]:  # True = horizontal, False = vertical
-        cola = deque()
-        cola.append((start_i, start_j, direccion_inicial, [(start_i, start_j)]))
-        
-        while cola:
-            ci, cj, es_horizontal, camino = cola.popleft()
-            
-            if es_horizontal:
-                # Buscar en la misma fila
-                for nj in range(n):
-                    if nj != cj and (ci, nj) in celdas_basicas:
-                        if (ci, nj) == celda_entrante and len(camino) >= 3:
-                            # Encontramos el ciclo!
-                            return camino
-                        if (ci, nj) not in camino:
-                            nuevo_camino = camino + [(ci, nj)]
-                            if len(nuevo_camino) <= m + n:  # Límite de longitud
-                                cola.append((ci, nj, False, nuevo_camino))
-            else:
-                # Buscar en la misma columna
-                for ni in range(m):
-                    if ni != ci and (ni, cj) in celdas_basicas:
-                        if (ni, cj) == celda_entrante and len(camino) >= 3:
-                            # Encontramos el ciclo!
-                            return camino
-                        if (ni, cj) not in camino:
-                            nuevo_camino = camino + [(ni, cj)]
-                            if len(nuevo_camino) <= m + n:  # Límite de longitud
-                                cola.append((ni, cj, True, nuevo_camino))
-    
-    return None
+    with measure("modi") as metric:
+        solver = TransportationSimplex(costos, asignacion_inicial)
+        logger.debug("📊 MODI: Iniciando optimización. Matriz %sx%s", solver.m, solver.n)
+        metric.size = solver.m * solver.n
 
+        status = solver.solve(max_iter)
+        metric.iterations = solver.iterations
+    if status != "Optimal":
+        logger.warning("⚠️ MODI detenido por límite de iteraciones (%s)", solver.iterations)
 
-# 3. update_allocation (mantenido por compatibilidad, pero ya no se usa directamente)
-
-def update_allocation(asignacion, ciclo):
-    """Actualiza la asignación según el ciclo MODI, robusto a errores y negativos."""
-    if ciclo is None or len(ciclo) < 4:
-        return asignacion
-    
-    # Encontrar theta
-    theta = float('inf')
-    for idx in range(1, len(ciclo), 2):
-        i, j = ciclo[idx]
-        val = asignacion[i][j] if hasattr(asignacion, '__getitem__') else asignacion[i, j]
-        if val < theta:
-            theta = val
-    
-    if theta <= 0:
-        return asignacion
-    
-    # Actualizar
-    for idx, (i, j) in enumerate(ciclo):
-        if idx % 2 == 0:
-            if hasattr(asignacion, '__getitem__') and hasattr(asignacion[i], '__setitem__'):
-                asignacion[i][j] += theta
-            else:
-                asignacion[i, j] += theta
-        else:
-            if hasattr(asignacion, '__getitem__') and hasattr(asignacion[i], '__setitem__'):
-                asignacion[i][j] -= theta
-                if asignacion[i][j] < 0:
-                    asignacion[i][j] = 0
-            else:
-                asignacion[i, j] -= theta
-                if asignacion[i, j] < 0:
-                    asignacion[i, j] = 0
-    
-    return asignacion
+    asignacion = solver.allocation().tolist()
+    costo_final = calcular_costo_total(asignacion, solver.costs)
+    logger.debug("🎯 MODI completado en %s iteraciones. Costo final: %s", solver.iterations, costo_final)
 
-
-# 4. find_loop (mantenido por compatibilidad)
-
-def find_loop(asignacion, celda_entrada):
-    """Busca un ciclo alternante válido para MODI. Usa la nueva implementación."""
-    if hasattr(asignacion, 'shape'):
-        m, n = asignacion.shape
-    else:
-        m = len(asignacion)
-        n = len(asignacion[0]) if m > 0 else 0
-    
-    # Convertir a lista si es necesario
-    if hasattr(asignacion, 'tolist'):
-        asig_lista = asignacion.tolist()
-    else:
-        asig_lista = asignacion
-    
-    return encontrar_ciclo_modi(asig_lista, celda_entrada, m, n)
-
-def calculate_potentials(allocation, costs):
-    """
-    Calcula los potenciales U y V para el método MODI.
-    """
-    rows, cols = allocation.shape
-    U = [None] * rows
-    V = [None] * cols
-
-    # 🔹 Inicializamos el primer potencial arbitrariamente en 0
-    U[0] = 0  
-
-    assigned_cells = [(i, j) for i in range(rows) for j in range(cols) if allocation[i][j] > 0]
-
-    updated = True
-    while updated:
-        updated = False
-        for i, j in assigned_cells:
-            if U[i] is not None and V[j] is None:
-                V[j] = costs[i][j] - U[i]
-                updated = True
-            elif V[j] is not None and U[i] is None:
-                U[i] = costs[i][j] - V[j]
-                updated = True
-
-    # ✅ Asignar 0 a cualquier valor None restante
-    U = [0 if u is None else u for u in U]
-    V = [0 if v is None else v for v in V]
-
-    print(f"✅ Potenciales corregidos: U = {U}, V = {V}")
-    return U, V
-
-def calculate_reduced_costs(U, V, costs):
-    """
-    Calcula los costos reducidos Z[i][j] = C[i][j] - (U[i] + V[j]).
-    """
-    rows, cols = costs.shape
-    reduced_costs = np.zeros((rows, cols))
-
-    for i in range(rows):
-        for j in range(cols):
-            if U[i] is not None and V[j] is not None:
-                reduced_costs[i][j] = costs[i][j] - (U[i] + V[j])
-            else:
-                reduced_costs[i][j] = float('inf')  # ✅ Evita errores si hay valores None
-
-    return reduced_costs
-
-def find_entering_cell(reduced_costs, allocation):
-    """
-    Encuentra la celda con el menor costo reducido negativo que NO está asignada.
-    """
-    min_value = np.min(reduced_costs)
-    if min_value >= 0:
-        return None  # La solución ya es óptima
-
-    candidates = []
-    for i in range(reduced_costs.shape[0]):
-        for j in range(reduced_costs.shape[1]):
-            if reduced_costs[i, j] == min_value and allocation[i, j] == 0:
-                candidates.append((i, j))
-    if not candidates:
-        print("❌ No se encontró celda entrante válida.")
-        return None
-    print(f"🔄 Celda(s) entrante(s) seleccionada(s): {candidates} con costo reducido {min_value}")
-    return candidates[0]  # O puedes probar todas en orden si quieres robustez
\ No newline at end of file
+    return asignacion, costo_final
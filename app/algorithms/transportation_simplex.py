@@ -0,0 +1,236 @@
+import numpy as np
+from app.utils.logs import current_trace
+
+# ==========================================
+# SIMPLEX DE TRANSPORTE CON BASE EN ÁRBOL
+# ==========================================
+# Nodos: orígenes 0..m-1 y destinos m..m+n-1. Una base son m+n-1 celdas que forman
+# un árbol generador del grafo bipartito. Con el árbol enraizado (parent/depth):
+# - el ciclo de la celda entrante es el camino del árbol entre su fila y su columna,
+# - al pivotear solo cambia el subárbol que queda colgando de la celda saliente,
+#   así que solo se recalculan sus potenciales.
+# Cada iteración cuesta O(m+n) en el árbol más la revisión de un bloque de filas.
+
+TOL = 1e-9
+
+
+class TransportationSimplex:
+    """
+    Resuelve el problema de transporte balanceado partiendo de una asignación inicial
+    factible (Esquina Noroeste, Costo Mínimo o Vogel).
+    """
+
+    def __init__(self, costs, allocation):
+        self.costs = np.asarray(costs, dtype=float)
+        self.m, self.n = self.costs.shape
+        # Los recorridos del árbol trabajan sobre listas de Python: indexar escalares en
+        # arreglos de NumPy dentro de esos bucles es varias veces más lento
+        self._cost_rows = self.costs.tolist()
+        self.num_nodes = self.m + self.n
+        self.iterations = 0
+
+        self.flow = {}  # celda básica (i, j) -> cantidad (puede ser 0 si es degenerada)
+        self.adjacency = [set() for _ in range(self.num_nodes)]
+        self.parent = [-1] * self.num_nodes
+        self.depth = [0] * self.num_nodes
+        self.potential = [0.0] * self.num_nodes
+
+        rows = max(1, int(np.ceil(np.sqrt(self.m))))
+        self._blocks = [(start, min(start + rows, self.m)) for start in range(0, self.m, rows)]
+        self._next_block = 0
+
+        self._initial_basis(np.asarray(allocation, dtype=float))
+
+    # ---------- Árbol ----------
+
+    def _cell(self, u, v):
+        """Celda (i, j) de la arista entre dos nodos del árbol."""
+        return (u, v - self.m) if u < self.m else (v, u - self.m)
+
+    def _link(self, i, j, amount):
+        self.flow[(i, j)] = amount
+        self.adjacency[i].add(self.m + j)
+        self.adjacency[self.m + j].add(i)
+
+    def _unlink(self, i, j):
+        del self.flow[(i, j)]
+        self.adjacency[i].discard(self.m + j)
+        self.adjacency[self.m + j].discard(i)
+
+    def _hang(self, root, parent):
+        """
+        Recorre el subárbol de `root` (sin cruzar hacia `parent`) fijando parent, depth y
+        potenciales a partir de u_i + v_j = c_ij en cada celda básica.
+        """
+        m, costs, adjacency = self.m, self._cost_rows, self.adjacency
+        parents, depth, potential = self.parent, self.depth, self.potential
+
+        parents[root] = parent
+        if parent < 0:
+            depth[root] = 0
+            potential[root] = 0.0
+        else:
+            depth[root] = depth[parent] + 1
+            i, j = self._cell(root, parent)
+            potential[root] = costs[i][j] - potential[parent]
+
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            up = parents[node]
+            level = depth[node] + 1
+            if node < m:
+                row, base = costs[node], potential[node]
+                for child in adjacency[node]:
+                    if child != up:
+                        parents[child] = node
+                        depth[child] = level
+                        potential[child] = row[child - m] - base
+                        stack.append(child)
+            else:
+                col, base = node - m, potential[node]
+                for child in adjacency[node]:
+                    if child != up:
+                        parents[child] = node
+                        depth[child] = level
+                        potential[child] = costs[child][col] - base
+                        stack.append(child)
+
+    def _tree_path(self, a, b):
+        """
+        Celdas del camino del árbol entre los nodos a y b, en orden desde a.
+        Devuelve también cuántas de ellas están del lado de a (antes del ancestro común).
+        """
+        parent, depth, cell = self.parent, self.depth, self._cell
+        side_a, side_b = [], []
+        while depth[a] > depth[b]:
+            side_a.append(cell(a, parent[a]))
+            a = parent[a]
+        while depth[b] > depth[a]:
+            side_b.append(cell(b, parent[b]))
+            b = parent[b]
+        while a != b:
+            side_a.append(cell(a, parent[a]))
+            side_b.append(cell(b, parent[b]))
+            a, b = parent[a], parent[b]
+        side_b.reverse()
+        return side_a + side_b, len(side_a)
+
+    # ---------- Base inicial ----------
+
+    def _initial_basis(self, allocation):
+        m, n = self.m, self.n
+        group = list(range(self.num_nodes))
+
+        def find(x):
+            while group[x] != x:
+                group[x] = group[group[x]]
+                x = group[x]
+            return x
+
+        extra = []
+        for i, j in zip(*np.nonzero(allocation > TOL)):
+            i, j = int(i), int(j)
+            a, b = find(i), find(m + j)
+            if a == b:
+                extra.append((i, j))  # cerraría un ciclo: se elimina después
+            else:
+                group[a] = b
+                self._link(i, j, float(allocation[i, j]))
+
+        # Completar el bosque hasta un árbol con celdas degeneradas (cantidad 0)
+        for j in range(n):
+            if find(m + j) != find(0):
+                group[find(m + j)] = find(0)
+                self._link(0, j, 0.0)
+        for i in range(1, m):
+            if find(i) != find(m):
+                group[find(i)] = find(m)
+                self._link(i, 0, 0.0)
+
+        self._hang(0, -1)
+
+        # Una asignación inicial con ciclos no es básica: se empuja cada celda sobrante
+        # por su ciclo hasta que ella o una celda del árbol quede en cero
+        for i, j in extra:
+            path, split = self._tree_path(i, m + j)
+            amount = float(allocation[i, j])
+            theta, leaving = amount, None
+            for idx in range(1, len(path), 2):
+                if self.flow[path[idx]] < theta:
+                    theta, leaving = self.flow[path[idx]], idx
+            for idx, cell in enumerate(path):
+                self.flow[cell] += theta if idx % 2 == 0 else -theta
+            if leaving is not None:
+                self._replace(path, split, leaving, (i, j), amount - theta)
+
+    # ---------- Iteraciones ----------
+
+    def _entering_cell(self):
+        """Precio por bloques de filas: la celda más negativa del primer bloque que tenga alguna."""
+        potential = np.array(self.potential)
+        u = potential[:self.m]
+        v = potential[self.m:]
+        for k in range(len(self._blocks)):
+            block = (self._next_block + k) % len(self._blocks)
+            start, stop = self._blocks[block]
+            reduced = self.costs[start:stop] - u[start:stop, None] - v[None, :]
+            flat = int(np.argmin(reduced))
+            if reduced.flat[flat] < -TOL:
+                self._next_block = block
+                return start + flat // self.n, flat % self.n
+        return None
+
+    def _replace(self, path, split, leaving, entering, amount):
+        """Saca la celda path[leaving] de la base, mete `entering` y recuelga el subárbol separado."""
+        out_i, out_j = path[leaving]
+        self._unlink(out_i, out_j)
+        i, j = entering
+        self._link(i, j, amount)
+
+        # El subárbol que se separa es el del extremo más profundo de la celda saliente,
+        # y contiene al extremo de la celda entrante que está del mismo lado del ciclo
+        if leaving < split:
+            self._hang(i, self.m + j)
+        else:
+            self._hang(self.m + j, i)
+
+    def pivot(self, entering):
+        i, j = entering
+        path, split = self._tree_path(i, self.m + j)
+
+        # Signos del ciclo: entrante +, luego alternan empezando por - en su misma fila
+        theta, leaving = np.inf, None
+        for idx in range(0, len(path), 2):
+            if self.flow[path[idx]] < theta:
+                theta, leaving = self.flow[path[idx]], idx
+        for idx, cell in enumerate(path):
+            self.flow[cell] += -theta if idx % 2 == 0 else theta
+
+        self._replace(path, split, leaving, entering, theta)
+        self.iterations += 1
+        return path[leaving], theta
+
+    def solve(self, max_iter=None):
+        if max_iter is None:
+            max_iter = 50 * self.num_nodes * max(1, int(np.log2(self.num_nodes)))
+        trace = current_trace()
+        while self.iterations < max_iter:
+            entering = self._entering_cell()
+            if entering is None:
+                return "Optimal"
+            leaving, theta = self.pivot(entering)
+            if trace:
+                trace.add("modi.pivot", iteration=self.iterations, entering=[int(v) for v in entering],
+                          leaving=[int(v) for v in leaving], theta=float(theta))
+        return "Iteration limit"
+
+    def allocation(self):
+        result = np.zeros((self.m, self.n))
+        for (i, j), amount in self.flow.items():
+            if amount > 1e-7:
+                result[i, j] = amount
+        return result
+
+    def total_cost(self):
+        return float(np.sum(self.allocation() * self.costs))
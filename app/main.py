@@ -1,5 +1,4 @@
-print(">>> CARGANDO app/main.py")
-
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
@@ -7,9 +6,31 @@ from app.routes import optimization_routes
 from app.routes.optimization_routes_network import router as network_router  # ✅ Importa la ruta de redes
 from fastapi.staticfiles import StaticFiles
 from app.routes.linear_solver import router as linear_solver_router
+from app.routes.images import router as images_router
+from app.routes.analysis import router as analysis_router
+from app.routes.metrics import router as metrics_router
+from app.routes.profiles import router as profiles_router
+from app.services.execution import shutdown_solver_pools
+from app.services.image_store import start_image_cleanup, stop_image_cleanup
+from app.services.narration import shutdown_narration
+from app.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+@asynccontextmanager
+async def lifespan(app):
+    # Limpieza periódica de las imágenes vencidas (TTL)
+    await start_image_cleanup()
+    try:
+        yield
+    finally:
+        stop_image_cleanup()
+        # Cerrar los pools de procesos de los solvers y los hilos de la narración al apagar
+        shutdown_solver_pools()
+        shutdown_narration()
 
-print(">>> Creando instancia de FastAPI")
-app = FastAPI(title="Optimization API")
+logger.debug(">>> Creando instancia de FastAPI")
+app = FastAPI(title="Optimization API", lifespan=lifespan)
 
 # Habilitar CORS para permitir conexiones desde el frontend
 app.add_middleware(
@@ -18,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Permite todos los métodos (GET, POST, OPTIONS, etc.)
     allow_headers=["*"],  # Permite todos los headers
+    expose_headers=["Server-Timing"],  # Desglose de tiempos legible desde el frontend
 )
 
 # Configurar ruta absoluta para la carpeta static
@@ -26,12 +48,18 @@ if not os.path.exists(static_dir):
     os.makedirs(static_dir)
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
-print(">>> Incluyendo rutas de optimization_routes")
+logger.debug(">>> Incluyendo rutas de optimization_routes")
 app.include_router(optimization_routes.router, prefix="/api")
-print(">>> Incluyendo rutas de network_router")
+logger.debug(">>> Incluyendo rutas de network_router")
 app.include_router(network_router, prefix="/api")  # ✅ Añade la ruta para `/api/solve_network`
-print(">>> Incluyendo rutas de linear_solver_router")
+logger.debug(">>> Incluyendo rutas de linear_solver_router")
 app.include_router(linear_solver_router, prefix="/api")
+logger.debug(">>> Incluyendo rutas de images_router")
+app.include_router(images_router, prefix="/api")  # Imágenes generadas (/api/images/{id})
+logger.debug(">>> Incluyendo rutas de analysis_router")
+app.include_router(analysis_router, prefix="/api")  # Análisis con IA en segundo plano (/api/analysis/{id})
+app.include_router(profiles_router, prefix="/api")  # Perfiles de ?profile=true (/api/profiles/{id})
+app.include_router(metrics_router)  # Métricas por algoritmo para Prometheus (/metrics)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,19 +1,65 @@
 import numpy as np
-import matplotlib
-import os
+from scipy import sparse
 from fastapi.encoders import jsonable_encoder
 
-matplotlib.use('Agg')  # Backend no interactivo para servidores
-import matplotlib.pyplot as plt
+from app.services.rendering import PLOT_FIGSIZE, get_figure, figure_bytes
+from app.utils.metrics import timed
 from app.algorithms.linear_programming_v2 import SimplexSolverV2
+from app.algorithms.graphical_2d import solve_lp_2d
 
-def solve_linear_problem(data):
+def _build_sparse_constraints(constraints, num_vars):
     """
-    Resuelve problemas de PL usando la implementación robusta SimplexSolverV2.
+    Arma A_ub y A_eq en CSR sin pasar por matrices densas. Cada restricción puede venir
+    como "terms": [[índice, valor], ...] (índices desde 0) o como "coeffs" denso.
+    """
+    parts = {"ub": ([], [], [], []), "eq": ([], [], [], [])}  # filas, columnas, valores, rhs
+
+    for constraint in constraints:
+        if "terms" in constraint:
+            terms = constraint["terms"]
+            cols = [int(idx) for idx, _ in terms]
+            vals = [float(val) for _, val in terms]
+        else:
+            coeffs = list(constraint["coeffs"])[:num_vars]
+            cols = [j for j, val in enumerate(coeffs) if val != 0]
+            vals = [float(coeffs[j]) for j in cols]
+
+        sign = constraint.get("sign", "<=")
+        rhs = float(constraint.get("rhs", 0))
+        if sign == ">=":
+            # Convertir >= a <= multiplicando por -1
+            vals = [-v for v in vals]
+            rhs = -rhs
+
+        rows, col_idx, values, b = parts["eq" if sign == "=" else "ub"]
+        rows.extend([len(b)] * len(cols))
+        col_idx.extend(cols)
+        values.extend(vals)
+        b.append(rhs)
+
+    matrices = []
+    for rows, col_idx, values, b in parts.values():
+        if b:
+            A = sparse.csr_matrix((values, (rows, col_idx)), shape=(len(b), num_vars))
+            matrices.extend([A, np.array(b)])
+        else:
+            matrices.extend([None, None])
+    return matrices
+
+@timed("build.linear", size=lambda data: len(data["constraints"]) * len(data["objective_coeffs"]))
+def build_linear_solver(data):
+    """
+    Arma el SimplexSolverV2 a partir del payload de /solve_linear.
+    Si alguna restricción usa el formato disperso ("terms"), el modelo completo se arma
+    en CSR y el solver trabaja con el Simplex revisado sin construir matrices densas.
     """
-    method = data.get("method", "simplex")
     c = np.array(data["objective_coeffs"], dtype=float)
     num_vars = len(c)
+    maximization = data["objective"] == "max"
+
+    if any("terms" in constraint for constraint in data["constraints"]):
+        A_ub, b_ub, A_eq, b_eq = _build_sparse_constraints(data["constraints"], num_vars)
+        return SimplexSolverV2(c, A_ub, b_ub, A_eq, b_eq, maximization=maximization)
     
     A_ub, b_ub = [], []
     A_eq, b_eq = [], []
@@ -44,114 +90,133 @@ def solve_linear_problem(data):
     A_eq = np.array(A_eq) if A_eq else None
     b_eq = np.array(b_eq) if b_eq else None
     
-    maximization = data["objective"] == "max"
-    solver = SimplexSolverV2(c, A_ub, b_ub, A_eq, b_eq, maximization=maximization)
-    
-    # Mapeo de métodos internos
-    method_map = {
-        "simplex": "simplex",
-        "two_phase": "two_phase",
-        "m_big": "big_m"
-    }
-    
-    result = solver.solve(method_map.get(method, "simplex"))
-    return jsonable_encoder(result)
+    return SimplexSolverV2(c, A_ub, b_ub, A_eq, b_eq, maximization=maximization)
+
+# Mapeo de métodos internos
+METHOD_MAP = {
+    "simplex": "simplex",
+    "two_phase": "two_phase",
+    "m_big": "big_m",
+    "revised": "revised"
+}
+
+def _solve_with_solver(data):
+    """Arma el SimplexSolverV2 y lo resuelve una vez: devuelve (solver, resultado)."""
+    solver = build_linear_solver(data)
+    result = solver.solve(METHOD_MAP.get(data.get("method", "simplex"), "simplex"))
+    return solver, jsonable_encoder(result)
+
+def solve_linear_problem(data):
+    """
+    Resuelve problemas de PL usando la implementación robusta SimplexSolverV2.
+    """
+    return _solve_with_solver(data)[1]
+
+def solve_linear_by_method(data):
+    """
+    Selección de motor de cálculo según data["method"]: gráfico, dual o la familia
+    Simplex ('simplex', 'two_phase', 'm_big', 'revised') vía SimplexSolverV2.
+    """
+    method = data.get("method", "simplex")
+    if method == "graphical":
+        return solve_graphical(data)
+    elif method == "dual":
+        return solve_dual_linear_problem(data)
+    return solve_linear_problem(data)
+
+def solve_linear_with_solver(data):
+    """
+    Como solve_linear_by_method, pero devuelve también el SimplexSolverV2 ya resuelto para
+    sacar la sensibilidad de su base final sin volver a resolver: (solución, solver).
+    Con el método gráfico el solver es None. El método dual resuelve el modelo dual, así que
+    el solver devuelto es el del primal, resuelto con el Simplex revisado.
+    """
+    method = data.get("method", "simplex")
+    if method == "graphical":
+        return solve_graphical(data), None
+    if method == "dual":
+        solver = build_linear_solver(data)
+        solver.solve("revised")
+        return solve_dual_linear_problem(data), solver
+    solver, solution = _solve_with_solver(data)
+    return solution, solver
 
+@timed("graphical", size=lambda data: len(data.get("constraints", [])))
 def solve_graphical(data):
     """
-    Resuelve y grafica problemas de PL de 2 variables.
+    Resuelve problemas de PL de 2 variables con el polígono factible (intersección de
+    semiplanos, ver algorithms/graphical_2d.py). Solo calcula: devuelve en "plot" los
+    números necesarios para dibujar (ver draw_graphical_method), y la imagen se genera
+    aparte con un nombre propio del problema.
     """
     if len(data["variables"]) != 2:
         return {"status": "error", "message": "El método gráfico requiere exactamente 2 variables."}
     
     try:
-        coeffs = np.array(data["objective_coeffs"], dtype=float)
         constraints = data["constraints"]
-        is_max = data["objective"] == "max"
-        
-        # 1. Definir límites del gráfico dinámicamente
-        rhs_values = [c["rhs"] for c in constraints if c["rhs"] > 0]
-        limit = max(rhs_values) * 1.2 if rhs_values else 10
-        x_vals = np.linspace(0, limit, 400)
-        
-        plt.figure(figsize=(10, 8))
-        
-        # 2. Encontrar puntos de intersección (vértices candidatos)
-        # Empezamos con el origen y los cruces con los ejes
-        points = [np.array([0.0, 0.0])]
-        
-        for i, cons in enumerate(constraints):
-            a1, a2 = cons["coeffs"]
-            b = cons["rhs"]
-            
-            # Graficar líneas de restricción
-            if a2 != 0:
-                y_plot = (b - a1 * x_vals) / a2
-                plt.plot(x_vals, y_plot, label=f'R{i+1}')
-                points.append(np.array([0.0, b/a2])) # Cruce eje Y
-            else:
-                plt.axvline(x=b/a1, label=f'R{i+1}')
-            
-            if a1 != 0: points.append(np.array([b/a1, 0.0])) # Cruce eje X
-
-        # Intersecciones entre todas las restricciones
-        for i in range(len(constraints)):
-            for j in range(i + 1, len(constraints)):
-                A = np.array([constraints[i]["coeffs"], constraints[j]["coeffs"]])
-                B = np.array([constraints[i]["rhs"], constraints[j]["rhs"]])
-                if np.linalg.matrix_rank(A) == 2:
-                    points.append(np.linalg.solve(A, B))
-
-        # 3. Filtrar puntos factibles
-        feasible_points = []
-        for p in points:
-            if p[0] >= -1e-9 and p[1] >= -1e-9: # Primer cuadrante
-                is_feasible = True
-                for cons in constraints:
-                    val = cons["coeffs"][0] * p[0] + cons["coeffs"][1] * p[1]
-                    if cons["sign"] == "<=" and val > cons["rhs"] + 1e-7: is_feasible = False
-                    if cons["sign"] == ">=" and val < cons["rhs"] - 1e-7: is_feasible = False
-                if is_feasible: feasible_points.append(p)
-
-        if not feasible_points:
-            plt.close()
+        result = solve_lp_2d(data["objective_coeffs"], constraints, maximize=data["objective"] == "max")
+
+        if result["status"] == "Infeasible":
             return {"status": "Infeasible", "message": "No existe región factible."}
+        if result["status"] == "Unbounded":
+            return {"status": "Unbounded", "message": "Problema no acotado."}
 
-        # 4. Encontrar el punto óptimo
-        optimal_val = float('-inf') if is_max else float('inf')
-        optimal_p = feasible_points[0]
-        
-        for p in feasible_points:
-            z = coeffs[0] * p[0] + coeffs[1] * p[1]
-            if is_max:
-                if z > optimal_val: optimal_val, optimal_p = z, p
-            else:
-                if z < optimal_val: optimal_val, optimal_p = z, p
-
-        # 5. Estética del gráfico
-        plt.scatter(optimal_p[0], optimal_p[1], color='red', s=100, zorder=5, label='Óptimo')
-        plt.title(f'Método Gráfico ({data["objective"].upper()})')
-        plt.xlabel('x1'); plt.ylabel('x2')
-        plt.xlim(0, limit); plt.ylim(0, limit)
-        plt.grid(True, linestyle='--', alpha=0.7)
-        plt.legend()
-
-        # Crear carpeta estática si no existe
-        if not os.path.exists('static'): os.makedirs('static')
-        img_path = 'static/graph_with_table.png'
-        plt.savefig(img_path, bbox_inches='tight')
-        plt.close()
+        optimal_p = result["point"]
+        # Límites del gráfico: todas las restricciones y el óptimo a la vista
+        rhs_values = [c["rhs"] for c in constraints if c["rhs"] > 0]
+        limit = max(rhs_values) * 1.2 if rhs_values else 10
+        limit = max(limit, 1.2 * float(np.max(optimal_p)))
 
         return {
             "status": "Optimal",
-            "objective_value": float(optimal_val),
+            "objective_value": result["objective_value"],
             "variable_values": {"x1": round(float(optimal_p[0]), 4), "x2": round(float(optimal_p[1]), 4)},
-            "graph": "/static/graph_with_table.png"
+            "plot": {
+                "objective": data["objective"],
+                "limit": float(limit),
+                "constraints": [[float(c["coeffs"][0]), float(c["coeffs"][1]), float(c["rhs"])] for c in constraints],
+                "optimal": [float(optimal_p[0]), float(optimal_p[1])],
+                "polygon": np.round(result["polygon"], 9).tolist(),
+            }
         }
     except Exception as e:
-        plt.close()
         return {"status": "error", "message": str(e)}
 
+@timed("render.graphical")
+def draw_graphical_method(plot, fmt="png", thumbnail=False):
+    """Dibuja el método gráfico a partir del "plot" de solve_graphical. Devuelve los bytes de la imagen."""
+    limit = plot["limit"]
+    x_vals = np.linspace(0, limit, 400)
+
+    # Figura reutilizable (API orientada a objetos, sin estado global de pyplot)
+    fig = get_figure(PLOT_FIGSIZE)
+    ax = fig.add_subplot()
+
+    # Región factible sombreada (segmento o punto si hay igualdades)
+    polygon = np.array(plot.get("polygon", []), dtype=float).reshape(-1, 2)
+    if len(polygon) > 2:
+        ax.fill(polygon[:, 0], polygon[:, 1], color='tab:blue', alpha=0.15, label='Región factible')
+    elif len(polygon) == 2:
+        ax.plot(polygon[:, 0], polygon[:, 1], color='tab:blue', linewidth=4, alpha=0.4, label='Región factible')
+
+    # Graficar líneas de restricción
+    for i, (a1, a2, b) in enumerate(plot["constraints"]):
+        if a2 != 0:
+            ax.plot(x_vals, (b - a1 * x_vals) / a2, label=f'R{i+1}')
+        elif a1 != 0:
+            ax.axvline(x=b/a1, label=f'R{i+1}')
+
+    # Estética del gráfico
+    ax.scatter(plot["optimal"][0], plot["optimal"][1], color='red', s=100, zorder=5, label='Óptimo')
+    ax.set_title(f'Método Gráfico ({plot["objective"].upper()})')
+    ax.set_xlabel('x1'); ax.set_ylabel('x2')
+    ax.set_xlim(0, limit); ax.set_ylim(0, limit)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.legend()
+    return figure_bytes(fig, fmt, thumbnail)
+
+@timed("dual", size=lambda data: len(data.get("constraints", [])) * len(data.get("variables", [])),
+       iterations=lambda result: result.get("iterations"))
 def solve_dual_linear_problem(data):
     """
     Construye y resuelve el problema Dual.
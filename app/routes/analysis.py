@@ -0,0 +1,55 @@
+import asyncio
+import json
+import re
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.services.narration import get_job
+
+router = APIRouter()
+
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _job_or_404(job_id):
+    if not re.fullmatch(r"[0-9a-f]{64}", job_id):
+        raise HTTPException(status_code=400, detail="Identificador de análisis inválido")
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Análisis no encontrado; vuelva a resolver el problema")
+    return job
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def _stream_job(job):
+    """
+    Server-Sent Events: un evento "chunk" por cada parte nueva del texto y un "done" final
+    con el estado completo. Si el análisis ya terminó, se envía de una vez.
+    """
+    sent = 0
+    while True:
+        changed = job.changed  # se toma antes de leer el estado para no perder un aviso
+        if len(job.text) > sent and job.status != "error":
+            yield _event("chunk", job.text[sent:])
+            sent = len(job.text)
+        if job.status != "pending":
+            yield _event("done", job.to_dict())
+            return
+        try:
+            await asyncio.wait_for(changed.wait(), SSE_KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"  # comentario SSE para que los proxies no corten la conexión
+
+@router.get("/analysis/{job_id}")
+async def get_analysis(job_id: str):
+    """Estado del análisis en lenguaje natural: pending (con el texto parcial), done o error."""
+    return _job_or_404(job_id).to_dict()
+
+@router.get("/analysis/{job_id}/stream")
+async def stream_analysis(job_id: str):
+    """El mismo análisis por Server-Sent Events, a medida que el proveedor lo genera."""
+    job = _job_or_404(job_id)
+    return StreamingResponse(
+        _stream_job(job), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
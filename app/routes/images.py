@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from app.services.image_store import IMAGES
+
+router = APIRouter()
+
+@router.get("/images/{image_id}")
+async def get_image(image_id: str, request: Request):
+    """
+    Imagen generada por un solve (por ahora, el método gráfico). El id es el hash de lo
+    dibujado, así que el contenido nunca cambia: ETag = id y el navegador puede cachearla.
+    """
+    entry = IMAGES.get(image_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Imagen no encontrada o vencida; vuelva a resolver el problema")
+    content, media_type = entry
+
+    etag = f'"{image_id}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={int(IMAGES.ttl)}, immutable"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
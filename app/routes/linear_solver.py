@@ -1,74 +1,196 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 # Eliminamos las funciones que ya no existen en models.linear_program
-from app.models.linear_program import solve_linear_problem, solve_graphical, solve_dual_linear_problem
+from app.models.linear_program import solve_linear_by_method, solve_linear_with_solver, draw_graphical_method
+from app.services.execution import POOLS, run_solver, run_solver_traced, run_solver_profiled
+from app.services.image_store import IMAGES
+from app.services.narration import start_narration, analysis_fields
+from app.services.profiles import check_profile_access, store_profile
+from app.services.timings import RequestTimings
+from app.services.result_cache import linear_problem_key, image_key
 from app.utils.validations import validate_linear_problem
-from app.utils.sensitivity_analysis import analyze_sensitivity, generate_intelligent_sensitivity_analysis
+from app.utils.sensitivity_analysis import analyze_sensitivity, linear_narration_prompt
+from app.utils.logs import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
+def _solve_with_sensitivity(data):
+    """
+    Parte de cálculo de /solve_linear (motor + sensibilidad numérica). Se ejecuta en un
+    proceso worker. La sensibilidad sale de la base final del mismo solver que dio la
+    solución (un solo solve); si falla devuelve None en su lugar.
+    """
+    solution, solver = solve_linear_with_solver(data)
+
+    # Validar que la solución no sea None
+    if solution is None:
+        raise ValueError("El motor de cálculo no devolvió una respuesta válida.")
+
+    sensitivity = None
+    if solver is not None:
+        try:
+            # Calcular valores numéricos de sensibilidad
+            sensitivity = analyze_sensitivity(data, solver, solution)
+        except Exception as e:
+            logger.error("❌ Error en análisis de sensibilidad: %s", e)
+    return solution, sensitivity
+
+async def _graphical_image_url(plot):
+    """
+    URL de la imagen del método gráfico. El id es el hash del dibujo: si ya está en la caché
+    de imágenes se reutiliza; si no, se dibuja en el pool "render".
+    """
+    image_id = image_key("graphical", plot)
+    if IMAGES.get(image_id) is None:
+        IMAGES.put(image_id, await run_solver("render", draw_graphical_method, plot))
+    return f"/api/images/{image_id}"
+
 @router.post("/solve_linear")
-def solve_linear(data: dict):
-    print("Datos recibidos:", data)
+async def solve_linear(data: dict, trace: bool = False, timings: bool = False, profile: bool = False,
+                       x_profile_token: str = Header(None)):
+    """
+    Resuelve el modelo con el método pedido. Con `?trace=true` la respuesta incluye
+    `trace`: los pivotes de cada iteración (acotado a TRACE_MAX_EVENTS), sin usar la caché.
+    Con `?timings=true` incluye `timings` (ms por fase, también en el encabezado Server-Timing).
+    Con `?profile=true` (y X-Profile-Token) incluye `profile`: funciones calientes y la URL
+    de las pilas colapsadas del cálculo, también sin usar la caché.
+    """
+    request_timings = RequestTimings()
+    logger.debug("Datos recibidos: %s", data)
+    if profile:
+        check_profile_access(x_profile_token)
     
     # 1. Validaciones previas
-    errors = validate_linear_problem(data)
+    with request_timings.phase("validation"):
+        errors = validate_linear_problem(data)
     if errors:
         raise HTTPException(status_code=400, detail=errors)
     
     method = data.get("method", "simplex")
     
     try:
-        # 2. Selección de motor de cálculo
-        if method == "graphical":
-            solution = solve_graphical(data)
-        elif method == "dual":
-            solution = solve_dual_linear_problem(data)
-        else:
-            # Esta función unificada ahora resuelve 'simplex', 'two_phase' y 'm_big'
-            # pasando el método interno a SimplexSolverV2
-            solution = solve_linear_problem(data)
-
-        # Validar que la solución no sea None
-        if solution is None:
-            raise ValueError("El motor de cálculo no devolvió una respuesta válida.")
+        # 2. Selección de motor de cálculo (en el pool de procesos, fuera del event loop).
+        # "dispatch" es lo que no es cálculo: hash, caché, cola y envío al worker
+        with request_timings.phase("dispatch"):
+            problem_key = linear_problem_key(data, with_sensitivity=True)
+            trace_data = profile_data = None
+            if profile:
+                (solution, sensitivity), trace_data, profile_data = await run_solver_profiled(
+                    "linear", _solve_with_sensitivity, data, trace=trace
+                )
+            elif trace:
+                (solution, sensitivity), trace_data = await run_solver_traced("linear", _solve_with_sensitivity, data)
+            else:
+                solution, sensitivity = await run_solver(
+                    "linear", _solve_with_sensitivity, data,
+                    cache_key=problem_key,
+                )
 
         # 3. Análisis de sensibilidad (No aplica a Gráfico)
-        sensitivity = None
-        intelligent_analysis = None
-        
+        analysis = {"intelligent_analysis": None}
+
         if method != "graphical":
-            try:
-                # Calcular valores numéricos de sensibilidad
-                sensitivity = analyze_sensitivity(data, solution)
-                
-                # Generar interpretación con IA (Groq/Gemini)
-                intelligent_analysis = generate_intelligent_sensitivity_analysis(
-                    data, solution, sensitivity, method
-                )
-            except Exception as e:
-                print(f"❌ Error en análisis de sensibilidad: {str(e)}")
+            if sensitivity is None:
+                logger.warning("❌ Error en análisis de sensibilidad: no se pudo calcular la sensibilidad numérica.")
                 sensitivity = {}
-                intelligent_analysis = "Error al generar análisis de sensibilidad."
+                analysis["intelligent_analysis"] = "Error al generar análisis de sensibilidad."
+            else:
+                # La interpretación del modelo de lenguaje se genera en segundo plano:
+                # el cliente la obtiene en /api/analysis/{analysis_job}
+                with request_timings.phase("narration"):
+                    job_id = start_narration(
+                        "linear", problem_key, linear_narration_prompt, data, solution, sensitivity, method
+                    )
+                    analysis = analysis_fields(job_id)
 
         # 4. Construcción de la respuesta final
         response = {
             "solution": solution, 
             "sensitivity": sensitivity, 
-            "intelligent_analysis": intelligent_analysis
+            **analysis
         }
+        if trace_data is not None:
+            response["trace"] = trace_data
+        if profile_data is not None:
+            response["profile"] = store_profile("linear", profile_data)
 
-        # Manejo de la ruta de la imagen para el gráfico
-        if method == "graphical" and "graph" in solution:
-            # Mantenemos la ruta que viene del modelo o la forzamos a la estática
-            response["solution"]["graph"] = solution.get("graph", "/static/graph_with_table.png")
+        # Manejo de la ruta de la imagen para el gráfico (una por problema, ver /api/images)
+        if method == "graphical" and isinstance(solution, dict) and "plot" in solution:
+            plot = solution.pop("plot")
+            try:
+                with request_timings.phase("render"):
+                    response["solution"]["graph"] = await _graphical_image_url(plot)
+            except Exception as e:
+                logger.error("❌ Error al dibujar el método gráfico: %s", e)
+                response["solution"]["graph"] = None
         else:
             # Aseguramos que la llave exista como None para evitar errores en el frontend
             if "solution" in response and isinstance(response["solution"], dict):
                 response["solution"]["graph"] = None
 
-        print("✅ Respuesta exitosa generada")
-        return response
+        logger.debug("✅ Respuesta exitosa generada")
+        return request_timings.response(response, include=timings)
 
+    except HTTPException:
+        # 503 (cola llena) y 504 (timeout) de la capa de ejecución se devuelven tal cual
+        raise
     except Exception as e:
-        print(f"🔥 Error crítico en solve_linear: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
\ No newline at end of file
+        logger.exception("🔥 Error crítico en solve_linear: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+
+async def _stream_batch(problems):
+    """
+    Resuelve cada problema válido en el pool "linear" (con su caché, cola, timeout y 503/504)
+    y emite una línea NDJSON por resultado en el orden en que terminan. Cada línea lleva el
+    índice del problema en la solicitud. Un lote ocupa a lo sumo tantos lugares del pool
+    como workers tiene: no llena la cola de las demás solicitudes.
+    """
+    in_flight = asyncio.Semaphore(POOLS["linear"].workers)
+
+    async def run(index, problem):
+        try:
+            async with in_flight:
+                solution = await run_solver(
+                    "linear", solve_linear_by_method, problem, cache_key=linear_problem_key(problem)
+                )
+            return {"index": index, "solution": solution}
+        except HTTPException as e:
+            # 503 (cola llena) o 504 (timeout, el worker se reemplaza): solo falla este problema
+            return {"index": index, "error": e.detail, "status_code": e.status_code}
+        except Exception as e:
+            return {"index": index, "error": f"Error interno: {str(e)}"}
+
+    tasks = []
+    for index, problem in enumerate(problems):
+        errors = validate_linear_problem(problem) if isinstance(problem, dict) else ["El problema debe ser un objeto JSON."]
+        if errors:
+            yield json.dumps({"index": index, "error": errors}) + "\n"
+            continue
+        tasks.append(asyncio.ensure_future(run(index, problem)))
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield json.dumps(jsonable_encoder(await next_done)) + "\n"
+    finally:
+        # Si el cliente corta la conexión, no seguir esperando los pendientes
+        for task in tasks:
+            task.cancel()
+
+@router.post("/solve_linear/batch")
+async def solve_linear_batch(data: dict):
+    """
+    Resuelve muchos modelos de PL en una sola solicitud: {"problems": [problema, ...]}.
+    Los modelos se reparten en el pool "linear" y la respuesta es un stream NDJSON
+    (una línea por problema, en orden de finalización). No incluye análisis de sensibilidad.
+    """
+    problems = data.get("problems")
+    if not isinstance(problems, list):
+        raise HTTPException(status_code=400, detail=["Debe enviar 'problems' como una lista de problemas."])
+    return StreamingResponse(_stream_batch(problems), media_type="application/x-ndjson")
+
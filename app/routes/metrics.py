@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import exposition
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Histogramas de tiempo, iteraciones y tamaño por algoritmo, en formato de texto de Prometheus."""
+    return PlainTextResponse(exposition(), media_type="text/plain; version=0.0.4; charset=utf-8")
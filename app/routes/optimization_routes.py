@@ -1,11 +1,65 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, HTTPException
 from app.schemas.optimization_schemas import LinearProgrammingRequest, OptimizationResponse
-from app.services.optimization_service import solve_optimization
+from app.services.execution import run_solver, run_solver_traced, run_solver_profiled
+from app.services.image_store import IMAGES
+from app.services.result_cache import cache_stats, transport_problem_key
+from app.services.narration import start_narration, analysis_fields
+from app.services.profiles import check_profile_access, store_profile
+from app.services.timings import RequestTimings
+from app.services.optimization_service import solve_transport_problem, transport_narration_prompt
+from app.utils.validations import validate_transport_problem
+from app.utils.logs import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 
 @router.post("/solve_transport")
-def solve_transportation(data: dict):
-    return solve_optimization("transport", data)
+async def solve_transportation(data: dict, trace: bool = False, timings: bool = False, profile: bool = False,
+                               x_profile_token: str = Header(None)):
+    """
+    Con `?trace=true` la respuesta incluye `trace` (balanceo, solución inicial y pivotes de MODI).
+    Con `?timings=true` incluye `timings` (ms por fase, también en el encabezado Server-Timing).
+    Con `?profile=true` (y X-Profile-Token) incluye `profile` (funciones calientes y pilas).
+    """
+    request_timings = RequestTimings()
+    logger.debug("🚀 Recibida solicitud para transport con datos: %s", data)
+    if profile:
+        check_profile_access(x_profile_token)
+
+    with request_timings.phase("validation"):
+        errors = validate_transport_problem(data)
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+    with request_timings.phase("dispatch"):
+        problem_key = transport_problem_key(data)
+        if profile:
+            response, trace_data, profile_data = await run_solver_profiled(
+                "transport", solve_transport_problem, data, trace=trace
+            )
+            if trace_data is not None:
+                response["trace"] = trace_data
+            response["profile"] = store_profile("transport", profile_data)
+        elif trace:
+            response, trace_data = await run_solver_traced("transport", solve_transport_problem, data)
+            response["trace"] = trace_data
+        else:
+            response = await run_solver(
+                "transport", solve_transport_problem, data, cache_key=problem_key
+            )
+    if response["status"] == "success":
+        # La IA no se espera aquí: se genera en segundo plano (/api/analysis/{analysis_job})
+        with request_timings.phase("narration"):
+            job_id = start_narration(
+                "transport", problem_key, transport_narration_prompt, response["optimal_solution"], response["total_cost"]
+            )
+            response.update(analysis_fields(job_id, "sensitivity_analysis"))
+    return request_timings.response(response, include=timings)
+
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Aciertos, fallos y ocupación de la caché de resultados por tipo de problema (y de imágenes)."""
+    return {**cache_stats(), "images": IMAGES.stats()}
@@ -1,17 +1,119 @@
-from fastapi import APIRouter
+import re
+from fastapi import APIRouter, Header, HTTPException, Response
 from pydantic import BaseModel
 from typing import List, Union  # ✅ Permite que los pesos sean int o float
-from app.services.optimization_service_network import solve_optimization_network
+from app.services.execution import run_solver, run_solver_traced, run_solver_profiled
+from app.services.result_cache import CACHES, network_problem_key
+from app.services.network_rendering import render_network_images, attach_images, encode_images
+from app.services.rendering import IMAGE_FORMATS
+from app.services.narration import start_narration, analysis_fields
+from app.services.profiles import check_profile_access, store_profile
+from app.services.timings import RequestTimings
+from app.services.optimization_service_network import solve_network_results, network_narration_prompt
+from app.utils.validations import validate_network_problem
+from app.utils.logs import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
 class NetworkProblemRequest(BaseModel):
     graph: List[List[Union[str, int, float]]]  # ✅ Ahora acepta nombres de nodos como str y pesos como int o float
+    algorithm: str = "dinic"  # Motor de flujo máximo: dinic, push_relabel o edmonds_karp
 
-@router.post("/solve_network")
-def solve_network_problem(request: NetworkProblemRequest):
-    print(">>> ENTRANDO AL ENDPOINT /api/solve_network")
-    print(f"Payload recibido: {request.graph}")
-    result = solve_optimization_network("all", {"graph": request.graph})
-    print(">>> Resultado de solve_optimization_network:", result)
+async def render_result(result_id, result, fmt="png", thumbnail=False):
+    """
+    Imágenes (bytes) de un resultado ya calculado. Se dibujan en el pool "render" y se
+    guardan en caché junto al resultado numérico, una entrada por formato y tamaño.
+    """
+    if fmt not in IMAGE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Formato de imagen no soportado: {fmt}")
+    cache = CACHES["network"]
+    key = f"{result_id}-images-{fmt}{'-thumb' if thumbnail else ''}"
+    images = cache.get(key)
+    if images is None:
+        images = await run_solver("render", render_network_images, result["graph"], result, fmt, thumbnail)
+        cache.put(key, images)
+    return images
+
+def _cached_result(result_id):
+    if not re.fullmatch(r"[0-9a-f]{64}", result_id):
+        raise HTTPException(status_code=400, detail="Identificador de resultado inválido")
+    result = CACHES["network"].get(result_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Resultado no encontrado (expiró de la caché); vuelva a resolver la red")
     return result
+
+@router.post("/solve_network")
+async def solve_network_problem(request: NetworkProblemRequest, render: bool = False, trace: bool = False,
+                                timings: bool = False, profile: bool = False, x_profile_token: str = Header(None)):
+    """
+    Resuelve la red y devuelve solo números más un `result_id`. Con `?render=true` se
+    agregan también las imágenes; si no, se pueden pedir luego en /api/render/{result_id}.
+    Con `?trace=true` se agrega `trace` (fases del flujo máximo, acotado a TRACE_MAX_EVENTS).
+    Con `?timings=true` se agrega `timings` (ms por fase, también en el encabezado Server-Timing).
+    Con `?profile=true` (y X-Profile-Token) se agrega `profile` (funciones calientes y pilas).
+    """
+    request_timings = RequestTimings()
+    logger.debug(">>> ENTRANDO AL ENDPOINT /api/solve_network")
+    if profile:
+        check_profile_access(x_profile_token)
+    logger.debug("Payload recibido: %s", request.graph)
+    # Pydantic ya validó la forma del cuerpo; aquí se revisan las aristas y el algoritmo
+    with request_timings.phase("validation"):
+        errors = validate_network_problem(request.graph, request.algorithm)
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+    with request_timings.phase("dispatch"):
+        result_id = network_problem_key(request.graph, request.algorithm)
+        data = {"graph": request.graph, "algorithm": request.algorithm}
+        trace_data = profile_data = None
+        if profile:
+            result, trace_data, profile_data = await run_solver_profiled(
+                "network", solve_network_results, data, trace=trace
+            )
+            CACHES["network"].put(result_id, result)  # /api/render/{result_id} lo necesita en caché
+        elif trace:
+            result, trace_data = await run_solver_traced("network", solve_network_results, data)
+            CACHES["network"].put(result_id, result)  # /api/render/{result_id} lo necesita en caché
+        else:
+            result = await run_solver("network", solve_network_results, data, cache_key=result_id)
+    result["result_id"] = result_id
+    if render and "error" not in result:
+        with request_timings.phase("render"):
+            attach_images(result, await render_result(result_id, result))
+    if "shortest_path" in result:
+        # Análisis de IA en segundo plano: se consulta en /api/analysis/{analysis_job}
+        with request_timings.phase("narration"):
+            job_id = start_narration("network", result_id, network_narration_prompt, request.graph, result["shortest_path"])
+            result.update(analysis_fields(job_id))
+    if trace_data is not None:
+        result["trace"] = trace_data
+    if profile_data is not None:
+        result["profile"] = store_profile("network", profile_data)
+    logger.debug(">>> Resultado de solve_optimization_network: %s", result)
+    return request_timings.response(result, include=timings)
+
+@router.get("/render/{result_id}")
+async def render_network_result(result_id: str, format: str = "png", thumbnail: bool = False):
+    """
+    Dibuja bajo demanda las imágenes de un resultado de /api/solve_network (base64 en JSON).
+    `format` puede ser png o svg; `thumbnail=true` las genera a baja resolución.
+    """
+    result = _cached_result(result_id)
+    images = encode_images(await render_result(result_id, result, format, thumbnail))
+    return {
+        "result_id": result_id,
+        "format": format,
+        "images": images,
+        "graph_image_base64": images.get("shortest_path"),
+    }
+
+@router.get("/render/{result_id}/{name}")
+async def render_network_image(result_id: str, name: str, format: str = "png", thumbnail: bool = False):
+    """Una sola imagen (shortest_path, mst o max_flow) como archivo, para usar directo en <img src>."""
+    result = _cached_result(result_id)
+    images = await render_result(result_id, result, format, thumbnail)
+    if name not in images:
+        raise HTTPException(status_code=404, detail=f"Imagen desconocida: {name}")
+    return Response(content=images[name], media_type=IMAGE_FORMATS[format])
@@ -0,0 +1,22 @@
+import re
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.services.profiles import check_profile_access, get_profile
+
+router = APIRouter()
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def download_profile(profile_id: str, x_profile_token: str = Header(None)):
+    """
+    Pilas colapsadas de un perfil (?profile=true). Se abren tal cual en speedscope
+    (https://www.speedscope.app) o con flamegraph.pl. Requiere X-Profile-Token.
+    """
+    check_profile_access(x_profile_token)
+    if not re.fullmatch(r"[0-9a-f]{32}", profile_id):
+        raise HTTPException(status_code=400, detail="Identificador de perfil inválido")
+    collapsed = get_profile(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return PlainTextResponse(
+        collapsed, headers={"Content-Disposition": f'attachment; filename="{profile_id}.collapsed"'}
+    )
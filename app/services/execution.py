@@ -0,0 +1,221 @@
+import asyncio
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from app.services.result_cache import CACHES
+from app.services.rendering import warm_up
+from app.utils.logs import get_logger, run_traced
+from app.utils.profiling import run_profiled
+from app.utils.metrics import buffer_samples, drain_samples, record_samples, collect_phases, add_phases
+
+logger = get_logger(__name__)
+
+# ==========================================
+# CAPA DE EJECUCIÓN DE SOLVERS
+# ==========================================
+# Cada tipo de problema tiene su propio grupo de procesos worker con:
+# - límite de concurrencia (cuántos solves corren a la vez),
+# - profundidad máxima de cola (si se supera, 503 con Retry-After),
+# - timeout por solicitud (si se vence, el proceso se mata y se reemplaza).
+# Así un MODI grande no bloquea el event loop ni las demás solicitudes.
+
+def _setting(problem_type, name, default):
+    return type(default)(os.getenv(f"{problem_type.upper()}_SOLVER_{name}", default))
+
+RETRY_AFTER_SECONDS = int(os.getenv("SOLVER_RETRY_AFTER", 5))
+
+
+class SolverError(RuntimeError):
+    """Excepción lanzada por la función del solver dentro del worker (el proceso sigue sano)."""
+
+
+def _worker_main(conn, initializer=None):
+    """
+    Bucle del proceso worker: recibe (función, args), ejecuta y devuelve el resultado junto
+    con las métricas y el tiempo por fase de la llamada (el proceso principal los suma).
+    """
+    buffer_samples()
+    if initializer is not None:
+        try:
+            initializer()
+        except Exception as e:
+            logger.error("❌ Error al inicializar el worker: %s", e)
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        with collect_phases() as phases:
+            try:
+                ok, payload = True, fn(*args)
+            except Exception as e:
+                ok, payload = False, f"{type(e).__name__}: {e}"
+        conn.send((ok, payload, drain_samples(), phases))
+
+
+class _Worker:
+    def __init__(self, initializer=None):
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, initializer), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def call(self, fn, args):
+        """Bloqueante: se ejecuta en un hilo para no frenar el event loop."""
+        self.conn.send((fn, args))
+        ok, payload, samples, phases = self.conn.recv()
+        record_samples(samples)
+        if not ok:
+            raise SolverError(payload)
+        return payload, phases
+
+    def kill(self):
+        self.process.kill()
+        self.conn.close()
+
+
+class SolverPool:
+    """
+    Pool acotado de procesos para un tipo de problema. `initializer` se ejecuta una vez
+    al arrancar cada worker (por ejemplo, para pre-calentar figuras de matplotlib).
+    """
+
+    def __init__(self, name, workers, max_queue, timeout, initializer=None):
+        self.name = name
+        self.initializer = initializer
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.running = 0
+        self._waiters = deque()
+        self._idle = []
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-solver")
+
+    async def _acquire(self):
+        if self.running < self.workers and not self._waiters:
+            self.running += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Servidor ocupado resolviendo problemas de tipo {self.name}. Intente más tarde.",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter  # _release nos cede su lugar directamente
+        except asyncio.CancelledError:
+            if waiter.done():
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    async def run(self, fn, *args):
+        """Ejecuta fn(*args) en un proceso worker respetando cola, concurrencia y timeout."""
+        await self._acquire()
+        worker = None
+        try:
+            worker = self._idle.pop() if self._idle else _Worker(self.initializer)
+            loop = asyncio.get_running_loop()
+            result, phases = await asyncio.wait_for(
+                loop.run_in_executor(self._threads, worker.call, fn, args), self.timeout
+            )
+            self._idle.append(worker)
+            add_phases(phases)  # desglose de tiempos de la solicitud (si lo pidió)
+            return result
+        except asyncio.TimeoutError:
+            worker.kill()
+            raise HTTPException(
+                status_code=504,
+                detail=f"El cálculo superó el tiempo máximo de {self.timeout:g} s y fue cancelado.",
+            )
+        except SolverError:
+            self._idle.append(worker)
+            raise
+        except BaseException:
+            # Error en el worker o solicitud cancelada: descartar el proceso para no dejar trabajo huérfano
+            if worker is not None:
+                worker.kill()
+            raise
+        finally:
+            self._release()
+
+    def shutdown(self):
+        for worker in self._idle:
+            worker.kill()
+        self._idle = []
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+
+POOLS = {
+    problem_type: SolverPool(
+        problem_type,
+        workers=_setting(problem_type, "WORKERS", 2),
+        max_queue=_setting(problem_type, "QUEUE", 16),
+        timeout=_setting(problem_type, "TIMEOUT", 30.0),
+    )
+    for problem_type in ("linear", "transport", "network")
+}
+
+# Dibujo de imágenes: procesos propios (figuras reutilizables, sin estado global de pyplot)
+# para que renderizar no ocupe los workers de los solvers. Se configura con RENDER_SOLVER_*.
+POOLS["render"] = SolverPool(
+    "render",
+    workers=_setting("render", "WORKERS", 2),
+    max_queue=_setting("render", "QUEUE", 32),
+    timeout=_setting("render", "TIMEOUT", 30.0),
+    initializer=warm_up,
+)
+
+async def run_solver(problem_type, fn, *args, cache_key=None):
+    """
+    Punto de entrada de las rutas: resuelve en el pool del tipo de problema indicado.
+    Con `cache_key` el resultado se busca primero en la caché por contenido y, si no está,
+    se guarda al terminar (si el solver lanza una excepción no se guarda nada).
+    """
+    cache = CACHES[problem_type] if cache_key else None
+    if cache is not None:
+        result = cache.get(cache_key)
+        if result is not None:
+            return result
+    result = await POOLS[problem_type].run(fn, *args)
+    if cache is not None:
+        cache.put(cache_key, result)
+    return result
+
+async def run_solver_traced(problem_type, fn, *args):
+    """
+    Como run_solver pero con la traza de iteraciones activa en el worker (?trace=true).
+    No usa la caché: un resultado cacheado no tiene iteraciones que mostrar.
+    Devuelve (resultado, {"events": [...], "dropped": n}).
+    """
+    return await POOLS[problem_type].run(run_traced, fn, *args)
+
+async def run_solver_profiled(problem_type, fn, *args, trace=False):
+    """
+    Como run_solver pero bajo los perfiladores de run_profiled en el worker (?profile=true).
+    Tampoco usa la caché: hay que medir el cálculo, no la lectura de la caché.
+    Devuelve (resultado, traza o None, perfil); con `trace` la traza también se activa.
+    """
+    if trace:
+        (result, trace_data), profile = await POOLS[problem_type].run(run_profiled, run_traced, fn, *args)
+        return result, trace_data, profile
+    result, profile = await POOLS[problem_type].run(run_profiled, fn, *args)
+    return result, None, profile
+
+def shutdown_solver_pools():
+    for pool in POOLS.values():
+        pool.shutdown()
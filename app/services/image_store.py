@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from app.services.rendering import IMAGE_FORMATS
+from app.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# ==========================================
+# ALMACÉN DE IMÁGENES GENERADAS
+# ==========================================
+# Cada imagen se guarda en memoria con un id derivado del hash de su contenido de entrada
+# (mismo problema -> mismo id), así un problema repetido reutiliza la imagen sin volver a
+# dibujarla y dos solicitudes distintas nunca se pisan. Acotado por bytes y con TTL:
+# las entradas se guardan en orden de creación, así que las vencidas siempre están al
+# principio y limpiarlas cuesta solo lo que se elimina.
+
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+IMAGE_CACHE_TTL = float(os.getenv("IMAGE_CACHE_TTL", 3600))
+IMAGE_CACHE_CLEANUP_SECONDS = float(os.getenv("IMAGE_CACHE_CLEANUP_SECONDS", 60))
+
+
+class ImageStore:
+    def __init__(self, max_bytes=IMAGE_CACHE_MAX_BYTES, ttl=IMAGE_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # id -> (bytes, media_type, vence_en)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _drop(self, image_id):
+        content, _, _ = self._entries.pop(image_id)
+        self._bytes -= len(content)
+
+    def _purge(self, now):
+        while self._entries:
+            image_id, (_, _, expires_at) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            self._drop(image_id)
+
+    def get(self, image_id):
+        """Devuelve (bytes, media_type) o None si no existe o ya venció."""
+        with self._lock:
+            entry = self._entries.get(image_id)
+            if entry is None:
+                return None
+            content, media_type, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._drop(image_id)
+                return None
+            return content, media_type
+
+    def put(self, image_id, content, fmt="png"):
+        if len(content) > self.max_bytes:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if image_id in self._entries:
+                self._drop(image_id)
+            self._entries[image_id] = (content, IMAGE_FORMATS[fmt], now + self.ttl)
+            self._bytes += len(content)
+            self._purge(now)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def purge_expired(self):
+        with self._lock:
+            before = len(self._entries)
+            self._purge(time.monotonic())
+            return before - len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+            }
+
+
+IMAGES = ImageStore()
+
+async def image_cleanup_loop():
+    """Tarea de fondo: elimina las imágenes vencidas aunque no lleguen nuevas solicitudes."""
+    while True:
+        await asyncio.sleep(IMAGE_CACHE_CLEANUP_SECONDS)
+        removed = IMAGES.purge_expired()
+        if removed:
+            logger.info("🧹 %s imágenes vencidas eliminadas de la caché", removed)
+
+_cleanup_task = None
+
+async def start_image_cleanup():
+    global _cleanup_task
+    if _cleanup_task is None:
+        _cleanup_task = asyncio.create_task(image_cleanup_loop())
+
+def stop_image_cleanup():
+    global _cleanup_task
+    if _cleanup_task is not None:
+        _cleanup_task.cancel()
+        _cleanup_task = None
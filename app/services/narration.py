@@ -0,0 +1,259 @@
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from app.services.result_cache import CACHES, _hash
+from app.utils.logs import get_logger
+from app.utils.metrics import measure, detach_phases
+
+logger = get_logger(__name__)
+
+# Cargar .env desde la carpeta app
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
+
+# ==========================================
+# NARRACIÓN DEL ANÁLISIS DE SENSIBILIDAD (EN SEGUNDO PLANO)
+# ==========================================
+# El texto del modelo de lenguaje ya no se espera dentro de la solicitud de resolución:
+# la ruta devuelve los números de inmediato junto con un id de trabajo, y el texto se
+# genera en segundo plano. El cliente lo consulta en /api/analysis/{id} o lo recibe por
+# partes en /api/analysis/{id}/stream (Server-Sent Events).
+# - El id es el hash del problema: el mismo problema reutiliza el mismo trabajo y, una vez
+#   terminado, su texto queda en la caché "narration" (y en disco si SOLVER_CACHE_DIR).
+# - El proveedor es intercambiable (NARRATION_PROVIDER=groq|stub o set_provider()): "stub"
+#   responde localmente sin red, para pruebas y desarrollo.
+
+NARRATION_MODEL = os.getenv("NARRATION_MODEL", "llama-3.1-8b-instant")
+NARRATION_WORKERS = int(os.getenv("NARRATION_WORKERS", 4))
+NARRATION_MAX_JOBS = int(os.getenv("NARRATION_MAX_JOBS", 1000))
+NARRATION_STUB_DELAY = float(os.getenv("NARRATION_STUB_DELAY", 0))
+
+NOT_CONFIGURED = "Error: API de Groq no configurada. Verifica tu GROQ_API_KEY en .env"
+
+
+class NarrationProvider(ABC):
+    """
+    Interfaz de un proveedor: complete(prompt) -> texto; stream(prompt) -> partes del texto.
+    `complete` es abstracto: un proveedor incompleto falla al instanciarse, no en el trabajo.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def complete(self, prompt):
+        """Texto completo del análisis para `prompt`."""
+
+    def stream(self, prompt):
+        # Por defecto el texto llega en una sola parte
+        yield self.complete(prompt)
+
+
+class GroqProvider(NarrationProvider):
+    name = "groq"
+
+    def __init__(self, api_key, model=NARRATION_MODEL):
+        from groq import Groq
+        self.client = Groq(api_key=api_key)
+        self.model = model
+
+    def complete(self, prompt):
+        message = self.client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=self.model
+        )
+        return message.choices[0].message.content
+
+    def stream(self, prompt):
+        chunks = self.client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=self.model,
+            stream=True
+        )
+        for chunk in chunks:
+            piece = chunk.choices[0].delta.content
+            if piece:
+                yield piece
+
+
+class StubProvider(NarrationProvider):
+    """Proveedor local y determinista (sin red): resume el encabezado del prompt."""
+
+    name = "stub"
+
+    def __init__(self, delay=NARRATION_STUB_DELAY):
+        self.delay = delay  # pausa entre partes, para simular un modelo lento
+
+    def complete(self, prompt):
+        return "".join(self.stream(prompt))
+
+    def stream(self, prompt):
+        header = prompt.strip().splitlines()[0] if prompt.strip() else ""
+        text = (
+            f"[CRÍTICO] Análisis generado localmente (proveedor de prueba).\n"
+            f"{header}\n"
+            f"[RECOMENDACIÓN] Configura NARRATION_PROVIDER=groq para obtener el análisis del modelo."
+        )
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            if self.delay:
+                time.sleep(self.delay)
+            yield word if i == len(words) - 1 else word + " "
+
+
+def _default_provider():
+    name = os.getenv("NARRATION_PROVIDER", "groq").lower()
+    if name == "stub":
+        return StubProvider()
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        logger.warning("⚠️ Advertencia: GROQ_API_KEY no está configurada en .env")
+        return None
+    return GroqProvider(api_key)
+
+_provider = _default_provider()
+
+def get_provider():
+    return _provider
+
+def set_provider(provider):
+    """Reemplaza el proveedor (por ejemplo StubProvider() en pruebas). None lo desactiva."""
+    global _provider
+    _provider = provider
+
+
+# ------------------------------------------
+# Trabajos en segundo plano
+# ------------------------------------------
+
+class NarrationJob:
+    """Estado de una narración: pending -> done | error. Vive en el event loop."""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = "pending"
+        self.text = ""
+        self.error = None
+        self.changed = asyncio.Event()
+        self.task = None
+
+    def _notify(self):
+        # Despierta a quien espera el evento actual y deja uno nuevo para el siguiente cambio
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def append(self, piece):
+        self.text += piece
+        self._notify()
+
+    def finish(self, text):
+        self.text = text
+        self.status = "done"
+        self._notify()
+
+    def fail(self, message):
+        self.error = message
+        self.status = "error"
+        self._notify()
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "analysis": self.text if self.status == "done" else None,
+            "partial": self.text if self.status == "pending" else None,
+            "error": self.error,
+        }
+
+
+_jobs = OrderedDict()  # id -> NarrationJob (solo se accede desde el event loop)
+_executor = ThreadPoolExecutor(max_workers=NARRATION_WORKERS, thread_name_prefix="narration")
+
+def narration_key(kind, problem_key):
+    """Id del trabajo: tipo de análisis + hash del problema (mismo problema -> mismo texto)."""
+    return _hash({"narration": kind, "problem": problem_key})
+
+def _remember(job):
+    _jobs[job.id] = job
+    # Se olvidan primero los trabajos terminados más antiguos (su texto sigue en la caché)
+    while len(_jobs) > NARRATION_MAX_JOBS:
+        oldest = next((key for key, old in _jobs.items() if old.status != "pending"), None)
+        if oldest is None:
+            break
+        del _jobs[oldest]
+
+def cached_narration(job_id):
+    return CACHES["narration"].get(job_id)
+
+def get_job(job_id):
+    """Trabajo en curso o terminado; si ya se olvidó pero su texto está en caché, se reconstruye."""
+    job = _jobs.get(job_id)
+    if job is None:
+        text = cached_narration(job_id)
+        if text is None:
+            return None
+        job = NarrationJob(job_id)
+        job.finish(text)
+        _remember(job)
+    return job
+
+def start_narration(kind, problem_key, prompt_fn, *args):
+    """
+    Lanza la narración en segundo plano (si no existe ya) y devuelve su id sin esperar.
+    `prompt_fn(*args)` arma el prompt; debe ser barato, el modelo se llama en otro hilo.
+    """
+    job_id = narration_key(kind, problem_key)
+    job = get_job(job_id)
+    if job is not None and job.status != "error":
+        return job_id  # en curso o ya narrado (los errores se reintentan)
+
+    job = NarrationJob(job_id)
+    _remember(job)
+    job.task = asyncio.get_running_loop().create_task(_run_job(job, prompt_fn, args))
+    return job_id
+
+def analysis_fields(job_id, field="intelligent_analysis"):
+    """
+    Campos que agregan las rutas de resolución: id y URL del trabajo, y en `field` el texto
+    si ya estaba narrado (problema repetido); si no, None hasta que el cliente lo consulte.
+    """
+    job = _jobs.get(job_id)
+    return {
+        "analysis_job": job_id,
+        "analysis_url": f"/api/analysis/{job_id}",
+        field: job.text if job is not None and job.status == "done" else None,
+    }
+
+async def _run_job(job, prompt_fn, args):
+    detach_phases()  # termina después de responder: no se suma a los tiempos de la solicitud
+    provider = get_provider()
+    if provider is None:
+        job.fail(NOT_CONFIGURED)
+        return
+
+    loop = asyncio.get_running_loop()
+
+    def consume(prompt):
+        # Corre en el pool de narración; cada parte se entrega al event loop
+        for piece in provider.stream(prompt):
+            loop.call_soon_threadsafe(job.append, piece)
+
+    try:
+        prompt = prompt_fn(*args)
+        with measure(f"llm.{provider.name}", size=len(prompt)):
+            await loop.run_in_executor(_executor, consume, prompt)
+    except Exception as e:
+        logger.error("❌ Error generando narración (%s): %s", provider.name, e)
+        job.fail(f"Error al generar análisis: {str(e)}")
+        return
+
+    # Las partes encoladas con call_soon_threadsafe ya se aplicaron antes de este punto
+    CACHES["narration"].put(job.id, job.text)
+    job.finish(job.text)
+    logger.info("📝 Narración %s lista (%s, %s caracteres)", job.id[:12], provider.name, len(job.text))
+
+def shutdown_narration():
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,143 @@
+import os
+import base64
+import threading
+from collections import OrderedDict
+import networkx as nx
+from app.services.rendering import GRAPH_FIGSIZE, get_figure, figure_bytes
+from app.services.result_cache import graph_layout_key
+from app.utils.logs import get_logger
+from app.utils.metrics import timed
+
+logger = get_logger(__name__)
+
+# ==========================================
+# RENDERIZADO DE GRAFOS (SOLO BAJO DEMANDA)
+# ==========================================
+# Los algoritmos de red devuelven solo números. Las imágenes se generan aquí, a partir
+# del resultado ya calculado, únicamente cuando se piden (render=true o /api/render/{id}).
+# La posición de los nodos se calcula una vez por grafo y la reutilizan las tres imágenes
+# (ruta más corta, MST y flujo máximo), así los nodos no "saltan" de un dibujo a otro.
+# Las imágenes se devuelven como bytes (PNG o SVG) y se dibujan en el pool "render".
+
+LAYOUT_CACHE_SIZE = int(os.getenv("GRAPH_LAYOUT_CACHE_SIZE", 256))
+
+_layouts = OrderedDict()  # hash del grafo -> {nodo: (x, y)}
+_layouts_lock = threading.Lock()
+
+
+def graph_layout(graph):
+    """Posiciones de los nodos (spring layout con semilla fija), cacheadas por hash del grafo."""
+    key = graph_layout_key(graph)
+    with _layouts_lock:
+        pos = _layouts.get(key)
+        if pos is not None:
+            _layouts.move_to_end(key)
+            return pos
+
+    G = nx.DiGraph()
+    for edge in graph:
+        G.add_edge(edge[0], edge[1], weight=edge[2] if len(edge) > 2 else 0)
+    pos = nx.spring_layout(G, seed=42)
+
+    with _layouts_lock:
+        _layouts[key] = pos
+        while len(_layouts) > LAYOUT_CACHE_SIZE:
+            _layouts.popitem(last=False)
+    return pos
+
+def generate_graph_image(graph_data, paths=None, title="Grafo", edge_labels=None, edge_color='gray', highlight_color='red',
+                         pos=None, fmt="png", thumbnail=False):
+    """
+    Usa NetworkX solo para posicionar nodos y dibujar.
+    La lógica de qué nodos y qué pesos mostrar viene del cálculo manual.
+    `pos` permite reutilizar una posición ya calculada para el grafo completo.
+    Devuelve los bytes de la imagen (b"" si el dibujo falla).
+    """
+    try:
+        fig = get_figure(GRAPH_FIGSIZE)
+        ax = fig.add_axes((0, 0, 1, 1))
+        G = nx.DiGraph()
+
+        for edge in graph_data:
+            u, v = edge[0], edge[1]
+            w = edge[2] if len(edge) > 2 else 0
+            G.add_edge(u, v, weight=w)
+
+        # Posicionamiento consistente de los nodos
+        if pos is None:
+            pos = nx.spring_layout(G, seed=42)
+
+        if edge_labels is None:
+            edge_labels = {(u, v): f"{d['weight']}" for u, v, d in G.edges(data=True)}
+
+        # Dibujar base del grafo
+        nx.draw(G, pos, ax=ax, with_labels=True, node_color='lightblue',
+                edge_color=edge_color, node_size=2000, font_size=10,
+                arrowsize=20, width=1.5)
+
+        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=9, ax=ax)
+
+        # Resaltar camino (para Dijkstra o flujo)
+        if paths and len(paths) > 1:
+            edges_path = [(paths[i], paths[i + 1]) for i in range(len(paths) - 1)]
+            nx.draw_networkx_edges(G, pos, edgelist=edges_path, edge_color=highlight_color, width=3, ax=ax)
+
+        ax.set_title(title, fontweight='bold')
+        ax.axis('off')
+        return figure_bytes(fig, fmt, thumbnail)
+    except Exception as e:
+        logger.error("Error en renderizado: %s", e)
+        return b""
+
+def flow_labels(flows):
+    """Etiquetas "Enviado / Capacidad" por arista (las aristas duplicadas se suman)."""
+    sent, total_caps = {}, {}
+    for item in flows:
+        edge = (item["from"], item["to"])
+        sent[edge] = sent.get(edge, 0) + item["flow"]
+        total_caps[edge] = total_caps.get(edge, 0) + item["capacity"]
+    return {edge: f"{int(sent[edge])} / {int(total_caps[edge])}" for edge in sent}
+
+@timed("render.network", size=lambda graph, *_, **__: len(graph))
+def render_network_images(graph, result, fmt="png", thumbnail=False):
+    """
+    Dibuja las imágenes de un resultado de solve_all_problems ya calculado.
+    Devuelve {"shortest_path": bytes, "mst": bytes, "max_flow": bytes}.
+    """
+    pos = graph_layout(graph)
+    images = {}
+
+    shortest_path = result.get("shortest_path")
+    if shortest_path:
+        images["shortest_path"] = generate_graph_image(
+            graph, shortest_path["node_order"], "Ruta Más Corta (Dijkstra)", pos=pos, fmt=fmt, thumbnail=thumbnail
+        )
+
+    mst = result.get("mst")
+    if mst:
+        images["mst"] = generate_graph_image(
+            mst["edges"], title="Árbol de Expansión Mínima (Kruskal)", edge_color='green', pos=pos, fmt=fmt, thumbnail=thumbnail
+        )
+
+    max_flow = result.get("max_flow")
+    if max_flow:
+        images["max_flow"] = generate_graph_image(
+            graph, title=f"Max Flow: {max_flow['max_flow']} ({max_flow['source']} a {max_flow['sink']})",
+            edge_labels=flow_labels(max_flow["flows"]), pos=pos, fmt=fmt, thumbnail=thumbnail
+        )
+
+    return images
+
+def encode_images(images):
+    """Bytes -> base64 para enviarlas dentro del JSON."""
+    return {name: base64.b64encode(image).decode("utf-8") for name, image in images.items()}
+
+def attach_images(result, images):
+    """Coloca cada imagen (base64) en el campo 'graph_image' de su algoritmo (formato que espera el frontend)."""
+    images = encode_images(images)
+    for name, image in images.items():
+        if isinstance(result.get(name), dict):
+            result[name]["graph_image"] = image
+    if "shortest_path" in images:
+        result["graph_image_base64"] = images["shortest_path"]
+    return result
@@ -1,42 +1,29 @@
-from app.algorithms.linear_programming import solve_linear_program
 import numpy as np
-from groq import Groq
-import os
-from dotenv import load_dotenv
-
-# Cargar .env desde la carpeta app
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(BASE_DIR, ".env"))
-
 from app.algorithms.transportation import (
     balance_transportation_problem,
+    balance_sparse_transportation_problem,
+    parse_lanes,
     northwest_corner_method,
     minimum_cost_method,
     vogel_approximation_method,
     modi_method
 )
-from app.algorithms.network_optimization import dijkstra_algorithm
+from app.algorithms.network_simplex import (
+    sparse_transportation_network_simplex,
+    transportation_network_simplex
+)
+from app.utils.logs import get_logger, trace_event
 
-# Configurar Groq AI con API key del .env
-API_KEY = os.getenv("GROQ_API_KEY")
-if API_KEY:
-    client = Groq(api_key=API_KEY)
-else:
-    client = None
+logger = get_logger(__name__)
 
-def generate_sensitivity_analysis(solution, total_cost):
-    """
-    Genera un análisis de sensibilidad utilizando Groq AI con texto plano.
-    """
+def transport_narration_prompt(solution, total_cost):
+    """Prompt del análisis de sensibilidad de transporte (sin llamar al modelo)."""
     import json
-    
-    if not API_KEY:
-        return "Error: GROQ_API_KEY no está configurada en .env"
-    
+
     # Convertir solución a string JSON para evitar errores
     solution_str = json.dumps(solution.tolist() if hasattr(solution, 'tolist') else solution)
-    
-    prompt = f"""Analiza en detalle este problema de transporte:
+
+    return f"""Analiza en detalle este problema de transporte:
     - Solución óptima: {solution_str}
     - Costo total: {total_cost}
 
@@ -55,17 +42,6 @@ Incluye:
 
 Presenta en texto limpio y comprensible para usuarios de negocios."""
 
-    try:
-        message = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="llama-3.1-8b-instant"
-        )
-        response_text = message.choices[0].message.content
-        return response_text
-    except Exception as e:
-        print(f"Error en análisis de sensibilidad: {str(e)}")
-        return f"Error al generar análisis: {str(e)}"
-
 def calculate_total_cost(solution, costs):
     """
     Calcula el costo total de la solución basada en la matriz de costos.
@@ -76,70 +52,111 @@ def calculate_total_cost(solution, costs):
             total_cost += solution[i][j] * costs[i][j] 
     return total_cost
 
-def solve_optimization(problem_type, data):
-    print(f"🚀 Recibida solicitud para {problem_type} con datos:", data)
-
-    if problem_type == "linear":
-        return solve_linear_program(data["c"], data["A_ub"], data["b_ub"])
-    elif problem_type == "transport":
-        try:
-            # 🔍 Verificar si los datos existen
-            if "supply" not in data or "demand" not in data or "costs" not in data:
-                return {"status": "error", "message": "Faltan datos en la solicitud"}
-
-            supply = data["supply"]
-            demand = data["demand"]
-            costs = np.array(data["costs"], dtype=float)
-
-            # Guardamos el tamaño original
-            original_supply_len = len(supply)
-            original_demand_len = len(demand)
-
-            # 🔍 Verificar si se necesita balancear el problema
-            supply, demand, costs = balance_transportation_problem(supply, demand, costs)
-
-            balance_message = None
-            if len(supply) > original_supply_len:
-                balance_message = "Se agregó un suministro ficticio para balancear el problema."
-            elif len(demand) > original_demand_len:
-                balance_message = "Se agregó una demanda ficticia para balancear el problema."
-
-            # Seleccionar método inicial
-            method = data.get("method", "northwest")
-
-            if method == "northwest":
-                initial_solution = northwest_corner_method(supply, demand)
-            elif method == "minimum_cost":
-                initial_solution = minimum_cost_method(supply, demand, costs)
-            elif method == "vogel":
-                initial_solution = vogel_approximation_method(supply, demand, costs)
-            else:
-                return {"status": "error", "message": "Método inválido"}
-            
-             # Optimización con MODI
-            initial_cost = calculate_total_cost(initial_solution, costs)
-            optimal_solution, total_cost = modi_method(initial_solution, costs)
-            print("🟢 Matriz óptima (MODI) antes de calcular el costo:")
-            print(optimal_solution)
-            # 📌 Generar Análisis de Sensibilidad con Google Gemini AI
-            sensitivity_analysis = generate_sensitivity_analysis(optimal_solution, total_cost)
-
-            response = {
+def solve_sparse_transport_problem(data):
+    """
+    Problema de transporte dado como lista de rutas permitidas ('lanes'):
+    [origen, destino, costo] o [origen, destino, costo, capacidad]. Se resuelve con el
+    simplex de redes sobre esas rutas, sin construir matrices m x n.
+    """
+    method = data.get("method", "network_simplex")
+    if method != "network_simplex":
+        return {"status": "error", "message": "El formato por rutas ('lanes') solo está disponible con el método 'network_simplex'."}
+
+    supply, demand = data["supply"], data["demand"]
+    origins, destinations, costs, capacities = parse_lanes(data["lanes"], len(supply), len(demand))
+    supply, demand, origins, destinations, costs, capacities = balance_sparse_transportation_problem(
+        supply, demand, origins, destinations, costs, capacities
+    )
+
+    status, flows, total_cost = sparse_transportation_network_simplex(
+        supply, demand, origins, destinations, costs, capacities
+    )
+    if status != "Optimal":
+        return {"status": "error", "message": f"Simplex de redes: {status}"}
+
+    # Solo las rutas con envío: [origen, destino, cantidad] (el nodo ficticio es el último índice)
+    used = np.flatnonzero(flows > 1e-9)
+    return {
+        "status": "success",
+        "initial_solution": None,
+        "optimal_solution": [[int(origins[k]), int(destinations[k]), float(flows[k])] for k in used],
+        "initial_cost": None,
+        "total_cost": total_cost
+    }
+
+def solve_transport_problem(data):
+    """
+    Parte de cálculo del problema de transporte: balanceo, solución inicial y MODI.
+    No llama a la IA, así que puede ejecutarse en un proceso worker.
+    """
+    try:
+        # 🔍 Verificar si los datos existen
+        if "supply" not in data or "demand" not in data or ("costs" not in data and "lanes" not in data):
+            return {"status": "error", "message": "Faltan datos en la solicitud"}
+
+        if "lanes" in data:
+            return solve_sparse_transport_problem(data)
+
+        supply = data["supply"]
+        demand = data["demand"]
+        costs = np.array(data["costs"], dtype=float)
+
+        # Guardamos el tamaño original
+        original_supply_len = len(supply)
+        original_demand_len = len(demand)
+
+        # 🔍 Verificar si se necesita balancear el problema
+        supply, demand, costs = balance_transportation_problem(supply, demand, costs)
+
+        trace_event("transport.balance", supply=len(supply), demand=len(demand),
+                    dummy_row=len(supply) > original_supply_len, dummy_column=len(demand) > original_demand_len)
+
+        balance_message = None
+        if len(supply) > original_supply_len:
+            balance_message = "Se agregó un suministro ficticio para balancear el problema."
+        elif len(demand) > original_demand_len:
+            balance_message = "Se agregó una demanda ficticia para balancear el problema."
+
+        # Seleccionar método inicial
+        method = data.get("method", "northwest")
+
+        if method == "network_simplex":
+            # Flujo de costo mínimo directo: no parte de una solución inicial ni usa MODI
+            status, allocation, total_cost = transportation_network_simplex(supply, demand, costs)
+            if status != "Optimal":
+                return {"status": "error", "message": f"Simplex de redes: {status}"}
+            return {
                 "status": "success",
-                "initial_solution": initial_solution.tolist(),
-                "optimal_solution": optimal_solution,
-                "initial_cost": initial_cost,
-                "total_cost": total_cost,
-                "sensitivity_analysis": sensitivity_analysis
+                "initial_solution": None,
+                "optimal_solution": allocation.tolist(),
+                "initial_cost": None,
+                "total_cost": total_cost
             }
+        elif method == "northwest":
+            initial_solution = northwest_corner_method(supply, demand)
+        elif method == "minimum_cost":
+            initial_solution = minimum_cost_method(supply, demand, costs)
+        elif method == "vogel":
+            initial_solution = vogel_approximation_method(supply, demand, costs)
+        else:
+            return {"status": "error", "message": "Método inválido"}
+        
+         # Optimización con MODI
+        initial_cost = calculate_total_cost(initial_solution, costs)
+        trace_event("transport.initial", method=method, basic_cells=int(np.count_nonzero(initial_solution)),
+                    cost=float(initial_cost))
+        optimal_solution, total_cost = modi_method(initial_solution, costs)
+        logger.debug("🟢 Matriz óptima (MODI) antes de calcular el costo:\n%s", optimal_solution)
+        trace_event("transport.optimal", cost=float(total_cost))
+
+        return {
+            "status": "success",
+            "initial_solution": initial_solution.tolist(),
+            "optimal_solution": optimal_solution,
+            "initial_cost": initial_cost,
+            "total_cost": total_cost
+        }
 
-            print("📩 Respuesta enviada al frontend:", response)  # ✅ Verificar respuesta
-
-            return response
-
-        except Exception as e:
-            print(f"❌ Error en solve_optimization: {str(e)}")
-            return {"status": "error", "message": str(e)}
-    elif problem_type == "network":
-        return dijkstra_algorithm(data["graph"], data["start_node"])
-    return {"status": "error", "message": "Unknown problem type"}
+    except Exception as e:
+        logger.error("❌ Error en solve_transport_problem: %s", e)
+        return {"status": "error", "message": str(e)}
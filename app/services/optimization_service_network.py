@@ -1,38 +1,20 @@
-print(">>> CARGANDO app/services/optimization_service_network.py")
-
-from groq import Groq
-import os
-from dotenv import load_dotenv
-
-# Cargar .env desde la carpeta app
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(BASE_DIR, ".env"))
-
-# Cargar API key desde .env
-API_KEY = os.getenv("GROQ_API_KEY")
-if API_KEY:
-    client = Groq(api_key=API_KEY)
-    print(f"✅ API_KEY configurada para Groq (primeros 20 caracteres): {API_KEY[:20]}...")
-else:
-    print("❌ ERROR: GROQ_API_KEY no está configurada en .env")
-    client = None
-
 from app.algorithms.network_optimization import (
-    solve_all_problems, sensitivity_analysis_shortest_path
+    solve_all_problems
 )
+from app.algorithms.compiled_graph import compile_graph
+from app.utils.logs import get_logger, trace_event
 
-def gemini_network_sensitivity_analysis(graph, shortest_path_result):
-    if not client:
-        return "Error: API de Groq no configurada. Verifica tu GROQ_API_KEY en .env"
-    
-    print(">>> ENTRANDO a groq_network_sensitivity_analysis")
+logger = get_logger(__name__)
+
+def network_narration_prompt(graph, shortest_path_result):
+    """Prompt del análisis de sensibilidad de la red (sin llamar al modelo)."""
     import json
-    
+
     # Convertir datos a strings JSON
     graph_str = json.dumps(graph)
     node_order_str = json.dumps(shortest_path_result.get('node_order', []))
-    
-    prompt = f"""Analiza la sensibilidad de esta red:
+
+    return f"""Analiza la sensibilidad de esta red:
     Grafo: {graph_str}
     Ruta más corta encontrada: {node_order_str}
     Peso total: {shortest_path_result.get('total_weight', 'N/A')}
@@ -51,36 +33,19 @@ Incluye:
 6. Recomendaciones concretas
 
 Presenta en texto limpio y comprensible."""
-    
-    try:
-        message = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="llama-3.1-8b-instant"
-        )
-        response = message.choices[0].message.content
-        print(">>> RESPUESTA DE GROQ:", response)
-        return response
-    except Exception as e:
-        response = f"Error al generar análisis con Groq: {str(e)}"
-        print(">>> ERROR DE GROQ:", response)
-        return response
 
-def solve_optimization_network(problem_type, data):
-    print(f">>> solve_optimization_network llamado con problem_type={problem_type}")
+def solve_network_results(data):
+    """Cálculos numéricos de la red (algoritmos + sensibilidad), sin IA."""
     graph = data["graph"]
+    g = compile_graph(graph)  # una sola compilación para todos los algoritmos
+    trace_event("network.compiled", nodes=g.num_nodes, edges=g.num_edges)
     
+    # Análisis de Sensibilidad Numérico (para la tabla): de la primera arista a la última.
+    # Se calcula una sola vez, dentro de solve_all_problems.
+    sensitivity_nodes = (graph[0][0], graph[-1][1]) if graph else None
+
     # Obtener cálculos básicos del archivo algorithms/network_optimization.py
-    results = solve_all_problems(graph)
-    
-    # Definir nodos inicio y fin
-    start_node = graph[0][0]
-    end_node = graph[-1][1]
-    
-    # 1. Análisis de Sensibilidad Numérico (para la tabla)
-    results["sensitivity"] = sensitivity_analysis_shortest_path(graph, start_node, end_node)
-    
-    # 2. Análisis de IA con Groq (para el cuadro de texto)
-    # IMPORTANTE: Guardarlo en la raíz como 'intelligent_analysis'
-    results["intelligent_analysis"] = gemini_network_sensitivity_analysis(graph, results["shortest_path"])
-    
+    results = solve_all_problems(g, data.get("algorithm", "dinic"), sensitivity_nodes)
+    # Se guarda el grafo junto a los números para poder dibujarlo después (/api/render/{id})
+    results["graph"] = graph
     return results
@@ -0,0 +1,69 @@
+import hmac
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from fastapi import HTTPException
+from app.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# ==========================================
+# PERFILES GUARDADOS (SOLO ADMINISTRACIÓN)
+# ==========================================
+# ?profile=true solo se acepta con el encabezado X-Profile-Token igual a PROFILE_TOKEN; si
+# PROFILE_TOKEN no está configurado, el perfilado está deshabilitado. La respuesta lleva en
+# "profile" las funciones calientes y la URL del perfil; las pilas colapsadas se guardan
+# aquí (en memoria, acotado a PROFILE_MAX_ENTRIES) y, con PROFILE_DIR, también en disco
+# como <id>.collapsed para abrirlas después con speedscope o flamegraph.pl.
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_MAX_ENTRIES = int(os.getenv("PROFILE_MAX_ENTRIES", 50))
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+
+_profiles = OrderedDict()  # id -> pilas colapsadas
+_lock = threading.Lock()
+
+
+def check_profile_access(token):
+    if not PROFILE_TOKEN:
+        raise HTTPException(status_code=403, detail="Perfilado deshabilitado: configure PROFILE_TOKEN")
+    if token is None or not hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Token de perfilado inválido")
+
+def _path(profile_id):
+    return os.path.join(PROFILE_DIR, f"{profile_id}.collapsed")
+
+def store_profile(kind, profile):
+    """Guarda las pilas del perfil del worker y devuelve el resumen para la respuesta."""
+    profile = dict(profile)
+    collapsed = profile.pop("collapsed")
+    profile_id = uuid.uuid4().hex
+    with _lock:
+        _profiles[profile_id] = collapsed
+        while len(_profiles) > PROFILE_MAX_ENTRIES:
+            _profiles.popitem(last=False)
+    if PROFILE_DIR:
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(_path(profile_id), "w", encoding="utf-8") as f:
+                f.write(collapsed)
+        except OSError as e:
+            logger.error("❌ No se pudo guardar el perfil %s: %s", profile_id, e)
+
+    hottest = profile["hot"][0]["function"] if profile["hot"] else None
+    logger.info("🔬 Perfil %s (%s): %.1f ms, %s muestras, más caliente: %s",
+                profile_id, kind, profile["wall_ms"], profile["samples"], hottest)
+    return {"id": profile_id, "url": f"/api/profiles/{profile_id}", **profile}
+
+def get_profile(profile_id):
+    """Pilas colapsadas del perfil, o None si ya no está ni en memoria ni en disco."""
+    with _lock:
+        collapsed = _profiles.get(profile_id)
+    if collapsed is None and PROFILE_DIR:
+        try:
+            with open(_path(profile_id), encoding="utf-8") as f:
+                collapsed = f.read()
+        except OSError:
+            return None
+    return collapsed
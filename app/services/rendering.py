@@ -0,0 +1,64 @@
+import io
+import os
+import threading
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from app.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# ==========================================
+# SERVICIO DE RENDERIZADO (SIN PYPLOT)
+# ==========================================
+# Se usa la API orientada a objetos (Figure + FigureCanvasAgg) en lugar del estado global
+# de pyplot, así dos dibujos en paralelo no se pisan. Cada proceso (o hilo) guarda sus
+# figuras por tamaño: se crean una vez, se limpian con clear() y se reutilizan.
+# Los workers del pool "render" (app/services/execution.py) las crean al arrancar (warm_up).
+
+IMAGE_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+DEFAULT_DPI = int(os.getenv("RENDER_DPI", 100))
+THUMBNAIL_DPI = int(os.getenv("RENDER_THUMBNAIL_DPI", 40))
+
+GRAPH_FIGSIZE = (7, 5)   # grafos de red
+PLOT_FIGSIZE = (10, 8)   # método gráfico de PL
+
+_local = threading.local()
+
+
+def get_figure(figsize):
+    """Figura reutilizable del tamaño pedido, vacía y lista para dibujar."""
+    figures = getattr(_local, "figures", None)
+    if figures is None:
+        figures = _local.figures = {}
+    fig = figures.get(figsize)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        figures[figsize] = fig
+    else:
+        fig.clear()
+    return fig
+
+def figure_bytes(fig, fmt="png", thumbnail=False):
+    """
+    Serializa la figura (PNG o SVG) y la deja limpia para el siguiente dibujo.
+    `thumbnail` usa una resolución baja para miniaturas (RENDER_THUMBNAIL_DPI).
+    """
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"Formato de imagen no soportado: {fmt}")
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format=fmt, dpi=THUMBNAIL_DPI if thumbnail else DEFAULT_DPI, bbox_inches='tight')
+    finally:
+        fig.clear()
+    return buf.getvalue()
+
+def warm_up():
+    """Inicializador de los workers de render: crea las figuras y hace un primer dibujo (backend, fuentes)."""
+    for figsize in (GRAPH_FIGSIZE, PLOT_FIGSIZE):
+        ax = get_figure(figsize).add_subplot()
+        ax.plot([0, 1], [0, 1], label="warm-up")
+        ax.set_title("warm-up")
+        ax.legend()
+        figure_bytes(ax.figure)
+    logger.info("✅ Worker de render listo (pid %s)", os.getpid())
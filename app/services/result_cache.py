@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from app.utils.logs import get_logger
+
+logger = get_logger(__name__)
+
+# ==========================================
+# CACHÉ DE RESULTADOS POR CONTENIDO
+# ==========================================
+# La clave es un hash SHA-256 del problema normalizado, así que el mismo modelo enviado
+# otra vez (por ejemplo, un dashboard que se refresca) no vuelve a resolverse.
+# - Memoria: LRU acotado por tamaño (bytes del resultado serializado).
+# - Disco (opcional, SOLVER_CACHE_DIR): sobrevive a reinicios y se comparte entre procesos.
+
+MEMORY_MAX_BYTES = int(os.getenv("SOLVER_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+DISK_DIR = os.getenv("SOLVER_CACHE_DIR")
+DISK_MAX_BYTES = int(os.getenv("SOLVER_CACHE_DISK_MAX_BYTES", 512 * 1024 * 1024))
+DISK_TMP_MAX_AGE = 60  # segundos: un .tmp más viejo quedó de una escritura que falló
+
+
+def _hash(payload):
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _floats(values):
+    # Solo normaliza números (1 y 1.0 dan la misma clave); lo demás se deja tal cual y
+    # el solver devolverá el error de validación correspondiente
+    return [float(v) if isinstance(v, (int, float)) else v for v in values]
+
+def linear_problem_key(data, with_sensitivity=False):
+    """
+    Objetivo, variables, coeficientes (densos o 'terms'), signos, RHS y método.
+    `with_sensitivity` separa las entradas que además guardan la sensibilidad numérica.
+    """
+    constraints = []
+    for constraint in data.get("constraints", []):
+        if "terms" in constraint:
+            coeffs = {"terms": sorted([int(idx), float(val)] for idx, val in constraint["terms"])}
+        else:
+            coeffs = {"coeffs": _floats(constraint.get("coeffs", []))}
+        constraints.append({**coeffs, "sign": constraint.get("sign", "<="), "rhs": float(constraint.get("rhs", 0))})
+    return _hash({
+        "objective": data.get("objective"),
+        "variables": data.get("variables"),
+        "objective_coeffs": _floats(data.get("objective_coeffs", [])),
+        "constraints": constraints,
+        "method": data.get("method", "simplex"),
+        "with_sensitivity": with_sensitivity,
+    })
+
+def transport_problem_key(data):
+    """Oferta, demanda, matriz de costos (o lista de rutas) y método inicial."""
+    return _hash({
+        "supply": _floats(data.get("supply", [])),
+        "demand": _floats(data.get("demand", [])),
+        "costs": [_floats(row) for row in data.get("costs", [])],
+        "lanes": [_floats(lane) if isinstance(lane, list) else lane for lane in data.get("lanes", [])],
+        "method": data.get("method", "northwest"),
+    })
+
+def network_problem_key(graph, algorithm="dinic"):
+    """
+    Lista de aristas [u, v, peso, capacidad] en el orden recibido (define origen y destino)
+    y algoritmo de flujo máximo.
+    """
+    return _hash({
+        "graph": [[u, v, *_floats(rest)] for u, v, *rest in graph],
+        "algorithm": algorithm,
+    })
+
+def image_key(kind, spec):
+    """Id de una imagen generada: hash de lo que se dibuja (mismo dibujo -> mismo id)."""
+    return _hash({"kind": kind, "spec": spec})
+
+def graph_layout_key(graph):
+    """Solo aristas y pesos: es lo que determina la posición de los nodos al dibujar."""
+    return _hash([[u, v, *_floats(rest[:1])] for u, v, *rest in graph])
+
+
+class ResultCache:
+    """LRU en memoria acotado por bytes con un nivel opcional en disco y contadores de aciertos."""
+
+    def __init__(self, name, max_bytes=MEMORY_MAX_BYTES, disk_dir=DISK_DIR, disk_max_bytes=DISK_MAX_BYTES):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()  # clave -> resultado serializado (bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.disk_dir = os.path.join(disk_dir, name) if disk_dir else None
+        self._disk_bytes = 0  # total de los .pkl: se escanea al arrancar y luego se lleva la cuenta
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_scan()
+
+    def get(self, key):
+        """Devuelve una copia nueva del resultado o None si no está en caché."""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(blob)
+
+        blob = self._disk_read(key)
+        with self._lock:
+            if blob is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, blob)
+        return pickle.loads(blob)
+
+    def put(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._store(key, blob)
+        self._disk_write(key, blob)
+
+    def _store(self, key, blob):
+        if len(blob) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = blob
+        self._bytes += len(blob)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _disk_read(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            os.utime(path)  # marca de uso para el desalojo LRU en disco
+            return blob
+        except OSError:
+            return None
+
+    def _disk_write(self, key, blob):
+        if not self.disk_dir:
+            return
+        # Escritura atómica: otros procesos nunca ven un archivo a medio escribir
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            try:
+                replaced = os.stat(path).st_size
+            except OSError:
+                replaced = 0
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("⚠️ No se pudo escribir la caché en disco: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._disk_bytes += len(blob) - replaced
+            over = self._disk_bytes > self.disk_max_bytes
+        if over:
+            self._disk_evict()
+
+    def _disk_scan(self):
+        """
+        Un recorrido del directorio: (mtime, tamaño, ruta) de cada .pkl y recalcula el total.
+        También borra los .tmp abandonados por escrituras que fallaron (de cualquier proceso).
+        """
+        files = []
+        now = time.time()
+        for entry in os.scandir(self.disk_dir):
+            try:
+                stat = entry.stat()
+                if entry.name.endswith(".pkl"):
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                elif entry.name.endswith(".tmp") and now - stat.st_mtime > DISK_TMP_MAX_AGE:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = sum(size for _, size, _ in files)
+        return files
+
+    def _disk_evict(self):
+        """
+        Solo cuando el total pasa del límite: se vuelve a escanear (otros procesos también
+        escriben en el directorio) y se borran los archivos usados hace más tiempo.
+        """
+        files = self._disk_scan()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = total
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "disk_dir": self.disk_dir,
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+CACHES = {name: ResultCache(name) for name in ("linear", "transport", "network", "narration")}
+
+def cache_stats():
+    return {name: cache.stats() for name, cache in CACHES.items()}
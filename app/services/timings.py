@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.utils.metrics import activate_phases
+
+# ==========================================
+# DESGLOSE DE TIEMPOS POR SOLICITUD
+# ==========================================
+# Las rutas de resolución miden sus fases (validation, dispatch, render, narration,
+# serialization) y los workers reportan las suyas (build, solve, sensitivity, ver
+# app/utils/metrics.py). Las fases no se solapan: cada una descuenta el tiempo que
+# registraron las fases internas, así que su suma es el total de la solicitud.
+# El resultado va siempre en el encabezado Server-Timing y, con ?timings=true, también
+# en el campo "timings" de la respuesta (milisegundos).
+
+
+class RequestTimings:
+    def __init__(self):
+        self.phases = {}  # fase -> segundos
+        self._start = time.perf_counter()
+        activate_phases(self.phases)
+
+    @contextmanager
+    def phase(self, name):
+        nested = sum(self.phases.values())
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start - (sum(self.phases.values()) - nested)
+            self.phases[name] = self.phases.get(name, 0.0) + max(elapsed, 0.0)
+
+    def milliseconds(self):
+        timings = {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()}
+        timings["total"] = round((time.perf_counter() - self._start) * 1000, 3)
+        return timings
+
+    def response(self, content, include=False):
+        """Serializa (medido como "serialization") y responde con el encabezado Server-Timing."""
+        with self.phase("serialization"):
+            body = jsonable_encoder(content)
+        timings = self.milliseconds()
+        if include and isinstance(body, dict):
+            body["timings"] = timings
+        header = ", ".join(f"{name};dur={ms}" for name, ms in timings.items())
+        # Timing-Allow-Origin: el frontend corre en otro origen y debe poder leerlo (Resource Timing)
+        return JSONResponse(body, headers={"Server-Timing": header, "Timing-Allow-Origin": "*"})
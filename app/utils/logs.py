@@ -0,0 +1,121 @@
+import contextvars
+import json
+import logging
+import os
+import sys
+
+# ==========================================
+# LOGGING ESTRUCTURADO Y TRAZA POR SOLICITUD
+# ==========================================
+# - Logging: un logger por módulo (get_logger(__name__)) con nivel global LOG_LEVEL y
+#   niveles por módulo en LOG_LEVELS ("app.algorithms=WARNING,app.routes=DEBUG").
+#   LOG_FORMAT=json emite una línea JSON por registro. Los mensajes usan formato diferido
+#   (logger.debug("... %s", valor)): si el nivel está apagado, la matriz no se formatea.
+# - Traza: con ?trace=true la ruta ejecuta el solver dentro de run_traced y las iteraciones
+#   (pivotes del Simplex, MODI, fases de flujo máximo...) se devuelven en la respuesta como
+#   una lista de eventos acotada (TRACE_MAX_EVENTS) en lugar de escribirse en stdout.
+#   Sin traza activa, trace_event no hace nada.
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+TRACE_MAX_EVENTS = int(os.getenv("TRACE_MAX_EVENTS", 1000))
+
+_configured = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea: hora, nivel, logger, mensaje y los campos de `extra`."""
+
+    _reserved = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self._reserved})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def _parse_levels(spec):
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def configure_logging():
+    """Configura el logger "app" una sola vez por proceso (también en los workers)."""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s", "%H:%M:%S"))
+
+    root = logging.getLogger("app")
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+    root.propagate = False
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+def get_logger(name):
+    configure_logging()
+    return logging.getLogger(name)
+
+
+# ------------------------------------------
+# Traza de iteraciones (opt-in por solicitud)
+# ------------------------------------------
+
+class Trace:
+    """Lista de eventos acotada: después de `max_events` solo se cuentan los descartados."""
+
+    def __init__(self, max_events=TRACE_MAX_EVENTS):
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+
+    def add(self, event, **fields):
+        if len(self.events) < self.max_events:
+            self.events.append({"event": event, **fields})
+        else:
+            self.dropped += 1
+
+    def to_dict(self):
+        return {"events": self.events, "dropped": self.dropped}
+
+
+_current_trace = contextvars.ContextVar("trace", default=None)
+
+def current_trace():
+    """Traza activa o None. En bucles calientes: `trace = current_trace()` y `if trace: ...`."""
+    return _current_trace.get()
+
+def trace_event(event, **fields):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(event, **fields)
+
+def run_traced(fn, *args):
+    """
+    Ejecuta fn(*args) con una traza activa (en el worker) y devuelve (resultado, traza).
+    Es una función de módulo para poder enviarla al pool de procesos.
+    """
+    trace = Trace()
+    token = _current_trace.set(trace)
+    try:
+        result = fn(*args)
+    finally:
+        _current_trace.reset(token)
+    return result, trace.to_dict()
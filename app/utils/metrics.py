@@ -0,0 +1,196 @@
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# ==========================================
+# MÉTRICAS POR ALGORITMO (FORMATO PROMETHEUS)
+# ==========================================
+# `timed` (decorador) y `measure` (context manager) registran por algoritmo el tiempo de
+# pared, las iteraciones y el tamaño del problema en histogramas, más un contador de
+# llamadas por estado (ok/error). /metrics los expone en el formato de texto de Prometheus.
+# Los solvers corren en procesos worker: ahí las observaciones se acumulan en un buffer que
+# viaja con cada resultado (drain_samples) y el proceso principal las suma (record_samples).
+# Además, si la solicitud pidió su desglose de tiempos (app/services/timings.py), la medición
+# más externa de cada llamada suma su tiempo a la fase que le corresponde (PHASES).
+
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+COUNT_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._series = {}  # algoritmo -> [conteo por bucket..., suma, total]
+
+    def observe(self, algorithm, value):
+        series = self._series.get(algorithm)
+        if series is None:
+            series = self._series[algorithm] = [0] * len(self.buckets) + [0.0, 0]
+        for k, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[k] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for algorithm, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{algorithm="{algorithm}",le="{bound:g}"}} {count}')
+            lines.append(f'{self.name}_bucket{{algorithm="{algorithm}",le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{algorithm="{algorithm}"}} {series[-2]:.6g}')
+            lines.append(f'{self.name}_count{{algorithm="{algorithm}"}} {series[-1]}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}  # (algoritmo, estado) -> total
+
+    def inc(self, algorithm, status):
+        key = (algorithm, status)
+        self._values[key] = self._values.get(key, 0) + 1
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for (algorithm, status), value in sorted(self._values.items()):
+            lines.append(f'{self.name}{{algorithm="{algorithm}",status="{status}"}} {value}')
+        return lines
+
+
+DURATION = Histogram("solver_duration_seconds", "Tiempo de pared por algoritmo.", DURATION_BUCKETS)
+ITERATIONS = Histogram("solver_iterations", "Iteraciones (pivotes, fases) por ejecución.", COUNT_BUCKETS)
+PROBLEM_SIZE = Histogram("solver_problem_size", "Tamaño del problema (celdas, aristas, coeficientes).", COUNT_BUCKETS)
+CALLS = Counter("solver_calls_total", "Ejecuciones por algoritmo y estado.")
+
+# Prefijo del algoritmo -> fase de la solicitud (el resto cuenta como "solve")
+PHASES = {"build": "build", "sensitivity": "sensitivity", "render": "render", "llm": "narration"}
+
+_lock = threading.Lock()
+_buffer = None  # en un worker: lista de observaciones pendientes de enviar al proceso principal
+_phases = contextvars.ContextVar("phases", default=None)  # fase -> segundos de la solicitud actual
+_depth = contextvars.ContextVar("measure_depth", default=0)
+
+
+def _record(algorithm, seconds, status, iterations, size):
+    with _lock:
+        DURATION.observe(algorithm, seconds)
+        CALLS.inc(algorithm, status)
+        if iterations is not None:
+            ITERATIONS.observe(algorithm, iterations)
+        if size is not None:
+            PROBLEM_SIZE.observe(algorithm, size)
+
+def observe(algorithm, seconds, status="ok", iterations=None, size=None):
+    sample = (algorithm, seconds, status, iterations, size)
+    if _buffer is not None:
+        _buffer.append(sample)
+    else:
+        _record(*sample)
+
+def buffer_samples():
+    """Llamar al arrancar un proceso worker: las observaciones se guardan para enviarlas."""
+    global _buffer
+    _buffer = []
+
+def drain_samples():
+    """Observaciones acumuladas en este worker desde la última llamada (y vacía el buffer)."""
+    global _buffer
+    if _buffer is None:
+        return []
+    samples, _buffer = _buffer, []
+    return samples
+
+def record_samples(samples):
+    """Suma al registro del proceso principal las observaciones que llegan de un worker."""
+    for sample in samples:
+        _record(*sample)
+
+
+def phase_of(algorithm):
+    return PHASES.get(algorithm.split(".")[0], "solve")
+
+def activate_phases(phases):
+    """Las mediciones de este contexto (y las que lleguen de los workers) se suman a `phases`."""
+    _phases.set(phases)
+
+def detach_phases():
+    """Para tareas de fondo que heredan el contexto de la solicitud pero terminan después."""
+    _phases.set(None)
+
+def add_phases(phases):
+    target = _phases.get()
+    if target is not None:
+        for name, seconds in phases.items():
+            target[name] = target.get(name, 0.0) + seconds
+
+@contextmanager
+def collect_phases():
+    """En el worker: fases de una sola llamada, para enviarlas junto con el resultado."""
+    phases = {}
+    token = _phases.set(phases)
+    try:
+        yield phases
+    finally:
+        _phases.reset(token)
+
+
+class measure:
+    """
+    Context manager: `with measure("modi", size=m * n) as m: ...; m.iterations = k`.
+    Si el bloque lanza una excepción se registra con estado "error".
+    """
+
+    def __init__(self, algorithm, size=None):
+        self.algorithm = algorithm
+        self.size = size
+        self.iterations = None
+
+    def __enter__(self):
+        self._token = _depth.set(_depth.get() + 1)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        outermost = _depth.get() == 1
+        _depth.reset(self._token)
+        observe(self.algorithm, elapsed, "error" if exc_type else "ok", self.iterations, self.size)
+        phases = _phases.get()
+        if outermost and phases is not None:
+            # Solo la más externa: el Simplex dentro de la sensibilidad cuenta como sensibilidad
+            phase = phase_of(self.algorithm)
+            phases[phase] = phases.get(phase, 0.0) + elapsed
+        return False
+
+def timed(algorithm, size=None, iterations=None):
+    """
+    Decorador sobre `measure`. `size(*args, **kwargs)` calcula el tamaño a partir de los
+    argumentos e `iterations(resultado)` las iteraciones a partir del resultado.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with measure(algorithm) as m:
+                if size is not None:
+                    m.size = size(*args, **kwargs)
+                result = fn(*args, **kwargs)
+                if iterations is not None:
+                    m.iterations = iterations(result)
+            return result
+        return wrapper
+    return decorate
+
+def exposition():
+    """Texto para /metrics (formato de exposición de Prometheus 0.0.4)."""
+    with _lock:
+        lines = []
+        for metric in (DURATION, ITERATIONS, PROBLEM_SIZE, CALLS):
+            lines += metric.exposition()
+    return "\n".join(lines) + "\n"
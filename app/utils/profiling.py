@@ -0,0 +1,118 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+# ==========================================
+# PERFILADO OPT-IN DE UNA SOLICITUD
+# ==========================================
+# Con ?profile=true (y el token de administración, ver app/services/profiles.py) la ruta
+# ejecuta su cálculo en el worker dentro de run_profiled, que combina dos perfiladores:
+# - un muestreador (hilo aparte) que cada PROFILE_INTERVAL segundos toma la pila del hilo
+#   que resuelve: son las pilas colapsadas ("a;b;c 12") que leen flamegraph.pl y speedscope;
+# - cProfile, determinista, para la tabla de funciones calientes de app/algorithms y
+#   app/services (llamadas, tiempo propio y acumulado), exacta aunque el cálculo dure poco.
+# Sin ?profile no se ejecuta nada de esto: la ruta sigue por run_solver como siempre.
+
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.001))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", 20))
+HOT_PREFIXES = ("app/algorithms/", "app/services/")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_labels = {}  # código -> etiqueta de la pila (se calcula una vez por función)
+
+
+def _short_path(filename):
+    """Ruta legible: relativa al repositorio, o desde site-packages para las dependencias."""
+    path = filename.replace(os.sep, "/")
+    root = ROOT.replace(os.sep, "/") + "/"
+    if path.startswith(root):
+        return path[len(root):]
+    _, sep, rest = path.partition("site-packages/")
+    return rest if sep else os.path.basename(path)
+
+def _label(code):
+    label = _labels.get(code)
+    if label is None:
+        name = getattr(code, "co_qualname", code.co_name)
+        label = _labels[code] = f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+class StackSampler(threading.Thread):
+    """
+    Muestrea la pila de `thread_id` cada `interval` segundos. Las pilas se cortan en el
+    marco de `stop_code` (run_profiled): el bucle del worker no aparece en el perfil.
+    """
+
+    def __init__(self, thread_id, stop_code, interval=PROFILE_INTERVAL):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.stop_code = stop_code
+        self.interval = interval
+        self.stacks = Counter()  # "raíz;...;hoja" -> muestras
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not self.stop_code:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+    def collapsed(self):
+        """Formato de pilas colapsadas: una línea "marco;marco;... muestras" por pila."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def hot_functions(profiler, limit=PROFILE_TOP_N):
+    """Funciones de app/algorithms y app/services con más tiempo propio según cProfile."""
+    hot = []
+    for (filename, line, name), (_, calls, self_time, total_time, _) in pstats.Stats(profiler).stats.items():
+        path = _short_path(filename)
+        if path.startswith(HOT_PREFIXES):
+            hot.append({
+                "function": f"{path}:{line}({name})",
+                "calls": calls,
+                "self_ms": round(self_time * 1000, 3),
+                "total_ms": round(total_time * 1000, 3),
+            })
+    hot.sort(key=lambda row: row["self_ms"], reverse=True)
+    return hot[:limit]
+
+def run_profiled(fn, *args):
+    """
+    Ejecuta fn(*args) bajo ambos perfiladores (en el worker) y devuelve (resultado, perfil).
+    Es una función de módulo para poder enviarla al pool de procesos.
+    """
+    sampler = StackSampler(threading.get_ident(), run_profiled.__code__)
+    profiler = cProfile.Profile()
+    sampler.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        result = fn(*args)
+    finally:
+        profiler.disable()
+        wall = time.perf_counter() - start
+        sampler.stop()
+    return result, {
+        "wall_ms": round(wall * 1000, 3),
+        "interval_ms": sampler.interval * 1000,
+        "samples": sampler.samples,
+        "hot": hot_functions(profiler),
+        "collapsed": sampler.collapsed(),
+    }
@@ -1,86 +1,72 @@
-from groq import Groq
-import os
-from dotenv import load_dotenv
+import json
+from app.utils.logs import get_logger, trace_event
+from app.utils.metrics import timed
 
-# Cargar .env desde la carpeta app
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-load_dotenv(os.path.join(BASE_DIR, ".env"))
-
-# Configurar Groq AI
-API_KEY = os.getenv("GROQ_API_KEY")
-if API_KEY:
-    client = Groq(api_key=API_KEY)
-else:
-    print("⚠️ Advertencia: GROQ_API_KEY no está configurada en .env")
-    client = None
-
-def analyze_sensitivity(data, solution):
-    from app.models.linear_program import solve_linear_problem  # Importación dentro de la función
-
-    perturbation = 0.01
-    sensitivities = {}
+logger = get_logger(__name__)
 
+@timed("sensitivity.linear", size=lambda data, solver, solution: len(data.get("constraints", [])) * len(data.get("variables", [])))
+def analyze_sensitivity(data, solver, solution):
+    """
+    Análisis de sensibilidad exacto (rangos) a partir de la base final de `solver`, el mismo
+    SimplexSolverV2 que produjo `solution`: no se vuelve a resolver el modelo. Entrega precios
+    sombra, costos reducidos, rangos de los coeficientes objetivo y rangos del lado derecho
+    de cada restricción.
+    """
     # Verificar que la solución original sea válida
-    if not solution or "objective_value" not in solution:
-        print("❌ Solución original no válida para análisis de sensibilidad")
+    if not solution or solution.get("status") != "Optimal":
+        logger.warning("❌ El modelo no tiene óptimo para análisis de sensibilidad")
         return {}
 
-    original_objective_value = solution["objective_value"]
+    trace_event("sensitivity.start", method=data.get("method", "simplex"))
+    report = solver.sensitivity_report()
+    if report is None:
+        logger.warning("❌ La base final no es óptima para el modelo: sin análisis de sensibilidad")
+        return {}
 
-    for i, var in enumerate(data["variables"]):
-        try:
-            # Crear una copia de los datos con el coeficiente modificado
-            modified_coeffs = data["objective_coeffs"][:]
-            modified_coeffs[i] += perturbation
-            new_data = data.copy()
-            new_data["objective_coeffs"] = modified_coeffs
+    variables = {
+        var: report["variables"][i] for i, var in enumerate(data["variables"][:len(report["variables"])])
+    }
 
-            # Resolver el problema modificado
-            new_solution = solve_linear_problem(new_data)
-            
-            # Verificar que la nueva solución sea válida
-            if new_solution and "objective_value" in new_solution:
-                # Calcular la sensibilidad
-                sensitivity = (new_solution["objective_value"] - original_objective_value) / perturbation
-                sensitivities[var] = sensitivity
-                print(f"✅ Sensibilidad calculada para {var}: {sensitivity}")
-            else:
-                print(f"❌ No se pudo calcular sensibilidad para {var}: solución inválida")
-                sensitivities[var] = 0.0
-                
-        except Exception as e:
-            print(f"❌ Error calculando sensibilidad para {var}: {str(e)}")
-            sensitivities[var] = 0.0
+    # Las filas del solver van primero las <= (incluye las >= invertidas) y luego las =
+    num_ub = len(solver.b_ub)
+    ub_idx, eq_idx = 0, num_ub
+    constraints = []
+    for i, constraint in enumerate(data["constraints"]):
+        sign = constraint.get("sign", "<=")
+        if sign == "=":
+            row = dict(report["constraints"][eq_idx])
+            eq_idx += 1
+        else:
+            row = dict(report["constraints"][ub_idx])
+            ub_idx += 1
+        if sign == ">=":
+            # build_linear_solver la pasó a <= multiplicando por -1
+            row["rhs"] = -row["rhs"]
+            row["shadow_price"] = -row["shadow_price"]
+            row["allowable_increase"], row["allowable_decrease"] = row["allowable_decrease"], row["allowable_increase"]
+        constraints.append({"constraint": f"R{i+1}", "sign": sign, **row})
 
-    print(f"📊 Análisis de sensibilidad completado: {sensitivities}")
+    sensitivities = {"variables": variables, "constraints": constraints}
+    logger.debug("📊 Análisis de sensibilidad completado: %s", sensitivities)
     return sensitivities
 
-def generate_intelligent_sensitivity_analysis(data, solution, sensitivities, method):
-    """
-    Genera un análisis de sensibilidad inteligente usando Groq AI para programación lineal.
-    Retorna texto plano con énfasis en puntos importantes.
-    """
-    if not client:
-        return "Error: API de Groq no configurada. Verifica tu GROQ_API_KEY en .env"
-    
-    try:
-        # Preparar la información para el análisis
-        objective_type = "Maximización" if data["objective"] == "max" else "Minimización"
-        variables_info = ", ".join([f"{var} (coef: {data['objective_coeffs'][i]})" 
-                                   for i, var in enumerate(data["variables"])])
-        
-        constraints_info = []
-        for i, constraint in enumerate(data["constraints"]):
-            constraint_str = " + ".join([f"{constraint['coeffs'][j]}{data['variables'][j]}" 
-                                       for j in range(len(constraint['coeffs']))])
-            constraints_info.append(f"Restricción {i+1}: {constraint_str} {constraint['sign']} {constraint['rhs']}")
-        
-        # Convertir diccionarios a strings JSON para evitar errores con f-strings
-        import json
-        sensitivities_str = json.dumps(sensitivities) if sensitivities else "{}"
-        variable_values_str = json.dumps(solution.get('variable_values', {}))
-        
-        prompt = f"""Realiza un análisis de sensibilidad detallado para un problema de programación lineal.
+def linear_narration_prompt(data, solution, sensitivities, method):
+    """Prompt del análisis de sensibilidad de programación lineal (sin llamar al modelo)."""
+    objective_type = "Maximización" if data["objective"] == "max" else "Minimización"
+    variables_info = ", ".join([f"{var} (coef: {data['objective_coeffs'][i]})"
+                               for i, var in enumerate(data["variables"])])
+
+    constraints_info = []
+    for i, constraint in enumerate(data["constraints"]):
+        terms = constraint["terms"] if "terms" in constraint else enumerate(constraint["coeffs"])
+        constraint_str = " + ".join([f"{coef}{data['variables'][j]}" for j, coef in terms])
+        constraints_info.append(f"Restricción {i+1}: {constraint_str} {constraint['sign']} {constraint['rhs']}")
+
+    # Convertir diccionarios a strings JSON para evitar errores con f-strings
+    sensitivities_str = json.dumps(sensitivities) if sensitivities else "{}"
+    variable_values_str = json.dumps(solution.get('variable_values', {}))
+
+    return f"""Realiza un análisis de sensibilidad detallado para un problema de programación lineal.
 
 **Datos del Problema:**
 - Tipo de objetivo: {objective_type}
@@ -101,14 +87,3 @@ Presenta un análisis claro y práctico. Usa estas marcas para resaltar informac
 - [RECOMENDACIÓN] para sugerencias accionables
 - [RIESGO] para puntos débiles de la solución
 Presenta el análisis en texto limpio y comprensible para un usuario de negocios."""
-
-        message = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="llama-3.1-8b-instant"
-        )
-        response = message.choices[0].message.content
-        return response
-        
-    except Exception as e:
-        print(f"❌ Error generando análisis inteligente: {str(e)}")
-        return f"Error al generar análisis inteligente: {str(e)}"
@@ -1,3 +1,6 @@
+from app.algorithms.max_flow import MAX_FLOW_ALGORITHMS
+from app.algorithms.transportation import parse_lanes
+
 def validate_linear_problem(data):
     errors = []
     if "objective" not in data or data["objective"] not in ["min", "max"]:
@@ -11,7 +14,8 @@ def validate_linear_problem(data):
         "m_big": ["<=", ">=", "="],
         "two_phase": ["<=", ">=", "="],
         "dual": ["<=", ">=", "="],
-        "graphical": ["<="],  # depende de implementación
+        "revised": ["<=", ">=", "="],
+        "graphical": ["<=", ">=", "="],
     }
     method = data.get("method", "simplex")
     allowed = allowed_signs.get(method, ["<="])
@@ -21,15 +25,74 @@ def validate_linear_problem(data):
                 errors.append(
                     f"La restricción #{i+1} debe ser de tipo {', '.join(allowed)} para el método {method.capitalize()}."
                 )
+            if "terms" in constraint:
+                errors.extend(_validate_sparse_terms(data, constraint, i, method))
+    return errors
+
+def _validate_sparse_terms(data, constraint, i, method):
+    """Valida una restricción en formato disperso: lista de pares [índice, valor]."""
+    errors = []
+    if method in ("graphical", "dual"):
+        errors.append(f"La restricción #{i+1} usa formato disperso, que no está disponible para el método {method.capitalize()}.")
+        return errors
+    num_vars = len(data.get("objective_coeffs", []))
+    terms = constraint["terms"]
+    if not isinstance(terms, list) or not all(isinstance(t, (list, tuple)) and len(t) == 2 for t in terms):
+        errors.append(f"La restricción #{i+1} debe definir 'terms' como pares [índice, valor].")
+        return errors
+    for idx, _ in terms:
+        if not isinstance(idx, int) or not 0 <= idx < num_vars:
+            errors.append(f"La restricción #{i+1} tiene un índice de variable inválido: {idx}.")
     return errors
 
+TRANSPORT_METHODS = ("northwest", "minimum_cost", "vogel", "network_simplex")
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
 def validate_transport_problem(data):
     errors = []
-    if "supply" not in data or not isinstance(data["supply"], list):
-        errors.append("Missing or invalid 'supply' field.")
-    if "demand" not in data or not isinstance(data["demand"], list):
-        errors.append("Missing or invalid 'demand' field.")
-    if "cost_matrix" not in data or not isinstance(data["cost_matrix"], list):
-        errors.append("Missing or invalid 'cost_matrix' field.")
-    
-    return errors if errors else None
+    for field in ("supply", "demand"):
+        values = data.get(field)
+        if not isinstance(values, list) or not values:
+            errors.append(f"Debe definir '{field}' como una lista no vacía.")
+        elif not all(_is_number(v) and v >= 0 for v in values):
+            errors.append(f"Los valores de '{field}' deben ser números no negativos.")
+    if errors:
+        return errors
+
+    num_origins, num_destinations = len(data["supply"]), len(data["demand"])
+    if "lanes" in data:
+        if data.get("method", "network_simplex") != "network_simplex":
+            errors.append("El formato por rutas ('lanes') solo está disponible con el método 'network_simplex'.")
+        elif not isinstance(data["lanes"], list) or not data["lanes"]:
+            errors.append("Debe definir 'lanes' como una lista no vacía de rutas.")
+        else:
+            try:
+                parse_lanes(data["lanes"], num_origins, num_destinations)
+            except (TypeError, ValueError) as e:
+                errors.append(str(e))
+    elif "costs" in data:
+        if data.get("method", "northwest") not in TRANSPORT_METHODS:
+            errors.append(f"Método inválido: use uno de {', '.join(TRANSPORT_METHODS)}.")
+        costs = data["costs"]
+        if not isinstance(costs, list) or len(costs) != num_origins or not all(
+            isinstance(row, list) and len(row) == num_destinations and all(_is_number(c) for c in row) for row in costs
+        ):
+            errors.append(f"'costs' debe ser una matriz numérica de {num_origins}x{num_destinations} (orígenes x destinos).")
+    else:
+        errors.append("Debe definir 'costs' (matriz de costos) o 'lanes' (lista de rutas).")
+    return errors
+
+def validate_network_problem(graph, algorithm):
+    errors = []
+    if algorithm not in MAX_FLOW_ALGORITHMS:
+        errors.append(f"Algoritmo de flujo máximo desconocido: {algorithm}")
+    if not graph:
+        errors.append("La red debe tener al menos una arista.")
+    for k, edge in enumerate(graph):
+        if not 2 <= len(edge) <= 4:
+            errors.append(f"La arista #{k+1} debe ser [origen, destino, peso, capacidad].")
+        elif not all(_is_number(value) and value >= 0 for value in edge[2:]):
+            errors.append(f"La arista #{k+1} debe tener peso y capacidad numéricos no negativos.")
+    return errors
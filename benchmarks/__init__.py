@@ -0,0 +1 @@
+"""Benchmarks reproducibles de los solvers (ver benchmarks/suite.py)."""
@@ -0,0 +1,132 @@
+import numpy as np
+
+# ==========================================
+# GENERADORES DE PROBLEMAS (CON SEMILLA)
+# ==========================================
+# Cada generador recibe el tamaño y una semilla y devuelve el problema en el mismo formato
+# que aceptan las rutas (payload de /solve_linear, /solve_transport o la lista de aristas
+# [u, v, peso, capacidad] de /solve_network). Misma semilla -> mismo problema en cualquier
+# máquina y en cualquier commit, así los tiempos y los valores óptimos son comparables.
+
+# Proporción de restricciones (<=, >=, =) de cada mezcla
+LP_MIXES = {
+    "le": (1.0, 0.0, 0.0),
+    "mixed": (0.5, 0.3, 0.2),
+}
+
+
+def random_lp(num_constraints, num_vars, density=1.0, mix="le", seed=0, sparse_terms=False):
+    """
+    PL de maximización factible y acotado. Se parte de un punto entero x0 >= 0 y cada lado
+    derecho se elige para que x0 cumpla la restricción; la última fila (sum x <= S) acota
+    el objetivo. Con `sparse_terms` las filas van en el formato disperso "terms".
+    """
+    rng = np.random.default_rng(seed)
+    x0 = rng.integers(0, 10, num_vars)
+    signs = rng.choice(["<=", ">=", "="], size=num_constraints - 1, p=LP_MIXES[mix])
+
+    constraints = []
+    for sign in signs:
+        row = rng.integers(1, 10, num_vars) * (rng.random(num_vars) < density)
+        if not row.any():
+            row[rng.integers(num_vars)] = rng.integers(1, 10)
+        activity = int(row @ x0)
+        if sign == "<=":
+            rhs = activity + int(rng.integers(0, 10))
+        elif sign == ">=":
+            rhs = max(activity - int(rng.integers(0, 10)), 0)
+        else:
+            rhs = activity
+        constraints.append(_constraint(row, sign, rhs, sparse_terms))
+
+    # Fila de cierre: todas las variables acotadas, el óptimo es finito
+    constraints.append(_constraint(np.ones(num_vars, dtype=int), "<=", 2 * int(x0.sum()) + num_vars, sparse_terms))
+
+    return {
+        "variables": [f"x{j + 1}" for j in range(num_vars)],
+        "objective_coeffs": rng.integers(1, 20, num_vars).tolist(),
+        "objective": "max",
+        "constraints": constraints,
+    }
+
+def _constraint(row, sign, rhs, sparse_terms):
+    if sparse_terms:
+        return {"terms": [[int(j), int(row[j])] for j in np.flatnonzero(row)], "sign": sign, "rhs": rhs}
+    return {"coeffs": row.tolist(), "sign": sign, "rhs": rhs}
+
+def lp_arrays(payload):
+    """Matrices densas (c, A_ub, b_ub, A_eq, b_eq) del payload, para el SimplexSolver original."""
+    num_vars = len(payload["objective_coeffs"])
+    A_ub, b_ub, A_eq, b_eq = [], [], [], []
+    for constraint in payload["constraints"]:
+        row = np.zeros(num_vars)
+        if "terms" in constraint:
+            for j, value in constraint["terms"]:
+                row[j] = value
+        else:
+            row[:] = constraint["coeffs"]
+        sign, rhs = constraint["sign"], constraint["rhs"]
+        if sign == "=":
+            A_eq.append(row)
+            b_eq.append(rhs)
+        else:
+            A_ub.append(row if sign == "<=" else -row)
+            b_ub.append(rhs if sign == "<=" else -rhs)
+    return (
+        np.array(payload["objective_coeffs"], dtype=float),
+        np.array(A_ub).reshape(-1, num_vars), np.array(b_ub, dtype=float),
+        np.array(A_eq) if A_eq else None, np.array(b_eq, dtype=float) if b_eq else None,
+    )
+
+
+def random_transport(num_origins, num_destinations, balanced=True, seed=0):
+    """
+    Problema de transporte m x n con costos enteros. Balanceado: la demanda total es igual
+    a la oferta total; si no, la demanda es ~80% de la oferta (se agrega un destino ficticio).
+    """
+    rng = np.random.default_rng(seed)
+    supply = rng.integers(10, 100, num_origins)
+    total = int(supply.sum()) if balanced else int(supply.sum() * 0.8)
+    # Reparto multinomial: demandas positivas que suman exactamente `total`
+    demand = rng.multinomial(total - num_destinations, np.full(num_destinations, 1 / num_destinations)) + 1
+    return {
+        "supply": supply.tolist(),
+        "demand": demand.tolist(),
+        "costs": rng.integers(1, 50, (num_origins, num_destinations)).tolist(),
+    }
+
+
+def random_graph(num_nodes, num_edges, seed=0):
+    """
+    Grafo dirigido con nodos 0..n-1 (0 es la fuente y n-1 el sumidero por orden). Un camino
+    aleatorio que visita todos los nodos de 0 a n-1 garantiza la conexión; el resto de las
+    aristas se eligen al azar sin repetir pares.
+    """
+    rng = np.random.default_rng(seed)
+    order = np.concatenate([[0], rng.permutation(np.arange(1, num_nodes - 1)), [num_nodes - 1]])
+    pairs = set(zip(order[:-1].tolist(), order[1:].tolist()))
+
+    target = min(max(num_edges, num_nodes - 1), num_nodes * (num_nodes - 1))
+    while len(pairs) < target:
+        u, v = rng.integers(0, num_nodes, 2).tolist()
+        if u != v:
+            pairs.add((u, v))
+    return _weighted(sorted(pairs), rng)
+
+def grid_graph(rows, cols, seed=0):
+    """Malla rows x cols con aristas hacia la derecha y hacia abajo (de 0 a rows*cols-1)."""
+    rng = np.random.default_rng(seed)
+    pairs = []
+    for i in range(rows):
+        for j in range(cols):
+            node = i * cols + j
+            if j + 1 < cols:
+                pairs.append((node, node + 1))
+            if i + 1 < rows:
+                pairs.append((node, node + cols))
+    return _weighted(pairs, rng)
+
+def _weighted(pairs, rng):
+    weights = rng.integers(1, 20, len(pairs)).tolist()
+    capacities = rng.integers(1, 50, len(pairs)).tolist()
+    return [[u, v, w, cap] for (u, v), w, cap in zip(pairs, weights, capacities)]
@@ -0,0 +1,342 @@
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.algorithms.compiled_graph import compile_graph
+from app.algorithms.linear_programming import SimplexSolver
+from app.algorithms.network_optimization import (
+    dijkstra_algorithm, minimum_spanning_tree, ford_fulkerson_algorithm,
+    min_cost_flow_algorithm, sensitivity_analysis_shortest_path,
+)
+from app.algorithms.network_simplex import transportation_network_simplex
+from app.algorithms.transportation import (
+    balance_transportation_problem, northwest_corner_method, minimum_cost_method,
+    vogel_approximation_method, modi_method,
+)
+from app.models.linear_program import build_linear_solver
+from benchmarks.generators import random_lp, lp_arrays, random_transport, random_graph, grid_graph
+from benchmarks.pivot import random_tableau, row_loop_iteration, kernel_iteration
+
+# ==========================================
+# SUITE DE BENCHMARKS
+# ==========================================
+# Cada caso arma su instancia fuera del tiempo medido (setup) y mide solo la llamada al
+# motor. Se repite `repeat` veces y se guardan mínimo, mediana y media en ms, el estado y
+# el valor óptimo: al comparar dos commits, un cambio de valor delata un error y no una
+# mejora. Los resultados se escriben en JSON (con los metadatos de la corrida) y en CSV.
+#
+#   python -m benchmarks run --preset default --out benchmarks/results/antes
+#   python -m benchmarks compare benchmarks/results/antes.json benchmarks/results/despues.json
+
+# Barridos de tamaño por familia: (restricciones, variables), (orígenes, destinos), nodos,
+# (filas, columnas) del tableau
+PRESETS = {
+    "quick": {
+        "linear": [(10, 10), (20, 20)],
+        "transport": [(5, 5), (10, 10)],
+        "network": [50, 200],
+        "pivot": [(100, 200)],
+    },
+    "default": {
+        "linear": [(10, 10), (25, 25), (50, 50), (100, 100)],
+        "transport": [(10, 10), (25, 25), (50, 50), (100, 100)],
+        "network": [100, 1_000, 5_000],
+        "pivot": [(100, 200), (500, 800)],
+    },
+    "large": {
+        "linear": [(50, 50), (100, 100), (200, 200), (400, 400)],
+        "transport": [(50, 50), (100, 100), (200, 200), (400, 400)],
+        "network": [1_000, 10_000, 50_000],
+        "pivot": [(500, 800), (1_000, 2_000)],
+    },
+}
+
+# Familias de PL: (nombre, densidad, mezcla de signos, filas en formato "terms")
+LP_KINDS = [
+    ("dense-le", 1.0, "le", False),
+    ("dense-mixed", 1.0, "mixed", False),
+    ("sparse-mixed", 0.1, "mixed", True),
+]
+LP_V1_METHODS = ("simplex", "two_phase", "big_m")
+LP_V2_METHODS = ("simplex", "two_phase", "big_m", "revised")
+
+EDGES_PER_NODE = 4  # densidad de los grafos aleatorios
+PIVOT_STEPS = 20  # iteraciones de tableau por medición (la mediana se divide por esto)
+
+CSV_FIELDS = ["family", "engine", "instance", "size", "repeats", "min_ms", "median_ms", "mean_ms",
+              "status", "iterations", "value"]
+
+
+def _case(family, engine, instance, size, setup, run, value):
+    return {"family": family, "engine": engine, "instance": instance, "size": size,
+            "setup": setup, "run": run, "value": value}
+
+def _lp_value(result):
+    return result.get("objective_value") if isinstance(result, dict) else None
+
+def linear_cases(sizes, seed):
+    for kind, density, mix, sparse_terms in LP_KINDS:
+        for rows, cols in sizes:
+            payload = random_lp(rows, cols, density, mix, seed, sparse_terms)
+            instance = f"{kind} {rows}x{cols}"
+            arrays = lp_arrays(payload)
+
+            for method in LP_V1_METHODS:
+                yield _case(
+                    "linear", f"SimplexSolver.{method}", instance, rows * cols,
+                    lambda arrays=arrays: SimplexSolver(*arrays),
+                    lambda solver, method=method: getattr(solver, f"solve_{method}")(),
+                    _lp_value,
+                )
+            # Con filas "terms" el modelo es CSR y SimplexSolverV2 siempre usa el revisado
+            for method in ("revised",) if sparse_terms else LP_V2_METHODS:
+                yield _case(
+                    "linear", f"SimplexSolverV2.{method}", instance, rows * cols,
+                    lambda payload=payload: build_linear_solver(payload),
+                    lambda solver, method=method: solver.solve(method),
+                    _lp_value,
+                )
+
+def _balanced(payload):
+    costs = np.array(payload["costs"], dtype=float)
+    return balance_transportation_problem(list(payload["supply"]), list(payload["demand"]), costs)
+
+def _cost(allocation, costs):
+    return float(np.sum(np.asarray(allocation, dtype=float) * costs))
+
+def transport_cases(sizes, seed):
+    initial_methods = [
+        ("northwest", lambda supply, demand, costs: northwest_corner_method(supply, demand)),
+        ("minimum_cost", minimum_cost_method),
+        ("vogel", vogel_approximation_method),
+    ]
+    for balanced in (True, False):
+        for rows, cols in sizes:
+            payload = random_transport(rows, cols, balanced, seed)
+            instance = f"{'balanced' if balanced else 'unbalanced'} {rows}x{cols}"
+            args = _balanced(payload)
+            costs = args[2]
+
+            for name, method in initial_methods:
+                yield _case(
+                    "transport", name, instance, rows * cols,
+                    lambda args=args: args,
+                    lambda args, method=method: method(*args),
+                    lambda allocation, costs=costs: _cost(allocation, costs),
+                )
+                # MODI desde cada solución inicial (la inicial se calcula en el setup)
+                yield _case(
+                    "transport", f"modi({name})", instance, rows * cols,
+                    lambda args=args, method=method: (method(*args), args[2]),
+                    lambda args: modi_method(*args),
+                    lambda result: float(result[1]),
+                )
+            yield _case(
+                "transport", "network_simplex", instance, rows * cols,
+                lambda args=args: args,
+                lambda args: transportation_network_simplex(*args),
+                lambda result: float(result[2]),
+            )
+
+def network_cases(sizes, seed):
+    for num_nodes in sizes:
+        side = max(int(round(num_nodes ** 0.5)), 2)
+        graphs = [
+            (f"random {num_nodes}n", random_graph(num_nodes, EDGES_PER_NODE * num_nodes, seed)),
+            (f"grid {side}x{side}", grid_graph(side, side, seed)),
+        ]
+        for instance, edges in graphs:
+            # Los motores reciben el grafo ya compilado (una sola vez, fuera de la medición);
+            # compile_graph mide justamente esa compilación a partir de la lista de aristas
+            compiled = compile_graph(edges)
+            cases = [
+                ("compile_graph", compile_graph, None),
+                ("dijkstra", lambda g: dijkstra_algorithm(g, g.source), lambda result: result["total_weight"]),
+                ("kruskal", minimum_spanning_tree, lambda result: result["total_weight"]),
+                ("max_flow.dinic", lambda g: ford_fulkerson_algorithm(g, g.source, g.sink, "dinic"),
+                 lambda result: result["max_flow"]),
+                ("max_flow.push_relabel", lambda g: ford_fulkerson_algorithm(g, g.source, g.sink, "push_relabel"),
+                 lambda result: result["max_flow"]),
+                ("max_flow.edmonds_karp", lambda g: ford_fulkerson_algorithm(g, g.source, g.sink, "edmonds_karp"),
+                 lambda result: result["max_flow"]),
+                ("min_cost_flow", lambda g: min_cost_flow_algorithm(g, g.source, g.sink),
+                 lambda result: result.get("min_cost")),
+                ("sensitivity.shortest_path", lambda g: sensitivity_analysis_shortest_path(g, g.source, g.sink),
+                 lambda result: float(sum(v for v in result.values() if isinstance(v, (int, float))))),
+            ]
+            for engine, run, value in cases:
+                setup = (lambda edges=edges: edges) if engine == "compile_graph" else (lambda g=compiled: g)
+                yield _case("network", engine, instance, len(edges), setup, run, value)
+
+def pivot_cases(sizes, seed):
+    # Pivote aislado con el bucle por filas anterior y con el núcleo compartido (ver
+    # benchmarks/pivot.py, que además lo mide dentro de SimplexSolverV2)
+    for rows, cols in sizes:
+        for engine, step in (("pivot.row_loop", row_loop_iteration), ("pivot.kernel", kernel_iteration)):
+            yield _case(
+                "pivot", engine, f"{rows}x{cols} x{PIVOT_STEPS}", rows * cols,
+                lambda rows=rows, cols=cols: random_tableau(rows, cols, seed),
+                lambda tableau, step=step: [step(tableau, k) for k in range(PIVOT_STEPS)],
+                None,
+            )
+
+FAMILIES = {"linear": linear_cases, "transport": transport_cases, "network": network_cases, "pivot": pivot_cases}
+
+
+def _status(result):
+    if isinstance(result, dict):
+        return str(result.get("status", "ok"))
+    if isinstance(result, tuple) and isinstance(result[0], str):
+        return result[0]  # (estado, asignación, costo) del simplex de redes
+    return "ok"
+
+def _iterations(result, state):
+    if isinstance(result, dict) and "iterations" in result:
+        return result["iterations"]
+    return getattr(state, "iterations", None)
+
+def run_case(case, repeat, budget):
+    """Mide `case` hasta `repeat` veces (o hasta agotar `budget` segundos, mínimo una)."""
+    times = []
+    result = state = None
+    error = None
+    started = time.perf_counter()
+    while len(times) < repeat:
+        state = case["setup"]()
+        gc.collect()
+        t0 = time.perf_counter()
+        try:
+            result = case["run"](state)
+        except Exception as e:
+            error = f"error: {type(e).__name__}: {e}"
+            break
+        times.append(time.perf_counter() - t0)
+        if time.perf_counter() - started > budget:
+            break
+
+    row = {key: case[key] for key in ("family", "engine", "instance", "size")}
+    if error is not None:
+        return {**row, "repeats": len(times), "min_ms": None, "median_ms": None, "mean_ms": None,
+                "status": error, "iterations": None, "value": None}
+
+    value = case["value"](result) if case["value"] is not None else None
+    return {
+        **row,
+        "repeats": len(times),
+        "min_ms": round(min(times) * 1000, 4),
+        "median_ms": round(statistics.median(times) * 1000, 4),
+        "mean_ms": round(statistics.fmean(times) * 1000, 4),
+        "status": _status(result),
+        "iterations": _iterations(result, state),
+        "value": round(float(value), 6) if value is not None else None,
+    }
+
+def _git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True)
+        return commit.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(preset="default", families=None, engines=None, repeat=5, seed=0, budget=10.0, log=print):
+    """Ejecuta la suite y devuelve {"meta": ..., "results": [...]} listo para JSON."""
+    sizes = PRESETS[preset]
+    results = []
+    for family in families or list(FAMILIES):
+        for case in FAMILIES[family](sizes[family], seed):
+            if engines and not any(pattern in case["engine"] for pattern in engines):
+                continue
+            row = run_case(case, repeat, budget)
+            log(f"{row['family']:<9} {row['engine']:<28} {row['instance']:<22} "
+                f"{row['median_ms'] if row['median_ms'] is not None else '-':>12} ms  {row['status']}")
+            results.append(row)
+
+    meta = {
+        "commit": _git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "preset": preset,
+        "seed": seed,
+        "repeat": repeat,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+    return {"meta": meta, "results": results}
+
+def write_results(report, out):
+    """Escribe `out`.json y `out`.csv (crea la carpeta si hace falta)."""
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(f"{out}.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    with open(f"{out}.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(report["results"])
+
+
+def compare(baseline_path, candidate_path, log=print):
+    """
+    Compara dos corridas por (familia, motor, instancia): mediana antes/después, cociente
+    y si el valor óptimo cambió. Devuelve la cantidad de casos con valor distinto.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(candidate_path, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    def key(row):
+        return row["family"], row["engine"], row["instance"]
+
+    before = {key(row): row for row in baseline["results"]}
+    log(f"{baseline['meta'].get('commit')} -> {candidate['meta'].get('commit')}")
+    mismatches = 0
+    for row in candidate["results"]:
+        old = before.get(key(row))
+        if old is None or old["median_ms"] is None or row["median_ms"] is None:
+            continue
+        speedup = old["median_ms"] / row["median_ms"] if row["median_ms"] else float("inf")
+        changed = old["value"] is not None and row["value"] is not None and \
+            abs(old["value"] - row["value"]) > 1e-6 * (1.0 + abs(old["value"]))
+        mismatches += changed
+        log(f"{row['engine']:<28} {row['instance']:<22} {old['median_ms']:>11.3f} -> {row['median_ms']:>11.3f} ms "
+            f"x{speedup:6.2f}{'  VALOR DISTINTO' if changed else ''}")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks de los solvers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Ejecuta la suite y guarda JSON y CSV")
+    run.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    run.add_argument("--family", action="append", choices=sorted(FAMILIES), help="Repetible; por defecto todas")
+    run.add_argument("--engine", action="append", help="Solo motores cuyo nombre contenga este texto (repetible)")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--budget", type=float, default=10.0, help="Segundos máximos por caso")
+    run.add_argument("--out", help="Ruta sin extensión (por defecto benchmarks/results/<commit>-<preset>)")
+
+    cmp = commands.add_parser("compare", help="Compara dos corridas (JSON)")
+    cmp.add_argument("baseline")
+    cmp.add_argument("candidate")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return 1 if compare(args.baseline, args.candidate) else 0
+
+    report = run_suite(args.preset, args.family, args.engine, args.repeat, args.seed, args.budget)
+    out = args.out or os.path.join("benchmarks", "results", f"{report['meta']['commit'] or 'local'}-{args.preset}")
+    write_results(report, out)
+    print(f"Resultados en {out}.json y {out}.csv")
+    return 0
@@ -1,6 +1,7 @@
 "use client";
 import React, { useState } from "react";
 import { solveLinear } from "../services/linearService";
+import { followAnalysis, backendUrl } from "../services/api";
 import { useRouter } from "next/navigation";
 import "bootstrap/dist/css/bootstrap.min.css";
 import { Spinner } from "react-bootstrap";
@@ -98,6 +99,11 @@ export default function LinearPage({ onResult, isModule }) {
       console.log("📥 Recibido del backend:", result);
 
       setSolution(result);
+      if (result?.analysis_job && !result.intelligent_analysis) {
+        followAnalysis(result.analysis_job, (text) =>
+          setSolution((prev) => prev && { ...prev, intelligent_analysis: text })
+        );
+      }
 
       if (onResult) {
         const objValue = getSolutionValue(result, "objective_value");
@@ -151,6 +157,7 @@ export default function LinearPage({ onResult, isModule }) {
                 <option value="simplex">Simplex</option>
                 <option value="graphical">Gráfico</option>
                 <option value="m_big">Gran M</option>
+                <option value="revised">Simplex Revisado (LU)</option>
               </select>
             </div>
             <div className="col-md-3">
@@ -315,7 +322,7 @@ export default function LinearPage({ onResult, isModule }) {
             </div>
 
             {/* ⭐ GRÁFICO */}
-            {solution.graph_image && (
+            {solution.solution?.graph && (
               <div className="card border-0 shadow-sm mt-4 text-center">
                 <div className="card-header bg-white border-0">
                   <h5 className="text-primary fw-bold mb-0">
@@ -324,7 +331,7 @@ export default function LinearPage({ onResult, isModule }) {
                 </div>
                 <div className="card-body">
                   <img
-                    src={solution.graph_image}
+                    src={backendUrl(solution.solution.graph)}
                     alt="Gráfico del método gráfico"
                     className="img-fluid rounded border"
                     style={{ maxHeight: "500px", maxWidth: "100%" }}
@@ -2,6 +2,7 @@
 import { useState } from "react";
 import { useRouter } from "next/navigation";
 import { solveNetwork } from "../services/networkService";
+import { followAnalysis } from "../services/api";
 import "bootstrap/dist/css/bootstrap.min.css";
 import { Spinner, Badge, Card, Row, Col, Alert, Tabs, Tab, Table } from "react-bootstrap";
 import styles from "./modules.module.css";
@@ -43,6 +44,11 @@ export default function NetworkPage({ onResult, isModule }) {
     try {
       const result = await solveNetwork({ graph });
       setSolution(result);
+      if (result?.analysis_job && !result.intelligent_analysis) {
+        followAnalysis(result.analysis_job, (text) =>
+          setSolution((prev) => prev && { ...prev, intelligent_analysis: text })
+        );
+      }
 
       if (onResult) {
         onResult({
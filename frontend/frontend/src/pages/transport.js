@@ -2,6 +2,7 @@
 import { useState } from "react";
 import { useRouter } from "next/navigation";
 import { solveTransport } from "../services/transportService";
+import { followAnalysis } from "../services/api";
 import "bootstrap/dist/css/bootstrap.min.css";
 import { Spinner } from "react-bootstrap";
 import styles from "./modules.module.css";
@@ -41,6 +42,11 @@ export default function TransportPage({ onResult, isModule }) {
     try {
       const result = await solveTransport(requestData);
       setSolution(result);
+      if (result?.analysis_job && !result.sensitivity_analysis) {
+        followAnalysis(result.analysis_job, (text) =>
+          setSolution((prev) => prev && { ...prev, sensitivity_analysis: text })
+        );
+      }
       if (onResult && result?.status === "success") {
         onResult({
           costoTotal: result.total_cost,
@@ -107,6 +113,7 @@ export default function TransportPage({ onResult, isModule }) {
                 <option value="northwest">Noroeste</option>
                 <option value="minimum_cost">Costo Mínimo</option>
                 <option value="vogel">Vogel</option>
+                <option value="network_simplex">Simplex de Redes</option>
               </select>
             </div>
           </div>
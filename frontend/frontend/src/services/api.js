@@ -2,7 +2,29 @@ import axios from "axios";
 
 const API_URL = "http://127.0.0.1:8000/api";  // Cambia esto si tu backend está en otro host
 
+// Las rutas que devuelve el backend (p. ej. "/api/images/{id}") son absolutas respecto de
+// su origen: se resuelven contra el mismo host que API_URL.
+export const backendUrl = (path) => new URL(path, API_URL).href;
+
 export const api = axios.create({
   baseURL: API_URL,
   headers: { "Content-Type": "application/json" },
 });
+
+// El análisis con IA se genera en segundo plano: la respuesta de resolución trae
+// `analysis_job` y el texto llega por Server-Sent Events a medida que se genera.
+export const followAnalysis = (jobId, onText) => {
+  const source = new EventSource(`${API_URL}/analysis/${jobId}/stream`);
+  let text = "";
+  source.addEventListener("chunk", (event) => {
+    text += JSON.parse(event.data);
+    onText(text);
+  });
+  source.addEventListener("done", (event) => {
+    const job = JSON.parse(event.data);
+    onText(job.analysis ?? job.error ?? text);
+    source.close();
+  });
+  source.onerror = () => source.close();
+  return () => source.close();
+};
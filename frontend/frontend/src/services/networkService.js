@@ -2,7 +2,7 @@ import axios from "axios";
 
 export const solveNetwork = async (data) => {
   try {
-    const response = await axios.post("http://127.0.0.1:8000/api/solve_network", data);
+    const response = await axios.post("http://127.0.0.1:8000/api/solve_network?render=true", data);
 
     return response.data;
   } catch (error) {
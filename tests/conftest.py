@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+# Sin proveedor real de narración: los endpoints no deben salir a la red durante las pruebas
+os.environ.setdefault("NARRATION_PROVIDER", "stub")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Con el bloque with corre el lifespan de la app (pools, limpieza de imágenes, narración)
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,30 @@
+from benchmarks.suite import compare, run_suite, write_results
+
+
+def _values(family, is_exact):
+    """Valores por instancia de los motores exactos de una familia (preset quick, una repetición)."""
+    report = run_suite("quick", families=[family], repeat=1, budget=1.0, log=lambda line: None)
+    values = {}
+    for row in report["results"]:
+        assert not row["status"].startswith("error"), row
+        if is_exact(row["engine"]):
+            values.setdefault(row["instance"], set()).add(row["value"])
+    return values
+
+def test_quick_transport_optimal_engines_agree():
+    # MODI desde cualquier solución inicial y el simplex de redes llegan al mismo costo
+    values = _values("transport", lambda engine: engine.startswith("modi") or engine == "network_simplex")
+    assert len(values) == 4 and all(len(found) == 1 for found in values.values())
+
+def test_quick_max_flow_engines_agree():
+    values = _values("network", lambda engine: engine.startswith("max_flow."))
+    assert len(values) == 4 and all(len(found) == 1 for found in values.values())
+
+def test_compare_flags_changed_values(tmp_path):
+    report = run_suite("quick", families=["transport"], engines=["vogel"], repeat=1, log=lambda line: None)
+    write_results(report, str(tmp_path / "antes"))
+    assert compare(tmp_path / "antes.json", tmp_path / "antes.json", log=lambda line: None) == 0
+
+    report["results"][0]["value"] += 1
+    write_results(report, str(tmp_path / "despues"))
+    assert compare(tmp_path / "antes.json", tmp_path / "despues.json", log=lambda line: None) == 1
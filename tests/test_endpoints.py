@@ -0,0 +1,171 @@
+import json
+import time
+
+from app.routes import linear_solver
+from app.services import profiles
+from app.services.execution import POOLS
+from app.services.result_cache import CACHES
+from benchmarks.generators import random_lp
+
+
+def _slow_solve(data):
+    """Reemplazo de _solve_with_sensitivity que no termina dentro del timeout (corre en el worker)."""
+    time.sleep(30)
+
+def _graphical_problem():
+    return {
+        "variables": ["x1", "x2"],
+        "objective_coeffs": [3, 5],
+        "objective": "max",
+        "method": "graphical",
+        "constraints": [
+            {"coeffs": [1, 0], "sign": "<=", "rhs": 4},
+            {"coeffs": [0, 2], "sign": "<=", "rhs": 12},
+            {"coeffs": [3, 2], "sign": "<=", "rhs": 18},
+        ],
+    }
+
+def test_full_queue_returns_503_with_retry_after(client, monkeypatch):
+    pool = POOLS["linear"]
+    monkeypatch.setattr(pool, "running", pool.workers)
+    monkeypatch.setattr(pool, "max_queue", 0)
+    response = client.post("/api/solve_linear", json=random_lp(6, 4, seed=503))
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) > 0
+
+def test_timeout_returns_504(client, monkeypatch):
+    monkeypatch.setattr(linear_solver, "_solve_with_sensitivity", _slow_solve)
+    monkeypatch.setattr(POOLS["linear"], "timeout", 1.0)
+    start = time.perf_counter()
+    response = client.post("/api/solve_linear", json=random_lp(6, 4, seed=504))
+    assert response.status_code == 504
+    assert time.perf_counter() - start < 20
+    assert POOLS["linear"].running == 0
+
+def test_repeated_problem_is_a_cache_hit(client):
+    problem = {**random_lp(8, 5, mix="mixed", seed=7), "method": "revised"}
+    hits = CACHES["linear"].hits
+    first = client.post("/api/solve_linear", json=problem)
+    assert first.status_code == 200
+    assert CACHES["linear"].hits == hits
+
+    second = client.post("/api/solve_linear", json=problem)
+    assert second.status_code == 200
+    assert CACHES["linear"].hits == hits + 1
+    assert second.json()["solution"] == first.json()["solution"]
+    assert client.get("/api/cache/stats").json()["linear"]["hits"] == hits + 1
+
+def test_batch_streams_one_line_per_problem(client):
+    problems = [{**random_lp(6, 4, mix="mixed", seed=seed), "method": "revised"} for seed in range(4)]
+    problems.append({"objective": "max"})
+    response = client.post("/api/solve_linear/batch", json={"problems": problems})
+    assert response.status_code == 200
+    lines = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+    assert sorted(lines) == list(range(5))
+    assert lines[4]["error"]
+    assert all(lines[i]["solution"]["status"] == "Optimal" for i in range(4))
+
+def test_graphical_image_etag_and_304(client):
+    response = client.post("/api/solve_linear", json=_graphical_problem())
+    assert response.status_code == 200
+    url = response.json()["solution"]["graph"]
+    assert url.startswith("/api/images/")
+
+    image = client.get(url)
+    assert image.status_code == 200
+    assert image.headers["content-type"].startswith("image/")
+    etag = image.headers["ETag"]
+    assert etag == f'"{url.rsplit("/", 1)[-1]}"'
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    assert client.get("/api/images/" + "0" * 64).status_code == 404
+
+def test_network_images_are_rendered_on_demand(client):
+    graph = [["A", "B", 4, 10], ["A", "C", 2, 5], ["C", "B", 1, 5], ["B", "D", 3, 8]]
+    result = client.post("/api/solve_network", json={"graph": graph}).json()
+    assert "graph_image" not in result["shortest_path"]
+
+    rendered = client.get(f"/api/render/{result['result_id']}").json()
+    assert set(rendered["images"]) == {"shortest_path", "mst", "max_flow"}
+    image = client.get(f"/api/render/{result['result_id']}/mst", params={"format": "svg", "thumbnail": True})
+    assert image.headers["content-type"].startswith("image/svg+xml")
+    assert image.content.lstrip().startswith(b"<?xml")
+    assert client.get("/api/render/" + "0" * 64).status_code == 404
+
+def test_transport_narration_runs_in_background(client):
+    problem = {"supply": [20, 30], "demand": [25, 25], "costs": [[4, 6], [5, 3]], "method": "vogel"}
+    response = client.post("/api/solve_transport", json=problem).json()
+    assert response["status"] == "success"
+    assert response["analysis_url"] == f"/api/analysis/{response['analysis_job']}"
+
+    for _ in range(100):
+        analysis = client.get(response["analysis_url"]).json()
+        if analysis["status"] != "pending":
+            break
+        time.sleep(0.05)
+    assert analysis["status"] == "done"
+    assert analysis["analysis"].startswith("[CRÍTICO]")
+
+def test_linear_trace_lists_revised_pivots(client):
+    problem = {**random_lp(8, 5, mix="mixed", seed=21), "method": "revised"}
+    response = client.post("/api/solve_linear", params={"trace": True}, json=problem)
+    assert response.status_code == 200
+    body = response.json()
+    pivots = [event for event in body["trace"]["events"] if event["event"] == "revised.pivot"]
+    assert pivots and body["trace"]["dropped"] == 0
+    assert [event["iteration"] for event in pivots] == sorted(event["iteration"] for event in pivots)
+
+def _revised_calls(client):
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith('solver_calls_total{algorithm="simplex.revised",status="ok"}'):
+            return int(line.split()[-1])
+    return 0
+
+def test_metrics_count_solves_from_the_workers(client):
+    before = _revised_calls(client)
+    problem = {**random_lp(9, 6, mix="mixed", seed=22), "method": "revised"}
+    assert client.post("/api/solve_linear", json=problem).status_code == 200
+    assert _revised_calls(client) == before + 1
+    assert 'solver_duration_seconds_count{algorithm="simplex.revised"}' in client.get("/metrics").text
+
+def test_invalid_transport_problem_returns_400(client):
+    response = client.post("/api/solve_transport", json={
+        "supply": [10, -5], "demand": [5, 10], "costs": [[1, 2], [3, 4]], "method": "northwest",
+    })
+    assert response.status_code == 400
+    response = client.post("/api/solve_transport", json={
+        "supply": [10, 5], "demand": [5, 10], "costs": [[1, 2]], "method": "northwest",
+    })
+    assert response.status_code == 400
+
+def test_transport_timings_include_validation(client):
+    problem = {"supply": [20, 30], "demand": [25, 25], "costs": [[4, 6], [5, 3]], "method": "vogel"}
+    response = client.post("/api/solve_transport?timings=true", json=problem)
+    assert response.status_code == 200
+    assert "validation" in response.json()["timings"]
+    assert "validation;dur=" in response.headers["Server-Timing"]
+
+def test_invalid_network_problem_returns_400(client):
+    response = client.post("/api/solve_network", json={"graph": [["A", "B", -3]], "algorithm": "dinic"})
+    assert response.status_code == 400
+    response = client.post("/api/solve_network", json={"graph": [["A", "B", 3]], "algorithm": "simplex"})
+    assert response.status_code == 400
+
+def test_profile_requires_token_and_returns_stacks(client, monkeypatch):
+    monkeypatch.setattr(profiles, "PROFILE_TOKEN", "secreto")
+    problem = {**random_lp(30, 20, mix="mixed", seed=25), "method": "revised"}
+    assert client.post("/api/solve_linear?profile=true", json=problem).status_code == 403
+
+    headers = {"X-Profile-Token": "secreto"}
+    response = client.post("/api/solve_linear?profile=true", json=problem, headers=headers)
+    assert response.status_code == 200
+    profile = response.json()["profile"]
+    assert profile["samples"] >= 0 and profile["wall_ms"] > 0
+
+    stacks = client.get(profile["url"], headers=headers)
+    assert stacks.status_code == 200
+    assert client.get(profile["url"]).status_code == 403
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from app.algorithms.graphical_2d import solve_lp_2d
+
+
+def _ge(coeffs, rhs):
+    return {"coeffs": coeffs, "sign": ">=", "rhs": rhs}
+
+@pytest.mark.parametrize("c, constraints, expected", [
+    # Regresiones: la tolerancia de empate no debe depender de los vértices de la caja
+    ([1, 1.001], [_ge([1, 1], 100)], 100.0),
+    ([13, 19], [_ge([5, 7], 1189), _ge([8, 4], 1859)], 3091.4),
+])
+def test_minimization_with_ge_constraints(c, constraints, expected):
+    result = solve_lp_2d(c, constraints, maximize=False)
+    assert result["status"] == "Optimal"
+    assert result["objective_value"] == pytest.approx(expected, rel=1e-9)
+
+def test_unbounded_and_infeasible():
+    assert solve_lp_2d([1, 1], [_ge([1, 1], 1)], maximize=True)["status"] == "Unbounded"
+    infeasible = [{"coeffs": [1, 1], "sign": "<=", "rhs": 1}, _ge([1, 1], 2)]
+    assert solve_lp_2d([1, 1], infeasible)["status"] == "Infeasible"
+
+def test_equality_constraint_on_a_line():
+    result = solve_lp_2d([3, 2], [{"coeffs": [1, 1], "sign": "=", "rhs": 4}], maximize=True)
+    assert result["status"] == "Optimal"
+    assert result["objective_value"] == pytest.approx(12.0)
+
+def test_random_instances_match_linprog():
+    rng = np.random.default_rng(19)
+    statuses = {0: "Optimal", 2: "Infeasible", 3: "Unbounded"}
+    for _ in range(500):
+        m = int(rng.integers(1, 5))
+        A = rng.integers(-3, 10, (m, 2))
+        b = rng.integers(0, 2000, m)
+        signs = rng.choice(["<=", ">="], m)
+        c = rng.integers(-5, 20, 2)
+        maximize = bool(rng.integers(2))
+        constraints = [{"coeffs": A[i].tolist(), "sign": signs[i], "rhs": int(b[i])} for i in range(m)]
+
+        flip = np.where(signs == "<=", 1, -1)
+        reference = linprog(-c if maximize else c, A_ub=A * flip[:, None], b_ub=b * flip)
+        result = solve_lp_2d(c, constraints, maximize=maximize)
+
+        assert result["status"] == statuses[reference.status]
+        if reference.status == 0:
+            expected = -reference.fun if maximize else reference.fun
+            assert result["objective_value"] == pytest.approx(expected, rel=1e-7, abs=1e-7)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from app.algorithms.linear_programming_v2 import SimplexSolverV2
+from app.models.linear_program import build_linear_solver
+from benchmarks.generators import random_lp, lp_arrays
+
+
+def _reference(payload):
+    """Óptimo de scipy (linprog minimiza: se cambia el signo en maximización)."""
+    c, A_ub, b_ub, A_eq, b_eq = lp_arrays(payload)
+    sign = -1.0 if payload["objective"] == "max" else 1.0
+    result = linprog(sign * c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, method="highs")
+    assert result.status == 0
+    return sign * result.fun
+
+def _check(payload, result):
+    c = lp_arrays(payload)[0]
+    expected = _reference(payload)
+    assert result["status"] == "Optimal"
+    assert result["objective_value"] == pytest.approx(expected, rel=1e-6, abs=1e-3)
+    x = [result["variable_values"][f"x{j + 1}"] for j in range(len(c))]
+    assert float(c @ x) == pytest.approx(expected, rel=1e-6, abs=1e-2)
+
+@pytest.mark.parametrize("mix", ["le", "mixed"])
+@pytest.mark.parametrize("sparse_terms", [False, True])
+def test_revised_matches_linprog(mix, sparse_terms):
+    for seed in range(15):
+        payload = random_lp(12, 9, density=0.6, mix=mix, seed=seed, sparse_terms=sparse_terms)
+        _check(payload, build_linear_solver(payload).solve("revised"))
+
+@pytest.mark.parametrize("method", ["simplex", "two_phase", "big_m"])
+def test_tableau_methods_match_linprog(method):
+    # Solo restricciones <=: el origen es factible y los tres métodos parten de la misma base
+    for seed in range(15):
+        payload = random_lp(10, 8, density=0.7, mix="le", seed=seed)
+        _check(payload, build_linear_solver(payload).solve(method))
+
+def test_minimization_matches_linprog():
+    for seed in range(10):
+        payload = random_lp(10, 6, density=0.8, mix="mixed", seed=100 + seed)
+        payload["objective"] = "min"
+        _check(payload, build_linear_solver(payload).solve("revised"))
+
+def test_revised_reports_iteration_limit():
+    payload = random_lp(15, 10, density=0.6, mix="mixed", seed=1)
+    for max_iter in (2, 8):
+        result = build_linear_solver(payload).solve_revised(max_iter=max_iter)
+        assert result["status"] == "IterationLimit"
+        assert result["iterations"] == max_iter
+
+def test_warm_start_after_cost_changes():
+    # La base anterior sigue siendo primal factible: Fase II directa desde ella
+    for seed in range(10):
+        payload = random_lp(15, 10, density=0.6, mix="mixed", seed=200 + seed)
+        base = build_linear_solver(payload)
+        assert base.solve("revised")["status"] == "Optimal"
+        costs = dict(payload, objective_coeffs=[v + (j % 3) for j, v in enumerate(payload["objective_coeffs"])])
+        _check(costs, build_linear_solver(costs).solve("revised", warm_start=base.export_basis()))
+
+def _tightened(payload, seed):
+    """Mismo PL con cada lado derecho recortado al azar: la base anterior deja de ser factible."""
+    rng = np.random.default_rng(seed)
+    return dict(payload, constraints=[dict(c, rhs=int(c["rhs"] * rng.uniform(0.3, 1.0))) for c in payload["constraints"]])
+
+def test_warm_start_after_rhs_changes_runs_dual_simplex(monkeypatch):
+    dual_runs = []
+    dual_simplex = SimplexSolverV2._dual_simplex
+    monkeypatch.setattr(SimplexSolverV2, "_dual_simplex",
+                        lambda self, *args: dual_runs.append(dual_simplex(self, *args)) or dual_runs[-1])
+    for seed in range(10):
+        payload = random_lp(15, 10, density=0.6, mix="le", seed=200 + seed)
+        base = build_linear_solver(payload)
+        assert base.solve("revised")["status"] == "Optimal"
+        rhs = _tightened(payload, seed)
+        _check(rhs, build_linear_solver(rhs).solve("revised", warm_start=base.export_basis()))
+    assert dual_runs and set(dual_runs) == {"Optimal"}
+
+def test_dual_simplex_reports_iteration_limit():
+    payload = random_lp(15, 10, density=0.6, mix="le", seed=203)
+    base = build_linear_solver(payload)
+    base.solve("revised")
+    result = build_linear_solver(_tightened(payload, 3)).solve_revised(warm_start=base.export_basis(), max_iter=0)
+    assert result["status"] == "IterationLimit"
@@ -0,0 +1,95 @@
+import networkx as nx
+import pytest
+
+from app.algorithms.compiled_graph import compile_graph
+from app.algorithms.network_optimization import (
+    dijkstra_algorithm,
+    ford_fulkerson_algorithm,
+    min_cost_flow_algorithm,
+    minimum_spanning_tree,
+    sensitivity_analysis_shortest_path,
+)
+from benchmarks.generators import random_graph, grid_graph
+
+GRAPHS = [random_graph(40, 160, seed=seed) for seed in range(6)] + [grid_graph(6, 7, seed=1)]
+
+
+def _digraph(edges):
+    graph = nx.DiGraph()
+    for u, v, w, cap in edges:
+        graph.add_edge(u, v, weight=w, capacity=cap)
+    return graph
+
+def _ends(edges):
+    nodes = {node for edge in edges for node in edge[:2]}
+    return min(nodes), max(nodes)
+
+@pytest.mark.parametrize("algorithm", ["dinic", "push_relabel", "edmonds_karp"])
+@pytest.mark.parametrize("edges", GRAPHS)
+def test_max_flow_matches_networkx(algorithm, edges):
+    source, sink = _ends(edges)
+    result = ford_fulkerson_algorithm(edges, source, sink, algorithm=algorithm)
+    assert result["max_flow"] == pytest.approx(nx.maximum_flow_value(_digraph(edges), source, sink))
+
+    # Flujo válido: capacidades y conservación en los nodos intermedios
+    balance = {}
+    for flow in result["flows"]:
+        assert -1e-9 <= flow["flow"] <= flow["capacity"] + 1e-9
+        balance[flow["from"]] = balance.get(flow["from"], 0) - flow["flow"]
+        balance[flow["to"]] = balance.get(flow["to"], 0) + flow["flow"]
+    assert all(abs(value) < 1e-9 for node, value in balance.items() if node not in (source, sink))
+
+@pytest.mark.parametrize("edges", GRAPHS)
+def test_min_cost_flow_matches_networkx(edges):
+    source, sink = _ends(edges)
+    graph = _digraph(edges)
+    flow = nx.max_flow_min_cost(graph, source, sink)
+    result = min_cost_flow_algorithm(edges, source, sink)
+    assert result["status"] == "Optimal"
+    assert result["total_flow"] == pytest.approx(nx.maximum_flow_value(graph, source, sink))
+    assert result["min_cost"] == pytest.approx(nx.cost_of_flow(graph, flow))
+
+@pytest.mark.parametrize("edges", GRAPHS)
+def test_dijkstra_matches_networkx(edges):
+    source, _ = _ends(edges)
+    distances = nx.single_source_dijkstra_path_length(_digraph(edges), source)
+    result = dijkstra_algorithm(edges, source)
+    assert result["total_weight"] == pytest.approx(max(distances.values()))
+    assert result["node_order"][0] == source
+
+@pytest.mark.parametrize("edges", GRAPHS)
+def test_minimum_spanning_tree_matches_networkx(edges):
+    graph = nx.MultiGraph()
+    graph.add_weighted_edges_from((u, v, w) for u, v, w, _ in edges)
+    expected = nx.minimum_spanning_tree(graph).size(weight="weight")
+    result = minimum_spanning_tree(edges)
+    assert result["total_weight"] == pytest.approx(expected)
+    assert len(result["edges"]) == graph.number_of_nodes() - 1
+
+@pytest.mark.parametrize("edges", GRAPHS)
+def test_shortest_path_sensitivity_matches_edge_removal(edges):
+    # Cada arista se compara con quitarla del grafo y volver a resolver con networkx
+    source, sink = _ends(edges)
+    graph = _digraph(edges)
+    base = nx.shortest_path_length(graph, source, sink, weight="weight")
+    result = sensitivity_analysis_shortest_path(edges, source, sink)
+    assert len(result) == len(edges)
+    for u, v, _, _ in edges:
+        reduced = graph.copy()
+        reduced.remove_edge(u, v)
+        try:
+            expected = nx.shortest_path_length(reduced, source, sink, weight="weight") - base
+        except nx.NetworkXNoPath:
+            expected = "Ruta se vuelve imposible"
+        impact = result[f"{u} -> {v}"]
+        if isinstance(expected, str):
+            assert impact == expected
+        else:
+            assert impact == pytest.approx(expected)
+
+def test_compiled_graph_is_shared_and_keeps_name_order():
+    g = compile_graph([["B", "C", 2, 5], ["A", "B", 1, 5], ["A", "C", 4, 1]])
+    assert compile_graph(g) is g
+    assert (g.source, g.sink) == ("A", "C")
+    for algorithm in ("dinic", "push_relabel", "edmonds_karp"):
+        assert ford_fulkerson_algorithm(g, algorithm=algorithm)["max_flow"] == 6
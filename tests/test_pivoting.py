@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from app.algorithms.pivoting import as_tableau, pivot_inplace, min_ratio_row
+
+
+def _reference_pivot(tableau, row, col):
+    tableau = np.array(tableau, dtype=float)
+    tableau[row] /= tableau[row, col]
+    for i in range(tableau.shape[0]):
+        if i != row:
+            tableau[i] -= tableau[i, col] * tableau[row]
+    return tableau
+
+@pytest.mark.parametrize("layout", ["c", "fortran", "strided", "float32"])
+def test_pivot_matches_row_loop(layout):
+    rng = np.random.default_rng(2)
+    base = rng.uniform(-5, 5, (30, 41))
+    wide = np.zeros((30, 82))
+    wide[:, ::2] = base
+    expected = _reference_pivot(base, 7, 11)
+    tableau = {
+        "c": as_tableau(base),
+        "fortran": np.asfortranarray(base),
+        "strided": wide[:, ::2],
+        "float32": base.astype(np.float32),
+    }[layout]
+    result = pivot_inplace(tableau, 7, 11)
+    assert result is tableau  # siempre en sitio
+    np.testing.assert_allclose(tableau, expected, rtol=1e-5 if layout == "float32" else 1e-12, atol=1e-4 if layout == "float32" else 1e-12)
+
+def test_min_ratio_row():
+    assert min_ratio_row(np.array([1.0, 2.0, -1.0, 0.0]), np.array([4.0, 2.0, 0.0, 1.0])) == 1
+    assert min_ratio_row(np.array([-1.0, 0.0]), np.array([1.0, 1.0])) is None
+
+def test_pivot_writes_back_when_dger_returns_a_copy(monkeypatch):
+    from app.algorithms import pivoting
+    dger = pivoting.dger
+    monkeypatch.setattr(pivoting, "dger", lambda alpha, x, y, a, overwrite_a: dger(alpha, x, y, a=np.array(a), overwrite_a=0))
+    base = np.random.default_rng(5).uniform(-5, 5, (12, 9))
+    tableau = as_tableau(base)
+    pivot_inplace(tableau, 3, 4)
+    np.testing.assert_allclose(tableau, _reference_pivot(base, 3, 4), rtol=1e-12, atol=1e-12)
@@ -0,0 +1,27 @@
+import os
+
+from app.services.result_cache import ResultCache, linear_problem_key
+from benchmarks.generators import random_lp
+
+
+def _disk_bytes(cache):
+    return sum(entry.stat().st_size for entry in os.scandir(cache.disk_dir) if entry.name.endswith(".pkl"))
+
+def test_equivalent_problems_share_a_key():
+    payload = random_lp(5, 3, seed=1)
+    as_floats = dict(payload, objective_coeffs=[float(v) for v in payload["objective_coeffs"]])
+    assert linear_problem_key(payload) == linear_problem_key(as_floats)
+    assert linear_problem_key(payload) != linear_problem_key({**payload, "method": "revised"})
+    assert linear_problem_key(payload) != linear_problem_key(payload, with_sensitivity=True)
+
+def test_disk_tier_tracks_its_size_and_evicts(tmp_path):
+    cache = ResultCache("linear", disk_dir=str(tmp_path), disk_max_bytes=4000)
+    for seed in range(20):
+        cache.put(f"{seed:064x}", {"values": "x" * 500, "seed": seed})
+        assert cache.stats()["disk_bytes"] == _disk_bytes(cache) <= 4000
+
+    # Otro proceso (o un reinicio) parte del tamaño real del directorio y lee lo que quedó
+    restarted = ResultCache("linear", disk_dir=str(tmp_path), disk_max_bytes=4000)
+    assert restarted.stats()["disk_bytes"] == _disk_bytes(cache)
+    assert restarted.get(f"{19:064x}")["seed"] == 19
+    assert restarted.stats()["disk_hits"] == 1
@@ -0,0 +1,76 @@
+import pytest
+from scipy.optimize import linprog
+
+from app.models.linear_program import solve_linear_with_solver
+from app.utils.sensitivity_analysis import analyze_sensitivity
+from benchmarks.generators import random_lp, lp_arrays
+
+
+def _optimum(payload):
+    c, A_ub, b_ub, A_eq, b_eq = lp_arrays(payload)
+    result = linprog(-c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, method="highs")
+    assert result.status == 0
+    return -result.fun
+
+def _step(limit):
+    """Paso estrictamente dentro del rango permitido (None = sin límite)."""
+    return 0.5 * min(1.0, limit) if limit is not None else 0.5
+
+def _report(payload):
+    solution, solver = solve_linear_with_solver(payload)
+    report = analyze_sensitivity(payload, solver, solution)
+    assert report
+    return solution, report
+
+# Métodos de tableau solo con restricciones <=; el revisado también con >= y =
+CASES = [(method, "le", seed) for method in ("simplex", "two_phase", "m_big") for seed in range(4)] + \
+        [("revised", mix, seed) for mix in ("le", "mixed") for seed in range(6)]
+
+@pytest.mark.parametrize("method, mix, seed", CASES)
+def test_report_comes_from_the_returned_solution(method, mix, seed):
+    payload = {**random_lp(10, 7, density=0.7, mix=mix, seed=seed), "method": method}
+    solution, report = _report(payload)
+    assert solution["objective_value"] == pytest.approx(_optimum(payload), abs=1e-3)
+    for var, row in report["variables"].items():
+        assert row["value"] == pytest.approx(solution["variable_values"][var], abs=1e-4)
+
+@pytest.mark.parametrize("method, mix, seed", CASES)
+def test_shadow_prices_hold_inside_rhs_range(method, mix, seed):
+    # Dentro del rango del lado derecho el óptimo cambia exactamente precio sombra * delta
+    payload = {**random_lp(10, 7, density=0.7, mix=mix, seed=seed), "method": method}
+    solution, report = _report(payload)
+    base = solution["objective_value"]
+    for i, row in enumerate(report["constraints"]):
+        for direction, limit in ((1, row["allowable_increase"]), (-1, row["allowable_decrease"])):
+            if limit is not None and limit < 1e-6:
+                continue
+            delta = direction * _step(limit)
+            constraints = [dict(c, rhs=c["rhs"] + delta) if k == i else c for k, c in enumerate(payload["constraints"])]
+            moved = _optimum(dict(payload, constraints=constraints))
+            assert moved - base == pytest.approx(row["shadow_price"] * delta, abs=1e-3)
+
+@pytest.mark.parametrize("method, mix, seed", CASES)
+def test_optimal_solution_holds_inside_cost_range(method, mix, seed):
+    # Dentro del rango de c_j la solución no cambia: el óptimo se mueve en delta * x_j
+    payload = {**random_lp(10, 7, density=0.7, mix=mix, seed=seed), "method": method}
+    solution, report = _report(payload)
+    base = solution["objective_value"]
+    for j, var in enumerate(payload["variables"]):
+        row = report["variables"][var]
+        for direction, limit in ((1, row["allowable_increase"]), (-1, row["allowable_decrease"])):
+            if limit is not None and limit < 1e-6:
+                continue
+            delta = direction * _step(limit)
+            costs = [v + delta if k == j else v for k, v in enumerate(payload["objective_coeffs"])]
+            moved = _optimum(dict(payload, objective_coeffs=costs))
+            assert moved - base == pytest.approx(delta * row["value"], abs=1e-3)
+
+def test_model_is_solved_once(monkeypatch):
+    from app.algorithms.linear_programming_v2 import SimplexSolverV2
+    calls = []
+    solve = SimplexSolverV2.solve
+    monkeypatch.setattr(SimplexSolverV2, "solve", lambda self, *args, **kwargs: calls.append(args) or solve(self, *args, **kwargs))
+    payload = {**random_lp(8, 5, seed=3), "method": "simplex"}
+    solution, report = _report(payload)
+    assert len(calls) == 1
+    assert report["constraints"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from app.algorithms.transportation import vogel_approximation_method
+from app.services.optimization_service import solve_transport_problem
+from benchmarks.generators import random_transport
+
+
+def _reference(supply, demand, origins, destinations, costs, capacities):
+    """Transporte como PL por rutas: oferta <= supply, demanda = demand (supply >= demand)."""
+    m, n = len(supply), len(demand)
+    A_ub = np.zeros((m, len(costs)))
+    A_eq = np.zeros((n, len(costs)))
+    A_ub[origins, np.arange(len(costs))] = 1
+    A_eq[destinations, np.arange(len(costs))] = 1
+    return linprog(costs, A_ub=A_ub, b_ub=supply, A_eq=A_eq, b_eq=demand,
+                   bounds=[(0, cap) for cap in capacities], method="highs")
+
+def _dense_reference(problem):
+    m, n = len(problem["supply"]), len(problem["demand"])
+    cells = np.indices((m, n)).reshape(2, -1)
+    result = _reference(problem["supply"], problem["demand"], cells[0], cells[1],
+                        np.ravel(problem["costs"]), [None] * (m * n))
+    assert result.status == 0
+    return result.fun
+
+@pytest.mark.parametrize("method", ["northwest", "minimum_cost", "vogel", "network_simplex"])
+@pytest.mark.parametrize("balanced", [True, False])
+def test_dense_methods_match_linprog(method, balanced):
+    for seed in range(8):
+        problem = random_transport(7, 9, balanced=balanced, seed=seed)
+        # El balanceo agrega el nodo ficticio sobre las listas recibidas: se pasan copias
+        result = solve_transport_problem({"supply": list(problem["supply"]), "demand": list(problem["demand"]),
+                                          "costs": problem["costs"], "method": method})
+        assert result["status"] == "success"
+        assert result["total_cost"] == pytest.approx(_dense_reference(problem), rel=1e-9)
+
+        # La asignación respeta la oferta y cubre la demanda
+        allocation = np.array(result["optimal_solution"])[:7, :9]
+        assert np.all(allocation >= -1e-9)
+        assert np.all(allocation.sum(axis=1) <= np.array(problem["supply"]) + 1e-6)
+        assert allocation.sum(axis=0) == pytest.approx(problem["demand"])
+
+def test_vogel_initial_solution():
+    # Ejemplo clásico de libro: la solución inicial de Vogel cuesta 779
+    costs = [[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]]
+    allocation = np.array(vogel_approximation_method([7, 9, 18], [5, 8, 7, 14], costs))
+    assert float((allocation * np.array(costs)).sum()) == 779
+    assert np.count_nonzero(allocation) <= 3 + 4 - 1
+
+    # Una sola fila o una sola columna
+    assert np.array(vogel_approximation_method([10], [3, 7], [[1, 2]])).tolist() == [[3, 7]]
+    assert np.array(vogel_approximation_method([3, 7], [10], [[1], [2]])).tolist() == [[3], [7]]
+
+def test_sparse_lanes_match_linprog():
+    rng = np.random.default_rng(3)
+    for seed in range(10):
+        problem = random_transport(8, 10, balanced=False, seed=seed)
+        lanes = []
+        for i, row in enumerate(problem["costs"]):
+            for j, cost in enumerate(row):
+                if rng.random() < 0.5:
+                    lanes.append([i, j, cost, int(rng.integers(5, 60))] if rng.random() < 0.5 else [i, j, cost])
+        result = solve_transport_problem({"supply": problem["supply"], "demand": problem["demand"],
+                                          "lanes": lanes, "method": "network_simplex"})
+
+        origins, destinations = [lane[0] for lane in lanes], [lane[1] for lane in lanes]
+        reference = _reference(problem["supply"], problem["demand"], origins, destinations,
+                               [lane[2] for lane in lanes], [lane[3] if len(lane) == 4 else None for lane in lanes])
+        if reference.status == 2:
+            assert result["status"] == "error"
+        else:
+            assert result["status"] == "success"
+            assert result["total_cost"] == pytest.approx(reference.fun, rel=1e-9)